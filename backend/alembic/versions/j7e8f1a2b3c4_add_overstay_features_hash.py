@@ -0,0 +1,32 @@
+"""add overstay_features_hash to clinical_episodes
+
+Revision ID: j7e8f1a2b3c4
+Revises: i6d7e0f4a5b6
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'j7e8f1a2b3c4'
+down_revision: Union[str, Sequence[str], None] = 'i6d7e0f4a5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing probabilities have no fingerprint, so the scoring worker
+    # re-scores them once against their current inputs
+    op.add_column('clinical_episodes',
+                  sa.Column('overstay_features_hash', sa.String(length=32), nullable=True,
+                           comment='Fingerprint of the model inputs behind overstay_probability'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('clinical_episodes', 'overstay_features_hash')
@@ -0,0 +1,43 @@
+"""add pg_trgm indexes for episode search
+
+Revision ID: k8f9a0b1c2d3
+Revises: j7e8f1a2b3c4
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k8f9a0b1c2d3'
+down_revision: Union[str, Sequence[str], None] = 'j7e8f1a2b3c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm is a trusted extension (PG13+): the database owner can create it
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_patients_first_name_trgm', 'patients', ['first_name'],
+                    postgresql_using='gin', postgresql_ops={'first_name': 'gin_trgm_ops'})
+    op.create_index('ix_patients_last_name_trgm', 'patients', ['last_name'],
+                    postgresql_using='gin', postgresql_ops={'last_name': 'gin_trgm_ops'})
+    # Must match app.models.patient.patient_full_name to be used
+    op.create_index('ix_patients_full_name_trgm', 'patients',
+                    [sa.text("(first_name || ' ' || last_name) gin_trgm_ops")],
+                    postgresql_using='gin')
+    op.create_index('ix_beds_room_trgm', 'beds', ['room'],
+                    postgresql_using='gin', postgresql_ops={'room': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_beds_room_trgm', table_name='beds')
+    op.drop_index('ix_patients_full_name_trgm', table_name='patients')
+    op.drop_index('ix_patients_last_name_trgm', table_name='patients')
+    op.drop_index('ix_patients_first_name_trgm', table_name='patients')
+    # The extension is left installed; other objects may depend on it
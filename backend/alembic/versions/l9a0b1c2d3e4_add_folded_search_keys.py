@@ -0,0 +1,80 @@
+"""add accent-folded search_name / search_room keys
+
+Revision ID: l9a0b1c2d3e4
+Revises: k8f9a0b1c2d3
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'l9a0b1c2d3e4'
+down_revision: Union[str, Sequence[str], None] = 'k8f9a0b1c2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _fold(value) -> str:
+    # Frozen copy of app.search_keys.fold_search_key as of this revision
+    if value is None:
+        return ""
+    s = unicodedata.normalize("NFKD", str(value).replace("\xa0", " "))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = re.sub(r"[^0-9A-Za-z\s]", " ", s)
+    return re.sub(r"\s+", " ", s).strip().lower()
+
+
+def _backfill(table: str, key_column: str, source_sql: str, fold) -> None:
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(f"SELECT id, {source_sql} FROM {table}")).all()
+    update = sa.text(f"UPDATE {table} SET {key_column} = :key WHERE id = :id")
+    for i in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        batch = rows[i:i + BACKFILL_BATCH_SIZE]
+        bind.execute(update, [{"id": row[0], "key": fold(*row[1:])} for row in batch])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('patients', sa.Column('search_name', sa.String(length=641),
+                                        server_default='', nullable=False))
+    op.add_column('beds', sa.Column('search_room', sa.String(length=320),
+                                    server_default='', nullable=False))
+
+    _backfill('patients', 'search_name', 'first_name, last_name',
+              lambda first, last: _fold(f"{first or ''} {last or ''}"))
+    _backfill('beds', 'search_room', 'room', _fold)
+
+    # Search now goes through the folded keys
+    op.drop_index('ix_patients_first_name_trgm', table_name='patients')
+    op.drop_index('ix_patients_last_name_trgm', table_name='patients')
+    op.drop_index('ix_patients_full_name_trgm', table_name='patients')
+    op.drop_index('ix_beds_room_trgm', table_name='beds')
+    op.create_index('ix_patients_search_name_trgm', 'patients', ['search_name'],
+                    postgresql_using='gin', postgresql_ops={'search_name': 'gin_trgm_ops'})
+    op.create_index('ix_beds_search_room_trgm', 'beds', ['search_room'],
+                    postgresql_using='gin', postgresql_ops={'search_room': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_beds_search_room_trgm', table_name='beds')
+    op.drop_index('ix_patients_search_name_trgm', table_name='patients')
+    op.create_index('ix_patients_first_name_trgm', 'patients', ['first_name'],
+                    postgresql_using='gin', postgresql_ops={'first_name': 'gin_trgm_ops'})
+    op.create_index('ix_patients_last_name_trgm', 'patients', ['last_name'],
+                    postgresql_using='gin', postgresql_ops={'last_name': 'gin_trgm_ops'})
+    op.create_index('ix_patients_full_name_trgm', 'patients',
+                    [sa.text("(first_name || ' ' || last_name) gin_trgm_ops")],
+                    postgresql_using='gin')
+    op.create_index('ix_beds_room_trgm', 'beds', ['room'],
+                    postgresql_using='gin', postgresql_ops={'room': 'gin_trgm_ops'})
+    op.drop_column('beds', 'search_room')
+    op.drop_column('patients', 'search_name')
@@ -0,0 +1,66 @@
+"""add composite and partial indexes for the hot read paths
+
+Revision ID: m0b1c2d3e4f5
+Revises: l9a0b1c2d3e4
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'm0b1c2d3e4f5'
+down_revision: Union[str, Sequence[str], None] = 'l9a0b1c2d3e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Episode list: default order / cursor key, risk order, active episodes
+    op.create_index('ix_clinical_episodes_admission_at_id', 'clinical_episodes',
+                    [sa.text('admission_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_clinical_episodes_overstay_rank', 'clinical_episodes',
+                    [sa.text('overstay_probability DESC NULLS LAST'),
+                     sa.text('admission_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_clinical_episodes_active_admission_at', 'clinical_episodes',
+                    [sa.text('admission_at DESC')],
+                    postgresql_where=sa.text("status = 'ACTIVE'"))
+
+    # Alerts: active (optionally by type) newest first, and per episode
+    op.create_index('ix_alerts_active_created_at', 'alerts',
+                    [sa.text('created_at DESC')],
+                    postgresql_where=sa.text('is_active'))
+    op.create_index('ix_alerts_active_type_created_at', 'alerts',
+                    ['alert_type', sa.text('created_at DESC')],
+                    postgresql_where=sa.text('is_active'))
+    op.create_index('ix_alerts_episode_id_created_at', 'alerts',
+                    ['episode_id', sa.text('created_at DESC')])
+
+    # Tasks: open tasks in due-date order, and per episode
+    op.create_index('ix_task_instances_open_due_date', 'task_instances',
+                    [sa.text('due_date ASC NULLS LAST'), sa.text('priority DESC'),
+                     sa.text('created_at DESC')],
+                    postgresql_where=sa.text("status IN ('PENDING', 'IN_PROGRESS')"))
+    op.create_index('ix_task_instances_episode_id_due_date', 'task_instances',
+                    ['episode_id', sa.text('due_date ASC NULLS LAST'), sa.text('priority DESC')])
+
+    # Latest social score per episode
+    op.create_index('ix_social_score_history_episode_id_recorded_at', 'social_score_history',
+                    ['episode_id', sa.text('recorded_at DESC')])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_social_score_history_episode_id_recorded_at', table_name='social_score_history')
+    op.drop_index('ix_task_instances_episode_id_due_date', table_name='task_instances')
+    op.drop_index('ix_task_instances_open_due_date', table_name='task_instances')
+    op.drop_index('ix_alerts_episode_id_created_at', table_name='alerts')
+    op.drop_index('ix_alerts_active_type_created_at', table_name='alerts')
+    op.drop_index('ix_alerts_active_created_at', table_name='alerts')
+    op.drop_index('ix_clinical_episodes_active_admission_at', table_name='clinical_episodes')
+    op.drop_index('ix_clinical_episodes_overstay_rank', table_name='clinical_episodes')
+    op.drop_index('ix_clinical_episodes_admission_at_id', table_name='clinical_episodes')
@@ -0,0 +1,53 @@
+"""add latest social score pointer to clinical_episodes
+
+Revision ID: n1c2d3e4f5a6
+Revises: m0b1c2d3e4f5
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'n1c2d3e4f5a6'
+down_revision: Union[str, Sequence[str], None] = 'm0b1c2d3e4f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('clinical_episodes', sa.Column('latest_social_score_id', sa.UUID(), nullable=True))
+    op.add_column('clinical_episodes', sa.Column('latest_social_score_value', sa.Integer(), nullable=True,
+                                                 comment='Score of the latest social score record'))
+    op.add_column('clinical_episodes', sa.Column('latest_social_score_recorded_at',
+                                                 sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key('fk_clinical_episodes_latest_social_score_id', 'clinical_episodes',
+                          'social_score_history', ['latest_social_score_id'], ['id'],
+                          ondelete='SET NULL')
+
+    # Point every episode at its most recent score
+    op.execute("""
+        UPDATE clinical_episodes
+        SET latest_social_score_id = latest.id,
+            latest_social_score_value = latest.score,
+            latest_social_score_recorded_at = latest.recorded_at
+        FROM (
+            SELECT DISTINCT ON (episode_id) episode_id, id, score, recorded_at
+            FROM social_score_history
+            ORDER BY episode_id, recorded_at DESC, created_at DESC
+        ) AS latest
+        WHERE clinical_episodes.id = latest.episode_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_clinical_episodes_latest_social_score_id', 'clinical_episodes',
+                       type_='foreignkey')
+    op.drop_column('clinical_episodes', 'latest_social_score_recorded_at')
+    op.drop_column('clinical_episodes', 'latest_social_score_value')
+    op.drop_column('clinical_episodes', 'latest_social_score_id')
@@ -0,0 +1,32 @@
+"""add partial expression index on legacy episode identifiers
+
+Revision ID: o2d3e4f5a6b7
+Revises: n1c2d3e4f5a6
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'o2d3e4f5a6b7'
+down_revision: Union[str, Sequence[str], None] = 'n1c2d3e4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_clinical_episode_information_legacy_episode_identifier',
+                    'clinical_episode_information',
+                    [sa.text("(value ->> 'episode_identifier')")],
+                    postgresql_where=sa.text("value ? 'episode_identifier'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_clinical_episode_information_legacy_episode_identifier',
+                  table_name='clinical_episode_information')
@@ -2,6 +2,36 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Async engine connection pool (see GET /health/db for saturation)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Total connections all worker processes may open; split evenly across
+    # WEB_CONCURRENCY workers and capping the two settings above (0: no cap)
+    DB_CONNECTION_BUDGET: int = 0
+    # Worker processes serving the API (set by scripts/serve.py)
+    WEB_CONCURRENCY: int = 1
+    # asyncpg prepared statement cache per connection (0 behind pgbouncer)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Server-side statement timeout in milliseconds (0 disables it)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # Load pandas/openpyxl and the model after startup instead of before
+    # accepting requests
+    WARM_UP_IN_BACKGROUND: bool = True
+    # Background overstay scoring worker
+    OVERSTAY_WORKER_ENABLED: bool = True
+    OVERSTAY_WORKER_INTERVAL_SECONDS: float = 30.0
+    OVERSTAY_WORKER_BATCH_SIZE: int = 500
+    # Seconds a computed dashboard snapshot is served before recomputing
+    DASHBOARD_SNAPSHOT_TTL_SECONDS: float = 30.0
+    # Excel imports submitted with background=true run on this many workers
+    IMPORT_JOB_CONCURRENCY: int = 1
+    # Processes parsing uploaded workbooks (0 parses in a worker thread instead)
+    IMPORT_PARSE_PROCESSES: int = 1
+    # Largest accepted Excel/CSV upload; bigger ones are rejected with 413
+    MAX_EXCEL_UPLOAD_SIZE_MB: int = 50
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 settings = Settings()
\ No newline at end of file
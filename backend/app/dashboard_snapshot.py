@@ -0,0 +1,67 @@
+"""
+In-process snapshot of the dashboard statistics.
+
+The dashboard is polled by many browser tabs at once. The snapshot keeps the
+last computed stats for ``ttl`` seconds and lets only one request recompute
+them when they expire; everyone else waits for that result. Writes that change
+episodes, alerts, social scores or GRD data call ``invalidate()`` so the next
+read recomputes right away.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.config import settings
+
+
+class DashboardSnapshot:
+    """TTL cache for one value with single-flight refresh."""
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._value: Optional[Any] = None
+        self._computed_at = 0.0
+        # Bumped on every invalidation so a refresh that raced with a write
+        # is returned to its caller but not kept
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    def _age(self) -> Optional[float]:
+        if self._value is None:
+            return None
+        age = time.monotonic() - self._computed_at
+        return age if age < self.ttl else None
+
+    async def get(self, compute: Callable[[], Awaitable[Any]]) -> tuple[Any, float]:
+        """
+        Return the cached value, computing it if missing or expired.
+
+        Args:
+            compute: Coroutine factory that builds a fresh value
+
+        Returns:
+            Tuple of (value, age of the value in seconds)
+        """
+        age = self._age()
+        if age is not None:
+            return self._value, age
+        async with self._lock:
+            # Another request may have refreshed while we waited
+            age = self._age()
+            if age is not None:
+                return self._value, age
+            version = self._version
+            value = await compute()
+            if version == self._version:
+                self._value = value
+                self._computed_at = time.monotonic()
+            return value, 0.0
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next read recomputes it."""
+        self._version += 1
+        self._value = None
+
+
+dashboard_snapshot = DashboardSnapshot(ttl=settings.DASHBOARD_SNAPSHOT_TTL_SECONDS)
@@ -1,3 +1,5 @@
+from typing import Any, Dict, Tuple
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from .config import settings
@@ -12,6 +14,65 @@ if database_url.startswith("postgres://"):
 elif database_url.startswith("postgresql://"):
     database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_async_engine(database_url)
+connect_args: Dict[str, Any] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+    connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+
+def pool_limits(pool_size: int, max_overflow: int, budget: int, workers: int) -> Tuple[int, int]:
+    """
+    Per-process pool size and overflow within a global connection budget.
+
+    Every worker process has its own pool, so with ``budget`` set each one
+    gets ``budget // workers`` connections, filled with persistent ones
+    first and overflow after, never more than the configured values.
+
+    Returns:
+        Tuple of (pool_size, max_overflow)
+    """
+    if budget <= 0:
+        return pool_size, max_overflow
+    per_worker = max(1, budget // max(1, workers))
+    size = min(pool_size, per_worker)
+    return size, min(max_overflow, per_worker - size)
+
+
+POOL_SIZE, MAX_OVERFLOW = pool_limits(
+    settings.DB_POOL_SIZE,
+    settings.DB_MAX_OVERFLOW,
+    settings.DB_CONNECTION_BUDGET,
+    settings.WEB_CONCURRENCY,
+)
+
+engine = create_async_engine(
+    database_url,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args=connect_args,
+)
+
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+
+def pool_status(pool=None) -> Dict[str, int]:
+    """
+    Snapshot of the connection pool's usage.
+
+    Args:
+        pool: Pool to inspect (default: the application engine's pool)
 
-SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
\ No newline at end of file
+    Returns:
+        Dictionary with the configured size, checked-out and idle
+        connections and the current overflow
+    """
+    pool = pool or engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # Negative until the pool has opened ``size`` connections
+        "overflow": pool.overflow(),
+    }
@@ -1,8 +1,15 @@
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from fastapi import FastAPI
 from sqlalchemy.ext.asyncio import AsyncSession
-from .db import SessionLocal
+from .config import settings
+from .db import SessionLocal, engine
+from .import_jobs import ImportJobQueue, import_jobs
+from .overstay_model import OverstayModelRegistry, model_registry
+from .overstay_worker import OverstayScoringWorker, scoring_worker
+from .parse_pool import shutdown_parse_executor
+from .warm_up import warm_up
 
 
 @asynccontextmanager
@@ -10,9 +17,27 @@ async def lifespan(app: FastAPI):
     """Application lifespan - handles startup and shutdown events."""
     # Startup
     print("Application starting up...")
+    # Load pandas/openpyxl and the overstay model off the request path
+    app.state.warm_up = asyncio.create_task(asyncio.to_thread(warm_up, model_registry))
+    if not settings.WARM_UP_IN_BACKGROUND:
+        await app.state.warm_up
+    app.state.model_registry = model_registry
+    # Score new episodes in the background instead of inside GET requests
+    if settings.OVERSTAY_WORKER_ENABLED:
+        scoring_worker.start()
+    app.state.scoring_worker = scoring_worker
+    # Run Excel imports submitted with background=true
+    import_jobs.start()
+    app.state.import_jobs = import_jobs
     yield
     # Shutdown
     print("Application shutting down...")
+    await import_jobs.stop()
+    await scoring_worker.stop()
+    shutdown_parse_executor()
+    # Close pooled connections so a stopping worker does not leave them to
+    # time out on the server
+    await engine.dispose()
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -25,4 +50,19 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
         raise
     finally:
-        await session.close()
\ No newline at end of file
+        await session.close()
+
+
+def get_model_registry() -> OverstayModelRegistry:
+    """Dependency for getting the shared overstay model registry."""
+    return model_registry
+
+
+def get_scoring_worker() -> OverstayScoringWorker:
+    """Dependency for getting the background overstay scoring worker."""
+    return scoring_worker
+
+
+def get_import_jobs() -> ImportJobQueue:
+    """Dependency for getting the background Excel import job queue."""
+    return import_jobs
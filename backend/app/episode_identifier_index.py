@@ -0,0 +1,280 @@
+"""
+In-memory index for resolving spreadsheet episode identifiers to episodes.
+
+Imports (social scores, GRD, ALTAS) receive episode identifiers in slightly
+different shapes: floats with a trailing ``.0``, extra whitespace, prefixes
+such as ``EP-`` or zero padding. The index is built once per import and
+answers every lookup with dictionary hits, falling back to a sorted
+prefix/suffix search instead of scanning every known identifier.
+
+``get`` and ``resolve`` accept loose matches without saying so. Callers that
+must not act on one (e.g. writes that change an episode's state) should use
+``get_exact`` or check the kind returned by ``match``.
+
+``load`` streams only the ``(identifier, episode id)`` columns in batches, so
+building the index never materializes ORM objects or whole result sets.
+"""
+
+import logging
+import re
+from bisect import bisect_left
+from typing import Any, AsyncIterator, Iterable, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.clinical_episode import ClinicalEpisode
+from app.models.clinical_episode_information import ClinicalEpisodeInformation
+from app.models.patient import Patient
+
+logger = logging.getLogger(__name__)
+
+# Marks a key shared by several episodes; such keys never resolve
+_AMBIGUOUS = object()
+
+# Rows fetched per round trip while loading the index
+LOAD_BATCH_SIZE = 5000
+
+
+def normalize_identifier(identifier: Any) -> str:
+    """Normalize identifier by removing trailing .0 from floats and extra whitespace."""
+    s = str(identifier).strip()
+    if s.endswith('.0'):
+        s = s[:-2]
+    return s
+
+
+def _folded_key(identifier: Any) -> str:
+    """Normalized identifier without inner whitespace, upper-cased."""
+    return re.sub(r"\s+", "", normalize_identifier(identifier)).upper()
+
+
+def numeric_core(identifier: Any) -> Optional[str]:
+    """Digits of the identifier without leading zeros ('EP-000123' -> '123')."""
+    digits = "".join(ch for ch in normalize_identifier(identifier) if ch.isdigit())
+    digits = digits.lstrip("0")
+    return digits or None
+
+
+# Match kinds reported by ``EpisodeIdentifierIndex.match``
+MATCH_EXACT = "exact"
+MATCH_FOLDED = "folded"
+MATCH_NUMERIC_CORE = "numeric_core"
+MATCH_AFFIX = "affix"
+
+
+class IdentifierMatch(NamedTuple):
+    """Episode an identifier resolved to and how it matched."""
+
+    episode_id: UUID
+    kind: str
+
+
+class EpisodeIdentifierIndex:
+    """
+    Maps episode identifiers to episode ids.
+
+    ``get_exact`` only answers for the normalized identifier itself. ``get``
+    adds folded (no whitespace, upper-cased) and numeric-core keys.
+    ``resolve`` adds a prefix/suffix fallback (one identifier contained at the
+    start or end of the other) that only answers when the match is unambiguous
+    and at least ``min_fallback_length`` characters long. ``match`` returns
+    the episode together with the kind of match that found it.
+    """
+
+    def __init__(self, min_fallback_length: int = 4):
+        self.min_fallback_length = min_fallback_length
+        self._exact: dict[str, UUID] = {}
+        self._folded: dict[str, Any] = {}
+        self._numeric: dict[str, Any] = {}
+        # Sorted folded keys and their reversed spellings, built lazily
+        self._prefix_keys: Optional[list[str]] = None
+        self._suffix_keys: Optional[list[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def __contains__(self, identifier: Any) -> bool:
+        return self.get(identifier) is not None
+
+    def keys(self) -> list[str]:
+        """Identifiers in insertion order (for logging samples)."""
+        return list(self._exact.keys())
+
+    @staticmethod
+    def _add_key(mapping: dict[str, Any], key: Optional[str], episode_id: UUID) -> None:
+        if not key:
+            return
+        current = mapping.get(key)
+        if current is None:
+            mapping[key] = episode_id
+        elif current is not _AMBIGUOUS and current != episode_id:
+            mapping[key] = _AMBIGUOUS
+
+    def add(self, identifier: Any, episode_id: UUID) -> None:
+        """Register an identifier; the first episode added for an identifier wins."""
+        if identifier is None:
+            return
+        exact = normalize_identifier(identifier)
+        if not exact or exact in self._exact:
+            return
+        self._exact[exact] = episode_id
+        self._add_key(self._folded, _folded_key(exact), episode_id)
+        self._add_key(self._numeric, numeric_core(exact), episode_id)
+        self._prefix_keys = None
+        self._suffix_keys = None
+
+    def add_many(self, pairs: Iterable[tuple[Any, UUID]]) -> None:
+        for identifier, episode_id in pairs:
+            self.add(identifier, episode_id)
+
+    @staticmethod
+    def _unique(value: Any) -> Optional[UUID]:
+        return None if value is None or value is _AMBIGUOUS else value
+
+    def get_exact(self, identifier: Any) -> Optional[UUID]:
+        """Exact match on the normalized identifier only."""
+        if identifier is None:
+            return None
+        return self._exact.get(normalize_identifier(identifier))
+
+    def match(self, identifier: Any, fallback: bool = False) -> Optional[IdentifierMatch]:
+        """
+        Resolve an identifier and report how it matched.
+
+        Args:
+            identifier: Identifier as read from the spreadsheet
+            fallback: Also try the prefix/suffix fallback used by ``resolve``
+
+        Returns:
+            IdentifierMatch with the episode id and one of the MATCH_* kinds,
+            or None when nothing (or more than one episode) matches
+        """
+        if identifier is None:
+            return None
+        exact = normalize_identifier(identifier)
+        if not exact:
+            return None
+        if exact in self._exact:
+            return IdentifierMatch(self._exact[exact], MATCH_EXACT)
+        folded = self._unique(self._folded.get(_folded_key(exact)))
+        if folded is not None:
+            return IdentifierMatch(folded, MATCH_FOLDED)
+        core = numeric_core(exact)
+        by_core = self._unique(self._numeric.get(core)) if core else None
+        if by_core is not None:
+            return IdentifierMatch(by_core, MATCH_NUMERIC_CORE)
+        if fallback:
+            by_affix = self._fallback(_folded_key(exact))
+            if by_affix is not None:
+                return IdentifierMatch(by_affix, MATCH_AFFIX)
+        return None
+
+    def get(self, identifier: Any) -> Optional[UUID]:
+        """Exact, normalized or numeric-core match."""
+        found = self.match(identifier)
+        return found.episode_id if found else None
+
+    def resolve(self, identifier: Any) -> Optional[UUID]:
+        """``get`` plus the prefix/suffix fallback."""
+        found = self.match(identifier, fallback=True)
+        return found.episode_id if found else None
+
+    def _build_sorted_keys(self) -> None:
+        keys = [k for k, v in self._folded.items() if v is not _AMBIGUOUS]
+        self._prefix_keys = sorted(keys)
+        self._suffix_keys = sorted(k[::-1] for k in keys)
+
+    @staticmethod
+    def _starting_with(sorted_keys: list[str], prefix: str) -> list[str]:
+        start = bisect_left(sorted_keys, prefix)
+        end = bisect_left(sorted_keys, prefix + "\uffff")
+        return sorted_keys[start:end]
+
+    def _fallback(self, key: str) -> Optional[UUID]:
+        if len(key) < self.min_fallback_length:
+            return None
+        if self._prefix_keys is None:
+            self._build_sorted_keys()
+
+        candidates: set[str] = set()
+        # Known identifiers that start or end with the looked-up one
+        candidates.update(self._starting_with(self._prefix_keys, key))
+        candidates.update(k[::-1] for k in self._starting_with(self._suffix_keys, key[::-1]))
+        # Known identifiers the looked-up one starts or ends with
+        for size in range(self.min_fallback_length, len(key)):
+            for part in (key[:size], key[-size:]):
+                if part in self._folded:
+                    candidates.add(part)
+
+        episode_ids = {self._folded[k] for k in candidates} - {_AMBIGUOUS}
+        if len(episode_ids) == 1:
+            return episode_ids.pop()
+        if len(episode_ids) > 1:
+            logger.debug(f"Identifier '{key}' matches {len(episode_ids)} episodes; not resolving")
+        return None
+
+    @classmethod
+    async def load(
+        cls,
+        session: AsyncSession,
+        include_patient_identifiers: bool = True,
+    ) -> "EpisodeIdentifierIndex":
+        """
+        Build the index from the database.
+
+        Sources, in precedence order:
+        1. ClinicalEpisode.episode_identifier
+        2. Legacy ClinicalEpisodeInformation records holding an episode_identifier
+        3. Patient medical identifiers (for manually created patients), unless disabled
+
+        Args:
+            session: Database session
+            include_patient_identifiers: Also map patient medical identifiers to their episodes
+
+        Returns:
+            Populated EpisodeIdentifierIndex
+        """
+        index = cls()
+
+        # 1. Episode identifiers stored directly on ClinicalEpisode
+        async for pairs in _stream_rows(
+            session,
+            select(ClinicalEpisode.episode_identifier, ClinicalEpisode.id)
+            .where(ClinicalEpisode.episode_identifier.isnot(None)),
+        ):
+            index.add_many(pairs)
+        direct_count = len(index)
+        logger.info(f"Found {direct_count} episodes with direct episode_identifier")
+
+        # 2. Legacy ClinicalEpisodeInformation records
+        async for rows in _stream_rows(
+            session,
+            select(
+                ClinicalEpisodeInformation.value["episode_identifier"].astext,
+                ClinicalEpisodeInformation.episode_id,
+            )
+            .where(ClinicalEpisodeInformation.value.has_key("episode_identifier")),
+        ):
+            index.add_many((identifier, episode_id) for identifier, episode_id in rows if identifier)
+
+        # 3. Patient medical identifiers
+        if include_patient_identifiers:
+            async for pairs in _stream_rows(
+                session,
+                select(Patient.medical_identifier, ClinicalEpisode.id)
+                .join(ClinicalEpisode, ClinicalEpisode.patient_id == Patient.id)
+                .where(Patient.medical_identifier.isnot(None)),
+            ):
+                index.add_many(pairs)
+
+        logger.info(f"Episode index contains {len(index)} identifiers")
+        return index
+
+
+async def _stream_rows(session: AsyncSession, stmt: Select) -> AsyncIterator[list]:
+    """Yield the statement's rows as tuples, ``LOAD_BATCH_SIZE`` at a time."""
+    result = await session.stream(stmt.execution_options(yield_per=LOAD_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield partition
@@ -0,0 +1,79 @@
+"""
+Patient name / room search for the clinical episode list.
+
+Search strings are folded like the precomputed ``Patient.search_name`` and
+``Bed.search_room`` keys (``app.search_keys``), so matching is case- and
+accent-insensitive, and compared with ``LIKE '%term%'``, which the pg_trgm
+GIN indexes on those columns serve.
+
+Patient and room matches are resolved in separate ``IN (SELECT ...)``
+subqueries so each one is answered from its own table's index; an OR across
+the joined tables would force a scan of every episode. Results are ranked by
+trigram similarity to the search string.
+"""
+
+from sqlalchemy import and_, func, or_, select
+
+from app.models.bed import Bed
+from app.models.clinical_episode import ClinicalEpisode
+from app.models.patient import Patient
+from app.search_keys import fold_search_key
+
+
+def build_search_filter(search: str):
+    """
+    Enhanced search handling multi-word names and room numbers.
+
+    Supports searching by:
+    - Patient first name (partial or full)
+    - Patient last name (partial or full)
+    - Multi-word first names (e.g., "Maria Jose")
+    - Multi-word last names (e.g., "Garcia Lopez")
+    - Room number
+
+    Examples:
+    - "Maria" → finds first or last name containing "Maria"
+    - "Maria Garcia" → finds patients with both terms in their name
+    - "Garcia Lopez" → finds multi-word last names
+    - "101" → finds room 101
+    - "Maria 101" → finds Maria in room 101 OR anyone named "Maria" or in room "101"
+    """
+    search = fold_search_key(search)
+    if not search:
+        return None
+
+    search_terms = search.split()
+
+    # Each word matches somewhere in "first last"; this covers single names,
+    # multi-word first/last names and words in any order ("Lopez Maria")
+    name_match = and_(*[Patient.search_name.like(f"%{term}%") for term in search_terms])
+
+    # Or the entire search matches the room number
+    room_match = Bed.search_room.like(f"%{search}%")
+
+    return or_(
+        ClinicalEpisode.patient_id.in_(select(Patient.id).where(name_match)),
+        ClinicalEpisode.bed_id.in_(select(Bed.id).where(room_match))
+    )
+
+
+def search_rank(search: str) -> list:
+    """
+    ORDER BY expressions ranking search results, best match first.
+
+    Exact first name, last name and room matches come first, then the
+    closest trigram match over the full name or the room. Requires
+    ``Patient`` and ``Bed`` (outer) joined into the query.
+    """
+    exact = search.strip()
+    folded = fold_search_key(search)
+    return [
+        Patient.first_name.ilike(exact).desc(),
+        Patient.last_name.ilike(exact).desc(),
+        Bed.room.ilike(exact).desc(),
+        # Unmatched rooms (no bed) are NULL and ignored by greatest()
+        func.greatest(
+            func.word_similarity(folded, Patient.search_name),
+            func.similarity(Bed.search_room, folded),
+        ).desc().nulls_last(),
+    ]
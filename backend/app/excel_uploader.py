@@ -7,17 +7,19 @@ This module handles uploading data from Excel files:
 """
 
 import asyncio
+import csv
 import logging
 from datetime import datetime, date
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 from uuid import UUID, uuid4
 
 import pandas as pd
-from sqlalchemy import select
+from sqlalchemy import bindparam, case, cast, column, delete, func, literal, select, union_all, update
+from sqlalchemy import values as values_clause
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 import unicodedata
-import re
 
 from app.db import SessionLocal
 from app.models.bed import Bed
@@ -30,9 +32,34 @@ from app.models.clinical_episode_information import (
 )
 from app.models.social_score_history import SocialScoreHistory
 from app.models.alert import Alert, AlertType, AlertSeverity
+from app.models.grd_norm import GrdNorm
+from app.dashboard_snapshot import dashboard_snapshot
+from app.episode_identifier_index import EpisodeIdentifierIndex, normalize_identifier
+from app.grd_norm_cache import grd_norm_cache
+from app.import_progress import ImportProgress
+from app.latest_social_score import refresh_latest_social_scores
+from app.parse_pool import run_parse
+from app.search_keys import fold_search_key, patient_search_name
+from app.workbook_loader import WorkbookLoader
 
 ALERT_SCORE_THRESHOLD = 4
 
+# Rows per multi-row INSERT / IN list in bulk imports (well below asyncpg's
+# 32767 bind parameter limit for the widest table)
+BULK_CHUNK_SIZE = 1000
+
+# ClinicalEpisode columns filled from the social score sheet
+SOCIAL_SCORE_EPISODE_COLUMNS = ("prevision_desc", "tipo_ingreso_desc", "servicio_ingreso_desc")
+
+# Titles of the ClinicalEpisodeInformation records created from the UCCC sheet
+UCCC_INFO_TITLES = (
+    "Diagnóstico de Admisión",
+    "Otros Diagnósticos",
+    "Tratamiento y Acceso",
+    "Rechazos y Devoluciones",
+    "Metadatos UCCC",
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -133,25 +160,188 @@ def get_name(seed: str) -> tuple[str, str]:
     return first_name, last_name
 
 
+# ==================== ROW NORMALIZATION ====================
+
+
+def _is_missing(value: Any) -> bool:
+    """True for None, NaN/NaT and blank or 'nan' strings."""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        stripped = value.strip()
+        return not stripped or stripped.lower() == "nan"
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _clean_text(value: Any) -> Optional[str]:
+    """Return the stripped string form of a cell, or None when it is missing."""
+    if _is_missing(value):
+        return None
+    return str(value).replace("\xa0", " ").strip()
+
+
+def _parse_date_column(series: pd.Series, formats: tuple[str, ...], dayfirst: bool) -> pd.Series:
+    """
+    Parse the text cells of a date column with one vectorized call per format.
+
+    Formats are tried in order, then pandas' per-element inference. Cells that
+    are already dates, or that no format parses, keep their original value so
+    the row builders handle them exactly as before.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    is_text = series.map(lambda v: isinstance(v, str))
+    if not is_text.any():
+        return series
+
+    text = series[is_text]
+    try:
+        parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+        for fmt in formats:
+            parsed = parsed.fillna(pd.to_datetime(text, format=fmt, errors="coerce"))
+        parsed = parsed.fillna(
+            pd.to_datetime(text, format="mixed", dayfirst=dayfirst, errors="coerce")
+        )
+    except (TypeError, ValueError):
+        # Mixed time zones or other oddities: leave parsing to the row builders
+        return series
+
+    parsed = parsed[parsed.notna()]
+    result = series.astype(object)
+    result[parsed.index] = list(parsed)
+    return result
+
+
+def _frame_to_records(
+    df: pd.DataFrame,
+    date_columns: Optional[Dict[str, tuple[tuple[str, ...], bool]]] = None,
+) -> list[Dict[str, Any]]:
+    """
+    Normalize a sheet once per column and return one plain dict per row.
+
+    String cells are stripped (non-breaking spaces included); blank and 'nan'
+    strings, NaN and NaT all become None. ``date_columns`` maps a column name
+    to ``(formats, dayfirst)`` and pre-parses it with ``_parse_date_column``.
+    """
+    out = df.astype(object)
+    date_columns = date_columns or {}
+
+    for i, col in enumerate(out.columns):
+        series = out.iloc[:, i]
+        is_text = series.map(lambda v: isinstance(v, str))
+        if is_text.any():
+            text = series[is_text].str.replace("\xa0", " ", regex=False).str.strip()
+            blank = (text == "") | (text.str.lower() == "nan")
+            series = series.copy()
+            series[text.index] = text.where(~blank, None)
+        if col in date_columns:
+            formats, dayfirst = date_columns[col]
+            series = _parse_date_column(series, formats, dayfirst)
+        out.iloc[:, i] = series
+
+    out = out.where(out.notna(), None)
+    return out.to_dict("records")
+
+
+def _detect_csv_delimiter(csv_path: str | Path) -> Optional[str]:
+    """First of , ; tab | that splits the header line into several fields, or None."""
+    with open(csv_path, newline="", encoding="utf-8", errors="replace") as f:
+        header = f.readline()
+    for sep in [',', ';', '\t', '|']:
+        if len(next(csv.reader([header], delimiter=sep))) > 1:
+            return sep
+    return None
+
+
 class ExcelUploader:
     """Handles uploading data from Excel files to the database."""
 
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, progress: Optional[ImportProgress] = None):
         self.db = db_session
+        self.progress = progress or ImportProgress()
+        # Episode identifier indexes reused by consecutive imports of this
+        # uploader, keyed by include_patient_identifiers
+        self._episode_indexes: Dict[bool, EpisodeIdentifierIndex] = {}
+
+    def _track(self, records: list[Dict[str, Any]]) -> Iterator[tuple[int, Dict[str, Any]]]:
+        """``enumerate(records)`` that also counts parsed rows in ``self.progress``."""
+        self.progress.rows_total += len(records)
+        for idx, row in enumerate(records):
+            yield idx, row
+            self.progress.rows_parsed += 1
+
+    def _row_error(self, message: str) -> None:
+        """Log a row-level error and record it in ``self.progress``."""
+        logger.error(message)
+        self.progress.add_error(message)
+
+    async def _commit(self, rows_written: int = 0) -> None:
+        """Commit the import and drop the dashboard snapshot it made stale."""
+        await self.db.commit()
+        self.progress.rows_written += rows_written
+        dashboard_snapshot.invalidate()
+
+    async def _rollback(self) -> None:
+        """Roll back a failed import, forgetting episodes it may have indexed."""
+        self._invalidate_episode_index()
+        await self.db.rollback()
+
+    async def _episode_index(self, include_patient_identifiers: bool = True) -> EpisodeIdentifierIndex:
+        """
+        Episode identifier index, loaded on first use and cached on the uploader.
+
+        Imports that create episodes or patients call
+        ``_invalidate_episode_index`` so the next lookup reloads it.
+        """
+        index = self._episode_indexes.get(include_patient_identifiers)
+        if index is None:
+            index = await EpisodeIdentifierIndex.load(
+                self.db, include_patient_identifiers=include_patient_identifiers
+            )
+            self._episode_indexes[include_patient_identifiers] = index
+        return index
+
+    def _invalidate_episode_index(self) -> None:
+        """Drop the cached episode identifier indexes."""
+        self._episode_indexes.clear()
 
     def _normalize_col_name(self, col_name: str) -> str:
         """Normalize a column name for matching: remove accents/punctuation, collapse whitespace, lower-case."""
-        if not isinstance(col_name, str):
-            col_name = str(col_name)
-
-        s = col_name.replace("\xa0", " ")
-        s = unicodedata.normalize("NFKD", s)
-        # remove diacritics
-        s = "".join(ch for ch in s if not unicodedata.combining(ch))
-        # keep alphanumerics and spaces
-        s = re.sub(r"[^0-9A-Za-z\s]", " ", s)
-        s = re.sub(r"\s+", " ", s).strip().lower()
-        return s
+        return fold_search_key(col_name if isinstance(col_name, str) else str(col_name))
+
+    async def _parse(self, method_name: str, *args: Any) -> Any:
+        """
+        Run a synchronous ``_read_*`` parse method in the parse pool.
+
+        Reading and parsing workbooks is CPU-bound, so it runs outside the
+        event loop on a session-less uploader; its progress is merged back.
+
+        Args:
+            method_name: Name of the parse method to run
+            *args: Picklable arguments for the method
+
+        Returns:
+            Whatever the parse method returns (plain records)
+        """
+        result, progress = await run_parse(_parse_in_worker, method_name, *args)
+        self.progress.merge(progress)
+        return result
+
+    def _read_sheet_records(
+        self,
+        excel_path: str | Path,
+        sheet_name: str,
+        date_columns: Optional[Dict[str, tuple[tuple[str, ...], bool]]] = None,
+    ) -> list[Dict[str, Any]]:
+        """Read one sheet into plain records (see ``_frame_to_records``)."""
+        with WorkbookLoader(excel_path) as workbook:
+            df = workbook.read_sheet(sheet_name)
+        logger.info(f"Found {len(df)} rows in {sheet_name} sheet")
+        return _frame_to_records(df, date_columns=date_columns)
 
     # ==================== BED DATA UPLOAD ====================
 
@@ -168,31 +358,30 @@ class ExcelUploader:
         logger.info(f"Reading beds data from {excel_path}")
 
         try:
-            df = pd.read_excel(excel_path, sheet_name="Camas")
-            logger.info(f"Found {len(df)} rows in Camas sheet")
+            records = await self._parse("_read_sheet_records", excel_path, "Camas")
 
             beds_created = 0
 
-            for idx, row in df.iterrows():
+            for idx, row in self._track(records):
                 try:
                     bed_data = self._parse_bed_row(row)
                     if bed_data:
                         await self._create_or_update_bed(bed_data)
                         beds_created += 1
                 except Exception as e:
-                    logger.error(f"Error processing bed row {idx}: {e}")
+                    self._row_error(f"Error processing bed row {idx}: {e}")
                     continue
 
-            await self.db.commit()
+            await self._commit(beds_created)
             logger.info(f"Successfully uploaded {beds_created} beds")
             return beds_created
 
         except Exception as e:
             logger.error(f"Error uploading beds: {e}")
-            await self.db.rollback()
+            await self._rollback()
             raise
 
-    def _parse_bed_row(self, row: pd.Series) -> Optional[Dict[str, Any]]:
+    def _parse_bed_row(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Parse a bed row from the Excel file.
 
@@ -284,26 +473,29 @@ class ExcelUploader:
         logger.info(f"Reading patient data from {excel_path}")
 
         try:
-            df = pd.read_excel(excel_path, sheet_name="Data Casos")
-            logger.info(f"Found {len(df)} rows in Data Casos sheet")
+            records = await self._parse("_read_sheet_records", excel_path, "Data Casos", {
+                "Fecha de nacimiento": ((), False),
+                "Fe.admisión": ((), False),
+                "Fecha del alta": (("%d-%m-%Y",), False),
+            })
 
             patients_created = 0
 
-            for idx, row in df.iterrows():
+            for idx, row in self._track(records):
                 try:
                     await self._process_patient_row(row, idx)
                     patients_created += 1
                 except Exception as e:
-                    logger.error(f"Error processing patient row {idx}: {e}")
+                    self._row_error(f"Error processing patient row {idx}: {e}")
                     continue
 
-            await self.db.commit()
+            await self._commit(patients_created)
             logger.info(f"Successfully uploaded {patients_created} patients")
             return patients_created
 
         except Exception as e:
             logger.error(f"Error uploading patients: {e}")
-            await self.db.rollback()
+            await self._rollback()
             raise
 
     # ==================== GESTION ESTADÍA (UCCC) UPLOAD ====================
@@ -321,151 +513,167 @@ class ExcelUploader:
         logger.info(f"Reading Gestion Estadía data from {excel_path}")
 
         try:
-            # Read the sheet and detect the true header row (some files have title rows above header)
-            raw = pd.read_excel(excel_path, sheet_name="UCCC", header=None)
-
-            def _detect_header_row(df_raw, max_scan=20, min_tokens=3):
-                tokens = ["rut", "nombre", "episodio", "cama", "fecha", "sexo", "inicio", "nacimiento", "hora"]
-                scan_rows = min(max_scan, len(df_raw))
-                for i in range(scan_rows):
-                    row = df_raw.iloc[i].fillna("").astype(str).str.lower().tolist()
-                    found = set()
-                    for cell in row:
-                        for t in tokens:
-                            if t in cell:
-                                found.add(t)
-                    if len(found) >= min_tokens:
-                        return i
-                return None
+            # UCCC and ALTAS come from one pass over the workbook
+            parsed_rows, altas_records = await self._parse("_read_gestion_workbook", excel_path)
 
-            header_idx = _detect_header_row(raw)
-            if header_idx is None:
-                logger.info("Could not detect header row automatically; using pandas default header (row 0).")
-                df = pd.read_excel(excel_path, sheet_name="UCCC")
-            else:
-                logger.info(f"Detected header row at index: {header_idx}. Re-reading UCCC sheet using that header.")
-                df = pd.read_excel(excel_path, sheet_name="UCCC", header=header_idx)
-
-            # Trim whitespace in original column names
-            df.columns = df.columns.map(lambda c: c if not isinstance(c, str) else c.strip())
-
-            # Build normalized->original map for flexible lookup
-            col_map = {}
-            for col in df.columns:
-                if isinstance(col, str):
-                    norm = self._normalize_col_name(col) if hasattr(self, '_normalize_col_name') else col.strip().lower()
-                    col_map[norm] = col
-
-            # Try to map common UCCC column variants to canonical names used by the importer
-            canonical_candidates = {
-                "RUT": ["RUT", "rut"],
-                "Nombre": ["Nombre", "nombre"],
-                "Episodio:": ["Episodio:", "Episodio", "Episodio / Estadía", "episodio"],
-                "CAMA": ["CAMA", "Cama"],
-                "Fecha de Nacimiento": ["Fecha de Nacimiento", "Fecha de nacimiento", "fecha de nacimiento"],
-                "Sexo": ["Sexo", "sexo"],
-                "Fecha Inicio:": ["Fecha Inicio:", "Fecha Inicio", "Fecha de Inicio", "fecha inicio"],
-                "Hora Inicio:": ["Hora Inicio:", "Hora Inicio", "Hora de Inicio", "hora inicio"],
-                "Texto libre diagnóstico admisión": ["Texto libre diagnóstico admisión", "Texto libre diagnostico admision"],
-                "OTROS DIAGNOSTICOS": ["OTROS DIAGNOSTICOS", "Otros Diagnosticos"],
-                "TRATAMIENTO": ["TRATAMIENTO", "Tratamiento"],
-                "FRECUENCIA": ["FRECUENCIA", "Frecuencia"],
-                "ACCESO VASCULAR": ["ACCESO VASCULAR", "Acceso Vascular"],
-                "CAUSA RECHAZO": ["CAUSA RECHAZO", "Causa Rechazo"],
-                "TEXTO LIBRE CAUSA": ["TEXTO LIBRE CAUSA", "Texto libre causa"],
-                "Motivos Rechazo": ["Motivos Rechazo", "Motivos rechazo"],
-                "Motivos Devolución": ["Motivos Devolución", "Motivos Devolucion"],
-                # metadata
-                "Control": ["Control"],
-                "Marco Temporal": ["Marco Temporal"],
-                "Modificación": ["Modificación", "Modificacion"],
-                "Informe": ["Informe"],
-                "Gestionado en UCCC?": ["Gestionado en UCCC?", "Gestionado en UCCC"],
-                "EDAD": ["EDAD", "Edad"],
-                "Nombre de la aseguradora": ["Nombre de la aseguradora", "Nombre de la aseguradora"],
-                "Convenio": ["Convenio"],
-                "DIRECCIÓN": ["DIRECCIÓN", "DIRECCION", "Direccion"],
-                "TELÉFONO": ["TELÉFONO", "TELEFONO", "Telefono"],
-            }
+            await self._bulk_import_gestion_rows(parsed_rows)
+            processed = len(parsed_rows)
 
-            def find_orig(col_map, candidates):
-                for c in candidates:
-                    norm = self._normalize_col_name(c) if hasattr(self, '_normalize_col_name') else c.strip().lower()
-                    if norm in col_map:
-                        return col_map[norm]
-                # try startswith match
-                for c in candidates:
-                    norm = self._normalize_col_name(c) if hasattr(self, '_normalize_col_name') else c.strip().lower()
-                    for k, v in col_map.items():
-                        if k.startswith(norm) or norm.startswith(k):
-                            return v
-                return None
-
-            rename_map = {}
-            for canonical, candidates in canonical_candidates.items():
-                orig = find_orig(col_map, candidates)
-                if orig:
-                    # only rename if original column exists
-                    rename_map[orig] = canonical
-
-            if rename_map:
-                df = df.rename(columns=rename_map)
+            # After processing the UCCC sheet, also process discharge records
+            # from the ALTAS sheet in the same file so episodes get their discharge timestamps.
+            if altas_records is not None:
+                try:
+                    await self._process_altas_records(altas_records)
+                except Exception as e:
+                    logger.warning(f"Processing ALTAS sheet failed: {e}")
 
-            # expose the normalized map for downstream helpers
-            self._gestion_col_map = col_map
+            await self._commit(processed)
+            logger.info(f"Successfully processed {processed} UCCC rows (and applied ALTAS updates)")
+            return processed
 
-            logger.info(f"Found {len(df)} rows in UCCC sheet; columns: {list(df.columns)}")
+        except Exception as e:
+            logger.error(f"Error uploading Gestion Estadía: {e}")
+            await self._rollback()
+            raise
 
-            processed = 0
+    def _read_gestion_workbook(
+        self, excel_path: str | Path
+    ) -> tuple[list[Dict[str, Any]], Optional[list[Dict[str, Any]]]]:
+        """
+        Parse stage of the Gestion Estadía import (no database access).
 
-            for idx, row in df.iterrows():
+        Returns:
+            Tuple of (parsed UCCC rows, ALTAS records or None when the sheet is missing or unreadable)
+        """
+        with WorkbookLoader(excel_path) as workbook:
+            parsed_rows = self._read_gestion_rows(workbook)
+            altas_records = None
+            if "ALTAS" in workbook.sheet_names:
                 try:
-                    await self._process_gestion_row(row, idx)
-                    processed += 1
+                    altas_records = self._read_altas_records(workbook)
                 except Exception as e:
-                    logger.error(f"Error processing UCCC row {idx}: {e}")
-                    continue
+                    logger.warning(f"ALTAS sheet not available or parsing failed: {e}")
+            else:
+                logger.info("No ALTAS sheet in workbook; skipping discharge updates")
+        return parsed_rows, altas_records
+
+    def _read_gestion_rows(self, workbook: WorkbookLoader) -> list[Dict[str, Any]]:
+        """Read the UCCC sheet and parse every row."""
+        # Detect the true header row while reading (some files have title rows above header)
+        df = workbook.read_sheet(
+            "UCCC",
+            header_tokens=["rut", "nombre", "episodio", "cama", "fecha", "sexo", "inicio", "nacimiento", "hora"],
+            min_tokens=3,
+        )
 
-            # After processing the UCCC sheet, also try to process discharge records
-            # from the ALTAS sheet in the same file so episodes get their discharge timestamps.
+        # Trim whitespace in original column names
+        df.columns = df.columns.map(lambda c: c if not isinstance(c, str) else c.strip())
+
+        # Build normalized->original map for flexible lookup
+        col_map = {}
+        for col in df.columns:
+            if isinstance(col, str):
+                norm = self._normalize_col_name(col) if hasattr(self, '_normalize_col_name') else col.strip().lower()
+                col_map[norm] = col
+
+        # Try to map common UCCC column variants to canonical names used by the importer
+        canonical_candidates = {
+            "RUT": ["RUT", "rut"],
+            "Nombre": ["Nombre", "nombre"],
+            "Episodio:": ["Episodio:", "Episodio", "Episodio / Estadía", "episodio"],
+            "CAMA": ["CAMA", "Cama"],
+            "Fecha de Nacimiento": ["Fecha de Nacimiento", "Fecha de nacimiento", "fecha de nacimiento"],
+            "Sexo": ["Sexo", "sexo"],
+            "Fecha Inicio:": ["Fecha Inicio:", "Fecha Inicio", "Fecha de Inicio", "fecha inicio"],
+            "Hora Inicio:": ["Hora Inicio:", "Hora Inicio", "Hora de Inicio", "hora inicio"],
+            "Texto libre diagnóstico admisión": ["Texto libre diagnóstico admisión", "Texto libre diagnostico admision"],
+            "OTROS DIAGNOSTICOS": ["OTROS DIAGNOSTICOS", "Otros Diagnosticos"],
+            "TRATAMIENTO": ["TRATAMIENTO", "Tratamiento"],
+            "FRECUENCIA": ["FRECUENCIA", "Frecuencia"],
+            "ACCESO VASCULAR": ["ACCESO VASCULAR", "Acceso Vascular"],
+            "CAUSA RECHAZO": ["CAUSA RECHAZO", "Causa Rechazo"],
+            "TEXTO LIBRE CAUSA": ["TEXTO LIBRE CAUSA", "Texto libre causa"],
+            "Motivos Rechazo": ["Motivos Rechazo", "Motivos rechazo"],
+            "Motivos Devolución": ["Motivos Devolución", "Motivos Devolucion"],
+            # metadata
+            "Control": ["Control"],
+            "Marco Temporal": ["Marco Temporal"],
+            "Modificación": ["Modificación", "Modificacion"],
+            "Informe": ["Informe"],
+            "Gestionado en UCCC?": ["Gestionado en UCCC?", "Gestionado en UCCC"],
+            "EDAD": ["EDAD", "Edad"],
+            "Nombre de la aseguradora": ["Nombre de la aseguradora", "Nombre de la aseguradora"],
+            "Convenio": ["Convenio"],
+            "DIRECCIÓN": ["DIRECCIÓN", "DIRECCION", "Direccion"],
+            "TELÉFONO": ["TELÉFONO", "TELEFONO", "Telefono"],
+        }
+
+        def find_orig(col_map, candidates):
+            for c in candidates:
+                norm = self._normalize_col_name(c) if hasattr(self, '_normalize_col_name') else c.strip().lower()
+                if norm in col_map:
+                    return col_map[norm]
+            # try startswith match
+            for c in candidates:
+                norm = self._normalize_col_name(c) if hasattr(self, '_normalize_col_name') else c.strip().lower()
+                for k, v in col_map.items():
+                    if k.startswith(norm) or norm.startswith(k):
+                        return v
+            return None
+
+        rename_map = {}
+        for canonical, candidates in canonical_candidates.items():
+            orig = find_orig(col_map, candidates)
+            if orig:
+                # only rename if original column exists
+                rename_map[orig] = canonical
+
+        if rename_map:
+            df = df.rename(columns=rename_map)
+
+        logger.info(f"Found {len(df)} rows in UCCC sheet; columns: {list(df.columns)}")
+
+        # Parse the whole sheet first, then write it with a few set-based statements
+        parsed_rows = []
+        records = _frame_to_records(df, date_columns={
+            "Fecha de Nacimiento": (("%d-%m-%Y", "%d-%m-%y"), True),
+            "Fecha Inicio:": (("%d-%m-%y", "%d-%m-%Y"), True),
+        })
+        for idx, row in self._track(records):
             try:
-                await self._process_altas_sheet(excel_path)
+                parsed = self._parse_gestion_row(row)
+                if parsed:
+                    parsed_rows.append(parsed)
             except Exception as e:
-                logger.warning(f"Processing ALTAS sheet failed or not present: {e}")
+                self._row_error(f"Error processing UCCC row {idx}: {e}")
+                continue
 
-            await self.db.commit()
-            logger.info(f"Successfully processed {processed} UCCC rows (and applied ALTAS updates)")
-            return processed
+        return parsed_rows
 
-        except Exception as e:
-            logger.error(f"Error uploading Gestion Estadía: {e}")
-            await self.db.rollback()
-            raise
-
-    async def _process_gestion_row(self, row: pd.Series, row_idx: int) -> None:
-        """Process a single row from the Gestion Estadía (UCCC) sheet."""
+    def _parse_gestion_row(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parse a UCCC row into patient, patient information, episode and episode info data."""
         # Parse patient data (RUT is used as medical_identifier)
         patient_data = self._parse_gestion_patient_data(row)
         if not patient_data:
-            return
-
-        patient = await self._create_or_get_patient(patient_data)
-
-        # Patient information: include address, phone, insurer, convenio, etc.
-        patient_info = self._parse_patient_information(row)
-        if patient_info:
-            await self._create_or_update_patient_information(patient.id, patient_info)
-
-        # Parse episode data (admission, discharge, bed)
-        episode_data = self._parse_gestion_episode_data(row)
-        episode = await self._create_clinical_episode(patient.id, episode_data)
+            return None
 
+        return {
+            "patient": patient_data,
+            # Patient information: include address, phone, insurer, convenio, etc.
+            "patient_info": self._parse_patient_information(row),
+            # Episode data (admission, discharge, bed)
+            "episode": self._parse_gestion_episode_data(row),
+            "info_records": self._parse_gestion_info_records(row),
+        }
+
+    def _parse_gestion_info_records(self, row: Dict[str, Any]) -> list[Dict[str, Any]]:
+        """Build the ClinicalEpisodeInformation records for a UCCC row."""
         # Episode information: diagnosis, treatment, rejections, motives, etc.
         episode_info_records = []
 
         # Texto libre diagnóstico admisión
         diag = row.get("Texto libre diagnóstico admisión")
-        if not pd.isna(diag) and str(diag).strip().lower() != 'nan':
+        if not _is_missing(diag):
             episode_info_records.append({
                 "info_type": EpisodeInfoType.DIAGNOSIS,
                 "title": "Diagnóstico de Admisión",
@@ -474,7 +682,7 @@ class ExcelUploader:
 
         # Otros diagnósticos
         otros = row.get("OTROS DIAGNOSTICOS")
-        if not pd.isna(otros) and str(otros).strip().lower() != 'nan':
+        if not _is_missing(otros):
             episode_info_records.append({
                 "info_type": EpisodeInfoType.OTHER,
                 "title": "Otros Diagnósticos",
@@ -485,16 +693,16 @@ class ExcelUploader:
         tratamiento = row.get("TRATAMIENTO")
         frecuencia = row.get("FRECUENCIA")
         acceso = row.get("ACCESO VASCULAR")
-        if (not pd.isna(tratamiento) and str(tratamiento).strip().lower() != 'nan') or \
-           (not pd.isna(frecuencia) and str(frecuencia).strip().lower() != 'nan') or \
-           (not pd.isna(acceso) and str(acceso).strip().lower() != 'nan'):
+        if not _is_missing(tratamiento) or \
+           not _is_missing(frecuencia) or \
+           not _is_missing(acceso):
             episode_info_records.append({
                 "info_type": EpisodeInfoType.OTHER,
                 "title": "Tratamiento y Acceso",
                 "value": {
-                    "tratamiento": str(tratamiento).strip() if not pd.isna(tratamiento) else None,
-                    "frecuencia": str(frecuencia).strip() if not pd.isna(frecuencia) else None,
-                    "acceso_vascular": str(acceso).strip() if not pd.isna(acceso) else None,
+                    "tratamiento": _clean_text(tratamiento),
+                    "frecuencia": _clean_text(frecuencia),
+                    "acceso_vascular": _clean_text(acceso),
                 },
             })
 
@@ -502,16 +710,16 @@ class ExcelUploader:
         causa_rechazo = row.get("CAUSA RECHAZO") or row.get("TEXTO LIBRE CAUSA")
         motivos_rechazo = row.get("Motivos Rechazo")
         motivos_devolucion = row.get("Motivos Devolución")
-        if (not pd.isna(causa_rechazo) and str(causa_rechazo).strip().lower() != 'nan') or \
-           (not pd.isna(motivos_rechazo) and str(motivos_rechazo).strip().lower() != 'nan') or \
-           (not pd.isna(motivos_devolucion) and str(motivos_devolucion).strip().lower() != 'nan'):
+        if not _is_missing(causa_rechazo) or \
+           not _is_missing(motivos_rechazo) or \
+           not _is_missing(motivos_devolucion):
             episode_info_records.append({
                 "info_type": EpisodeInfoType.OTHER,
                 "title": "Rechazos y Devoluciones",
                 "value": {
-                    "causa_rechazo": str(causa_rechazo).strip() if not pd.isna(causa_rechazo) else None,
-                    "motivos_rechazo": str(motivos_rechazo).strip() if not pd.isna(motivos_rechazo) else None,
-                    "motivos_devolucion": str(motivos_devolucion).strip() if not pd.isna(motivos_devolucion) else None,
+                    "causa_rechazo": _clean_text(causa_rechazo),
+                    "motivos_rechazo": _clean_text(motivos_rechazo),
+                    "motivos_devolucion": _clean_text(motivos_devolucion),
                 },
             })
 
@@ -522,9 +730,9 @@ class ExcelUploader:
         ]
         extra_values = {}
         for col in extras:
-            if col in row.index:
+            if col in row:
                 val = row.get(col)
-                if not pd.isna(val) and str(val).strip().lower() != 'nan':
+                if not _is_missing(val):
                     extra_values[col] = str(val).strip()
 
         if extra_values:
@@ -534,13 +742,211 @@ class ExcelUploader:
                 "value": extra_values,
             })
 
-        # Persist episode info records
-        for info in episode_info_records:
-            await self._create_clinical_episode_information(episode.id, info)
+        return episode_info_records
+
+    async def _fetch_id_map(self, key_column, id_column, keys) -> Dict[Any, UUID]:
+        """Map keys to ids with chunked ``IN`` queries (first match wins for duplicate keys)."""
+        id_map: Dict[Any, UUID] = {}
+        keys = list(keys)
+        for i in range(0, len(keys), BULK_CHUNK_SIZE):
+            chunk = keys[i:i + BULK_CHUNK_SIZE]
+            result = await self.db.execute(
+                select(key_column, id_column).where(key_column.in_(chunk))
+            )
+            for key, row_id in result.all():
+                id_map.setdefault(key, row_id)
+        return id_map
+
+    async def _bulk_import_gestion_rows(self, parsed_rows: list[Dict[str, Any]]) -> None:
+        """
+        Write parsed UCCC rows with a handful of set-based statements.
+
+        Existing patients, beds and episodes are prefetched with ``IN`` queries.
+        New patients and patient information are written with chunked
+        ``INSERT ... ON CONFLICT``; episodes whose ``episode_identifier`` already
+        exists are updated in place and get their UCCC information records
+        replaced, the rest are inserted.
+
+        Args:
+            parsed_rows: Output of ``_parse_gestion_row`` for every sheet row
+        """
+        if not parsed_rows:
+            return
+
+        patient_table = Patient.__table__
+        info_table = PatientInformation.__table__
+        episode_table = ClinicalEpisode.__table__
+        episode_info_table = ClinicalEpisodeInformation.__table__
+
+        # ---- Patients: keep the first row per medical identifier, insert the unknown ones
+        patients_by_mid: Dict[str, Dict[str, Any]] = {}
+        for parsed in parsed_rows:
+            patients_by_mid.setdefault(parsed["patient"]["medical_identifier"], parsed["patient"])
+
+        patient_ids = await self._fetch_id_map(
+            Patient.medical_identifier, Patient.id, patients_by_mid.keys()
+        )
+        patient_rows = [
+            {
+                "id": uuid4(),
+                **data,
+                # Core inserts skip the model's validators; fill the search key here
+                "search_name": patient_search_name(data["first_name"], data["last_name"]),
+            }
+            for mid, data in patients_by_mid.items()
+            if mid not in patient_ids
+        ]
+        for i in range(0, len(patient_rows), BULK_CHUNK_SIZE):
+            stmt = (
+                pg_insert(patient_table)
+                .values(patient_rows[i:i + BULK_CHUNK_SIZE])
+                .on_conflict_do_nothing(index_elements=["medical_identifier"])
+                .returning(patient_table.c.medical_identifier, patient_table.c.id)
+            )
+            for mid, patient_id in (await self.db.execute(stmt)).all():
+                patient_ids[mid] = patient_id
+
+        # Rows skipped by ON CONFLICT were inserted concurrently; read their ids
+        missing = [mid for mid in patients_by_mid if mid not in patient_ids]
+        if missing:
+            patient_ids.update(
+                await self._fetch_id_map(Patient.medical_identifier, Patient.id, missing)
+            )
+        logger.info(f"UCCC import: {len(patient_rows)} new patients, {len(patients_by_mid) - len(patient_rows)} existing")
+
+        # ---- Patient information: last row per patient wins (upsert on patient_id)
+        info_by_patient: Dict[UUID, Dict[str, Any]] = {}
+        for parsed in parsed_rows:
+            if parsed["patient_info"]:
+                info_by_patient[patient_ids[parsed["patient"]["medical_identifier"]]] = parsed["patient_info"]
+
+        info_rows = [
+            {"id": uuid4(), "patient_id": patient_id, "information": information}
+            for patient_id, information in info_by_patient.items()
+        ]
+        for i in range(0, len(info_rows), BULK_CHUNK_SIZE):
+            stmt = pg_insert(info_table).values(info_rows[i:i + BULK_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["patient_id"],
+                set_={"information": stmt.excluded.information, "updated_at": func.now()},
+            )
+            await self.db.execute(stmt)
+
+        # ---- Beds: resolve every room in one pass
+        rooms = {p["episode"].get("bed_room") for p in parsed_rows} - {None}
+        bed_ids = await self._fetch_id_map(Bed.room, Bed.id, rooms)
+        for room in rooms - bed_ids.keys():
+            logger.warning(f"Bed not found for room '{room}', episode will have no bed assigned")
+
+        # ---- Episodes: update the ones already imported, insert the rest
+        identifiers = {
+            p["episode"].get("episode_identifier") for p in parsed_rows
+        } - {None}
+        existing_episode_ids = await self._fetch_id_map(
+            ClinicalEpisode.episode_identifier, ClinicalEpisode.id, identifiers
+        )
+
+        new_episode_rows = []
+        updates_by_identifier: Dict[str, Dict[str, Any]] = {}
+        info_record_rows = []
+        for parsed in parsed_rows:
+            episode_data = parsed["episode"]
+            identifier = episode_data.get("episode_identifier")
+            values = {
+                "patient_id": patient_ids[parsed["patient"]["medical_identifier"]],
+                "bed_id": bed_ids.get(episode_data.get("bed_room")),
+                "admission_at": episode_data["admission_at"],
+                "expected_discharge": episode_data.get("expected_discharge"),
+                "discharge_at": episode_data.get("discharge_at"),
+                "status": episode_data["status"],
+                "episode_identifier": identifier,
+            }
+
+            if identifier in existing_episode_ids:
+                episode_id = existing_episode_ids[identifier]
+                # Later rows for the same episode replace earlier ones
+                updates_by_identifier[identifier] = {"episode_id": episode_id, **values}
+            else:
+                episode_id = uuid4()
+                if values["admission_at"] is None:
+                    values["admission_at"] = datetime.now()
+                new_episode_rows.append({"id": episode_id, **values})
+                if identifier:
+                    existing_episode_ids[identifier] = episode_id
+
+            info_record_rows.extend(
+                {"id": uuid4(), "episode_id": episode_id, **info}
+                for info in parsed["info_records"]
+            )
+
+        for i in range(0, len(new_episode_rows), BULK_CHUNK_SIZE):
+            await self.db.execute(
+                pg_insert(episode_table).values(new_episode_rows[i:i + BULK_CHUNK_SIZE])
+            )
+        if new_episode_rows or updates_by_identifier:
+            self._invalidate_episode_index()
+
+        if updates_by_identifier:
+            # A missing admission or discharge in UCCC keeps the stored value
+            # (for discharges, whatever ALTAS already recorded).
+            # Bind names must differ from the column names in the SET clause.
+            new_discharge_at = bindparam("new_discharge_at", type_=episode_table.c.discharge_at.type)
+            stmt = (
+                update(episode_table)
+                .where(episode_table.c.id == bindparam("episode_id"))
+                .values(
+                    patient_id=bindparam("new_patient_id"),
+                    bed_id=bindparam("new_bed_id"),
+                    admission_at=func.coalesce(
+                        bindparam("new_admission_at", type_=episode_table.c.admission_at.type),
+                        episode_table.c.admission_at,
+                    ),
+                    expected_discharge=func.coalesce(
+                        bindparam("new_expected_discharge", type_=episode_table.c.expected_discharge.type),
+                        episode_table.c.expected_discharge,
+                    ),
+                    discharge_at=func.coalesce(new_discharge_at, episode_table.c.discharge_at),
+                    status=case(
+                        (new_discharge_at.is_(None), episode_table.c.status),
+                        else_=bindparam("new_status", type_=episode_table.c.status.type),
+                    ),
+                )
+            )
+            update_rows = [
+                {
+                    "episode_id": row["episode_id"],
+                    "new_patient_id": row["patient_id"],
+                    "new_bed_id": row["bed_id"],
+                    "new_admission_at": row["admission_at"],
+                    "new_expected_discharge": row["expected_discharge"],
+                    "new_discharge_at": row["discharge_at"],
+                    "new_status": row["status"],
+                }
+                for row in updates_by_identifier.values()
+            ]
+            await self.db.execute(stmt, update_rows)
+
+            # Replace the information records a previous UCCC import created
+            updated_ids = [row["episode_id"] for row in update_rows]
+            for i in range(0, len(updated_ids), BULK_CHUNK_SIZE):
+                await self.db.execute(
+                    delete(episode_info_table).where(
+                        episode_info_table.c.episode_id.in_(updated_ids[i:i + BULK_CHUNK_SIZE]),
+                        episode_info_table.c.title.in_(UCCC_INFO_TITLES),
+                    )
+                )
 
-        logger.info(f"Processed UCCC patient {patient.medical_identifier} row {row_idx}")
+        for i in range(0, len(info_record_rows), BULK_CHUNK_SIZE):
+            await self.db.execute(
+                pg_insert(episode_info_table).values(info_record_rows[i:i + BULK_CHUNK_SIZE])
+            )
 
-    def _parse_gestion_patient_data(self, row: pd.Series) -> Optional[Dict[str, Any]]:
+        logger.info(
+            f"UCCC import: {len(new_episode_rows)} episodes created, "
+            f"{len(updates_by_identifier)} updated, {len(info_record_rows)} info records written"
+        )
+
+    def _parse_gestion_patient_data(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse patient basic data from Gestion Estadía (UCCC) row.
 
         Uses RUT column as `medical_identifier`. If RUT missing, generate a placeholder RUT
@@ -552,9 +958,9 @@ class ExcelUploader:
             rut_raw = row.get("RUT")
 
             episodio_raw = row.get("Episodio:") or row.get("Episodio") or row.get("Episodio / Estadía")
-            episodio_str = str(episodio_raw).strip() if not pd.isna(episodio_raw) else None
+            episodio_str = _clean_text(episodio_raw)
 
-            if pd.isna(rut_raw) or str(rut_raw).strip() == "" or str(rut_raw).strip().lower() == "nan":
+            if _is_missing(rut_raw):
                 # Generate rut if missing, using episodio as seed if available
                 seed = episodio_str or str(uuid4())
                 rut = generate_rut(seed)
@@ -565,7 +971,7 @@ class ExcelUploader:
 
             # Nombre
             nombre_raw = row.get("Nombre")
-            if pd.isna(nombre_raw) or str(nombre_raw).strip() == "" or str(nombre_raw).strip().lower() == "nan":
+            if _is_missing(nombre_raw):
                 # Use episode seed for consistent placeholder name
                 seed = episodio_str or medical_identifier
                 first_name, last_name = get_name(seed)
@@ -652,10 +1058,12 @@ class ExcelUploader:
             logger.error(f"Error parsing UCCC patient data: {e}")
             return None
 
-    def _parse_gestion_episode_data(self, row: pd.Series) -> Dict[str, Any]:
+    def _parse_gestion_episode_data(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """Parse clinical episode data from Gestion Estadía (UCCC) row.
 
-        - Admission: from "Fecha Inicio:" and optional "Hora Inicio:" columns
+        - Admission: from "Fecha Inicio:" and optional "Hora Inicio:" columns;
+          None when missing or unreadable (existing episodes keep their stored
+          admission, new ones are admitted at import time)
         - Discharge: attempts to find any column with keywords (alta/egreso/salida/fin)
         - Bed: from "CAMA" column
         - Status: DISCHARGED if discharge_at present
@@ -666,9 +1074,8 @@ class ExcelUploader:
             admission_time_raw = row.get("Hora Inicio:") or row.get("Hora Inicio")
 
             # Parse admission date: common format in file is DD-MM-YY (e.g., 30-10-24)
-            if pd.isna(admission_date_raw):
-                admission_at = datetime.now()
-            else:
+            admission_at = None
+            if not pd.isna(admission_date_raw):
                 ad_dt = None
                 # Normalize string if not a Timestamp
                 try:
@@ -701,13 +1108,11 @@ class ExcelUploader:
 
                     if ad_dt is not None and not pd.isna(ad_dt):
                         admission_at = ad_dt.to_pydatetime()
-                    else:
-                        admission_at = datetime.now()
                 except Exception:
-                    admission_at = datetime.now()
+                    admission_at = None
 
             # If a time column exists, try to combine (formats like HH:MM:SS)
-            if not pd.isna(admission_time_raw):
+            if admission_at is not None and not pd.isna(admission_time_raw):
                 try:
                     # Normalize time string
                     if isinstance(admission_time_raw, pd.Timestamp):
@@ -732,7 +1137,7 @@ class ExcelUploader:
             # Discharge: attempt to find a discharge-like column
             discharge_at = None
             expected_discharge = None
-            discharge_candidates = [c for c in row.index if isinstance(c, str) and any(k in c.lower() for k in ["alta", "egreso", "salida", "fin", "termin"]) ]
+            discharge_candidates = [c for c in row.keys() if isinstance(c, str) and any(k in c.lower() for k in ["alta", "egreso", "salida", "fin", "termin"]) ]
             discharge_col = discharge_candidates[0] if discharge_candidates else None
             if discharge_col:
                 discharge_raw = row.get(discharge_col)
@@ -763,7 +1168,7 @@ class ExcelUploader:
             eps = row.get("Episodio:") or row.get("Episodio") or row.get("Episodio / Estadía")
             if eps is None:
                 # Try to find any column containing 'episodio' in its name
-                for col in row.index:
+                for col in row.keys():
                     if isinstance(col, str) and 'episodio' in col.lower():
                         eps = row.get(col)
                         logger.debug(f"Found episode column '{col}' with value: {eps}")
@@ -788,13 +1193,13 @@ class ExcelUploader:
         except Exception as e:
             logger.error(f"Error parsing UCCC episode data: {e}")
             return {
-                "admission_at": datetime.now(),
+                "admission_at": None,
                 "status": EpisodeStatus.ACTIVE,
                 "bed_room": None,
                 "episode_identifier": None,
             }
 
-    async def _process_patient_row(self, row: pd.Series, row_idx: int) -> None:
+    async def _process_patient_row(self, row: Dict[str, Any], row_idx: int) -> None:
         """Process a single patient row from the Excel file."""
         # Parse patient data
         patient_data = self._parse_patient_data(row)
@@ -824,7 +1229,7 @@ class ExcelUploader:
             f"Processed patient {patient.medical_identifier} with episode {episode.id}"
         )
 
-    def _parse_patient_data(self, row: pd.Series) -> Optional[Dict[str, Any]]:
+    def _parse_patient_data(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Parse patient basic data from Excel row.
 
@@ -859,7 +1264,7 @@ class ExcelUploader:
             
             # Check if RUT exists in the data - RUT is the medical_identifier
             rut_raw = row.get("RUT")
-            if pd.isna(rut_raw) or str(rut_raw).strip() == "" or str(rut_raw).strip().lower() == "nan":
+            if _is_missing(rut_raw):
                 # Generate placeholder RUT using episode as seed for consistency
                 rut = generate_rut(episodio_str)
                 medical_identifier = rut  # Generated RUT is the medical identifier
@@ -870,7 +1275,7 @@ class ExcelUploader:
             
             # Check if Nombre exists in the data
             nombre_raw = row.get("Nombre")
-            if pd.isna(nombre_raw) or str(nombre_raw).strip() == "" or str(nombre_raw).strip().lower() == "nan":
+            if _is_missing(nombre_raw):
                 # Generate placeholder name using episode as seed
                 first_name, last_name = get_name(episodio_str)
             else:
@@ -916,7 +1321,7 @@ class ExcelUploader:
             logger.error(f"Error parsing patient data: {e}")
             return None
 
-    def _parse_patient_information(self, row: pd.Series) -> Optional[Dict[str, Any]]:
+    def _parse_patient_information(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Parse patient information (additional data stored as JSONB).
 
@@ -941,7 +1346,7 @@ class ExcelUploader:
             ]
 
             # Add all columns as additional info, storing null for missing values
-            for col in row.index:
+            for col in row.keys():
                 # Skip columns that are used in other tables
                 if col in excluded_columns:
                     continue
@@ -972,7 +1377,7 @@ class ExcelUploader:
             logger.error(f"Error parsing patient information: {e}")
             return {}
 
-    def _parse_clinical_episode_data(self, row: pd.Series) -> Dict[str, Any]:
+    def _parse_clinical_episode_data(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parse clinical episode data from Excel row.
         
@@ -1084,7 +1489,7 @@ class ExcelUploader:
             }
 
     def _parse_clinical_episode_information(
-        self, row: pd.Series
+        self, row: Dict[str, Any]
     ) -> list[Dict[str, Any]]:
         """
         Parse clinical episode information records from Excel row.
@@ -1104,7 +1509,7 @@ class ExcelUploader:
         try:
             # Diagnosis information
             diagnosis = row.get("Texto libre diagnóstico admisión")
-            diagnosis_value = str(diagnosis).strip() if not pd.isna(diagnosis) and str(diagnosis).strip().lower() != 'nan' else None
+            diagnosis_value = _clean_text(diagnosis)
             if diagnosis_value:
                 records.append({
                     "info_type": EpisodeInfoType.DIAGNOSIS,
@@ -1114,7 +1519,7 @@ class ExcelUploader:
 
             # Service/Department
             servicio = row.get("Servicio")
-            servicio_value = str(servicio).strip() if not pd.isna(servicio) and str(servicio).strip().lower() != 'nan' else None
+            servicio_value = _clean_text(servicio)
             if servicio_value:
                 records.append({
                     "info_type": EpisodeInfoType.NOTES,
@@ -1124,7 +1529,7 @@ class ExcelUploader:
 
             # Healthcare Center
             centro = row.get("Centro Atención")
-            centro_value = str(centro).strip() if not pd.isna(centro) and str(centro).strip().lower() != 'nan' else None
+            centro_value = _clean_text(centro)
             if centro_value:
                 records.append({
                     "info_type": EpisodeInfoType.NOTES,
@@ -1142,9 +1547,9 @@ class ExcelUploader:
                     "info_type": EpisodeInfoType.OTHER,
                     "title": "Clasificaciones",
                     "value": {
-                        "marca_1": str(marca1).strip() if not pd.isna(marca1) else None,
-                        "marca_2": str(marca2).strip() if not pd.isna(marca2) else None,
-                        "marca_3": str(marca3).strip() if not pd.isna(marca3) else None,
+                        "marca_1": _clean_text(marca1),
+                        "marca_2": _clean_text(marca2),
+                        "marca_3": _clean_text(marca3),
                     },
                 })
 
@@ -1158,9 +1563,9 @@ class ExcelUploader:
                     "info_type": EpisodeInfoType.OTHER,
                     "title": "Información de Cobertura",
                     "value": {
-                        "convenio": str(convenio).strip() if not pd.isna(convenio) else None,
-                        "aseguradora": str(aseguradora).strip() if not pd.isna(aseguradora) else None,
-                        "prevision": str(prevision).strip() if not pd.isna(prevision) else None,
+                        "convenio": _clean_text(convenio),
+                        "aseguradora": _clean_text(aseguradora),
+                        "prevision": _clean_text(prevision),
                     },
                 })
 
@@ -1191,10 +1596,10 @@ class ExcelUploader:
                     "info_type": EpisodeInfoType.OTHER,
                     "title": "Información de Encuesta",
                     "value": {
-                        "encuesta": str(encuesta).strip() if not pd.isna(encuesta) else None,
-                        "motivo": str(motivo).strip() if not pd.isna(motivo) else None,
+                        "encuesta": _clean_text(encuesta),
+                        "motivo": _clean_text(motivo),
                         "puntaje": puntaje_value,
-                        "encuestadora": str(encuestadora).strip() if not pd.isna(encuestadora) else None,
+                        "encuestadora": _clean_text(encuestadora),
                     },
                 })
 
@@ -1246,7 +1651,7 @@ class ExcelUploader:
             ]
             
             # Store any other columns as OTHER type
-            for col in row.index:
+            for col in row.keys():
                 if col in known_columns:
                     continue
                 
@@ -1338,6 +1743,7 @@ class ExcelUploader:
         episode = ClinicalEpisode(patient_id=patient_id, **episode_data)
         self.db.add(episode)
         await self.db.flush()  # Flush to get the ID
+        self._invalidate_episode_index()
         # We store the episode_identifier directly on the ClinicalEpisode model.
         # For backward compatibility, older imports may have stored it in
         # ClinicalEpisodeInformation; we no longer create that duplicate.
@@ -1345,116 +1751,72 @@ class ExcelUploader:
         logger.info(f"Created clinical episode for patient {patient_id} with bed_id {bed_id}")
         return episode
 
-    async def _find_episode_by_identifier(self, episode_identifier: str) -> Optional[ClinicalEpisode]:
-        """Find a ClinicalEpisode by its episode_identifier column or via legacy info records.
+    def _read_altas_records(self, workbook: WorkbookLoader) -> list[Dict[str, Any]]:
+        """Read the ALTAS sheet and map its columns to canonical names."""
+        # Detect the header row similarly to UCCC
+        df = workbook.read_sheet(
+            "ALTAS", header_tokens=["episodio", "alta", "fe", "fe.", "hr", "hora"], min_tokens=2
+        )
 
-        Returns the ClinicalEpisode or None if not found.
-        """
-        if not episode_identifier:
+        # Normalize column names and build map
+        df.columns = df.columns.map(lambda c: c if not isinstance(c, str) else c.strip())
+        col_map = {}
+        for col in df.columns:
+            if isinstance(col, str):
+                norm = self._normalize_col_name(col) if hasattr(self, '_normalize_col_name') else col.strip().lower()
+                col_map[norm] = col
+
+        # Map ALTAS canonical columns
+        candidates = {
+            "Episodio": ["Episodio", "episodio"],
+            "Fe. Alta": ["Fe. Alta", "Fe Alta", "Fecha Alta", "Fecha de Alta", "fecha alta", "fe. alta", "fe alta", "fecha"],
+            "Hr. Alta": ["Hr. Alta", "Hr Alta", "Hora Alta", "Hora", "hr", "hora"]
+        }
+
+        def find_orig_alt(col_map, cand_list):
+            for c in cand_list:
+                norm = self._normalize_col_name(c)
+                if norm in col_map:
+                    return col_map[norm]
+            for c in cand_list:
+                norm = self._normalize_col_name(c)
+                for k, v in col_map.items():
+                    if k.startswith(norm) or norm.startswith(k):
+                        return v
             return None
 
-        # First, try direct match on the new column
-        stmt = select(ClinicalEpisode).where(ClinicalEpisode.episode_identifier == episode_identifier)
-        result = await self.db.execute(stmt)
-        episode = result.scalar_one_or_none()
-        if episode:
-            return episode
+        rename_map = {}
+        for canonical, cands in candidates.items():
+            orig = find_orig_alt(col_map, cands)
+            if orig:
+                rename_map[orig] = canonical
 
-        # Fallback: search legacy ClinicalEpisodeInformation JSONB value for episode_identifier
-        try:
-            stmt2 = select(ClinicalEpisodeInformation).where(
-                ClinicalEpisodeInformation.value["episode_identifier"].astext == episode_identifier
-            )
-            res2 = await self.db.execute(stmt2)
-            info = res2.scalar_one_or_none()
-            if info:
-                stmt3 = select(ClinicalEpisode).where(ClinicalEpisode.id == info.episode_id)
-                res3 = await self.db.execute(stmt3)
-                return res3.scalar_one_or_none()
-        except Exception:
-            # JSONB lookup may fail if DB doesn't support the operator; ignore and return None
-            pass
+        if rename_map:
+            df = df.rename(columns=rename_map)
 
-        return None
+        logger.info(f"Found {len(df)} rows in ALTAS sheet; columns: {list(df.columns)}")
+
+        records = _frame_to_records(df, date_columns={"Fe. Alta": (("%d-%m-%Y",), True)})
+        return records
 
-    async def _process_altas_sheet(self, excel_path: str | Path) -> int:
-        """Read the ALTAS sheet and update episode discharge datetimes.
+    async def _process_altas_records(self, records: list[Dict[str, Any]]) -> int:
+        """Update episode discharge datetimes from the ALTAS sheet records.
 
-        Expected columns (variants):
+        Expected columns (variants, mapped by ``_read_altas_records``):
         - Episodio
         - Fe. Alta / Fecha Alta / Fecha de Alta / Fecha
         - Hr. Alta / Hora Alta / Hora
         """
-        logger.info(f"Reading ALTAS data from {excel_path}")
+        logger.info(f"Applying {len(records)} ALTAS records")
         try:
-            raw = pd.read_excel(excel_path, sheet_name="ALTAS", header=None)
-
-            # Try to detect header row similarly to UCCC
-            def _detect_header_row(df_raw, max_scan=20, min_tokens=2):
-                tokens = ["episodio", "alta", "fe", "fe.", "hr", "hora"]
-                scan_rows = min(max_scan, len(df_raw))
-                for i in range(scan_rows):
-                    row = df_raw.iloc[i].fillna("").astype(str).str.lower().tolist()
-                    found = set()
-                    for cell in row:
-                        for t in tokens:
-                            if t in cell:
-                                found.add(t)
-                    if len(found) >= min_tokens:
-                        return i
-                return None
-
-            header_idx = _detect_header_row(raw)
-            if header_idx is None:
-                df = pd.read_excel(excel_path, sheet_name="ALTAS")
-            else:
-                df = pd.read_excel(excel_path, sheet_name="ALTAS", header=header_idx)
-
-            # Normalize column names and build map
-            df.columns = df.columns.map(lambda c: c if not isinstance(c, str) else c.strip())
-            col_map = {}
-            for col in df.columns:
-                if isinstance(col, str):
-                    norm = self._normalize_col_name(col) if hasattr(self, '_normalize_col_name') else col.strip().lower()
-                    col_map[norm] = col
-
-            # Map ALTAS canonical columns
-            candidates = {
-                "Episodio": ["Episodio", "episodio"],
-                "Fe. Alta": ["Fe. Alta", "Fe Alta", "Fecha Alta", "Fecha de Alta", "fecha alta", "fe. alta", "fe alta", "fecha"],
-                "Hr. Alta": ["Hr. Alta", "Hr Alta", "Hora Alta", "Hora", "hr", "hora"]
-            }
-
-            def find_orig_alt(col_map, cand_list):
-                for c in cand_list:
-                    norm = self._normalize_col_name(c)
-                    if norm in col_map:
-                        return col_map[norm]
-                for c in cand_list:
-                    norm = self._normalize_col_name(c)
-                    for k, v in col_map.items():
-                        if k.startswith(norm) or norm.startswith(k):
-                            return v
-                return None
-
-            rename_map = {}
-            for canonical, cands in candidates.items():
-                orig = find_orig_alt(col_map, cands)
-                if orig:
-                    rename_map[orig] = canonical
-
-            if rename_map:
-                df = df.rename(columns=rename_map)
-
-            logger.info(f"Found {len(df)} rows in ALTAS sheet; columns: {list(df.columns)}")
-
-            updated = 0
-            for idx, row in df.iterrows():
+            # (identifier, discharge datetime) in sheet order
+            parsed: list[tuple[str, datetime]] = []
+            for idx, row in self._track(records):
                 try:
                     eps_raw = row.get("Episodio")
                     if pd.isna(eps_raw):
                         continue
-                    episode_identifier = str(eps_raw).strip()
+                    episode_identifier = normalize_identifier(eps_raw)
                     # Parse date
                     fecha_raw = row.get("Fe. Alta")
                     hora_raw = row.get("Hr. Alta")
@@ -1510,33 +1872,110 @@ class ExcelUploader:
                     else:
                         continue
 
-                    # Find the episode and update
-                    episode = await self._find_episode_by_identifier(episode_identifier)
-                    if not episode:
-                        logger.warning(f"ALTAS: episode with identifier '{episode_identifier}' not found; skipping")
-                        continue
-
-                    episode.discharge_at = discharge_at
-                    episode.status = EpisodeStatus.DISCHARGED
-                    try:
-                        episode.expected_discharge = discharge_at.date()
-                    except Exception:
-                        episode.expected_discharge = None
-                    episode.status = EpisodeStatus.DISCHARGED
-                    await self.db.flush()
-                    updated += 1
+                    parsed.append((episode_identifier, discharge_at))
 
                 except Exception as e:
-                    logger.error(f"Error processing ALTAS row {idx}: {e}")
+                    self._row_error(f"Error processing ALTAS row {idx}: {e}")
                     continue
 
+            # Discharging the wrong episode is not recoverable, so only exact
+            # identifiers count here (no fuzzy index fallbacks)
+            episode_ids = await self._episode_ids_by_exact_identifier(
+                {identifier for identifier, _ in parsed}
+            )
+            discharges: Dict[UUID, datetime] = {}
+            for episode_identifier, discharge_at in parsed:
+                episode_id = episode_ids.get(episode_identifier)
+                if not episode_id:
+                    logger.warning(f"ALTAS: episode with identifier '{episode_identifier}' not found; skipping")
+                    continue
+                # Later rows for the same episode replace earlier ones
+                discharges[episode_id] = discharge_at
+
+            updated = await self._bulk_apply_discharges(discharges)
             logger.info(f"ALTAS updates applied: {updated} episodes updated")
             return updated
 
         except Exception as e:
-            logger.warning(f"ALTAS sheet not available or parsing failed: {e}")
+            logger.warning(f"ALTAS updates failed: {e}")
             return 0
 
+    async def _episode_ids_by_exact_identifier(self, identifiers: set[str]) -> Dict[str, UUID]:
+        """
+        Look up episodes whose identifier equals one of ``identifiers`` exactly.
+
+        Matches ``ClinicalEpisode.episode_identifier`` and the legacy
+        ``episode_identifier`` key of ClinicalEpisodeInformation, with one
+        ``IN (...)`` query per chunk; the episode column wins over the legacy key.
+
+        Args:
+            identifiers: Normalized episode identifiers
+
+        Returns:
+            Episode id per matched identifier
+        """
+        legacy_identifier = ClinicalEpisodeInformation.value["episode_identifier"].astext
+        found: Dict[str, UUID] = {}
+        pending = sorted(identifier for identifier in identifiers if identifier)
+        for i in range(0, len(pending), BULK_CHUNK_SIZE):
+            chunk = pending[i:i + BULK_CHUNK_SIZE]
+            direct = (
+                select(ClinicalEpisode.episode_identifier.label("identifier"),
+                       ClinicalEpisode.id.label("episode_id"),
+                       literal(0).label("source"))
+                .where(ClinicalEpisode.episode_identifier.in_(chunk))
+            )
+            legacy = (
+                select(legacy_identifier.label("identifier"),
+                       ClinicalEpisodeInformation.episode_id.label("episode_id"),
+                       literal(1).label("source"))
+                .where(legacy_identifier.in_(chunk))
+            )
+            matches = union_all(direct, legacy).subquery()
+            rows = await self.db.execute(
+                select(matches.c.identifier, matches.c.episode_id)
+                .order_by(matches.c.source.desc())
+            )
+            # Direct matches come last and overwrite legacy ones
+            found.update(rows.all())
+        return found
+
+    async def _bulk_apply_discharges(self, discharges: Dict[UUID, datetime]) -> int:
+        """
+        Mark episodes discharged with chunked ``UPDATE clinical_episodes ... FROM (VALUES ...)``.
+
+        Sets ``discharge_at``, ``expected_discharge`` (the discharge date) and
+        the DISCHARGED status.
+
+        Args:
+            discharges: Discharge datetime per episode id
+
+        Returns:
+            Number of episodes updated
+        """
+        episode_table = ClinicalEpisode.__table__
+        rows = [
+            (episode_id, discharge_at, discharge_at.date())
+            for episode_id, discharge_at in discharges.items()
+        ]
+        for i in range(0, len(rows), BULK_CHUNK_SIZE):
+            incoming = values_clause(
+                column("episode_id", episode_table.c.id.type),
+                column("discharge_at", episode_table.c.discharge_at.type),
+                column("expected_discharge", episode_table.c.expected_discharge.type),
+                name="incoming",
+            ).data(rows[i:i + BULK_CHUNK_SIZE])
+            await self.db.execute(
+                update(episode_table)
+                .where(episode_table.c.id == incoming.c.episode_id)
+                .values(
+                    discharge_at=incoming.c.discharge_at,
+                    expected_discharge=incoming.c.expected_discharge,
+                    status=EpisodeStatus.DISCHARGED,
+                )
+            )
+        return len(rows)
+
     async def _create_clinical_episode_information(
         self, episode_id: UUID, info_data: Dict[str, Any]
     ) -> ClinicalEpisodeInformation:
@@ -1565,6 +2004,12 @@ class ExcelUploader:
           Fecha Asignación (recorded_at), Encuestadora (recorded_by), Motivo (no_score_reason)
         - Creates SocialScoreHistory records for matching episodes
         - Handles null scores by storing the reason from "Motivo" column
+        - Updates the episodes' coverage / admission columns
+
+        Rows are collected first and written with one bulk UPDATE and one
+        multi-row INSERT per chunk. Scores already stored for the same episode
+        and Fecha Asignación are skipped, so re-uploading a sheet is a no-op;
+        rows without a Fecha Asignación are dated at the episode's admission.
 
         Args:
             excel_path: Path to the "Score Social.xlsx" file
@@ -1578,75 +2023,75 @@ class ExcelUploader:
         logger.info(f"Reading social score data from {excel_path}")
 
         try:
-            df = pd.read_excel(excel_path, sheet_name="Data Casos")
-            logger.info(f"Found {len(df)} rows in Data Casos sheet")
+            records = await self._parse(
+                "_read_sheet_records", excel_path, "Data Casos",
+                {"Fecha Asignación": (("%d-%m-%Y",), False)},
+            )
 
-            scores_created = 0
             missing_ids = []
-            episodes_updated = 0
-
-            # Build a map of episode_identifier -> episode_id for quick lookup
-            episode_map = await self._build_episode_identifier_map()
-            logger.info(f"Built episode map with {len(episode_map)} entries")
-
-            for idx, row in df.iterrows():
+            # Episode columns merged per episode (later rows override earlier
+            # ones) and scores keyed by (episode, recorded_at), first row wins
+            episode_fields: Dict[UUID, Dict[str, str]] = {}
+            scores_by_key: Dict[tuple, Dict[str, Any]] = {}
+            # Scores in sheet order, until undated ones get their recorded_at
+            parsed_scores: list[tuple[UUID, Dict[str, Any]]] = []
+
+            # Episode identifier index, shared with earlier imports of this job
+            episode_index = await self._episode_index()
+            logger.info(f"Built episode index with {len(episode_index)} entries")
+
+            for idx, row in self._track(records):
                 try:
                     score_data = self._parse_social_score_row(row)
                     # Extract episode_identifier early to use for both score and episode field updates
                     episode_identifier = score_data.pop("episode_identifier", None) if score_data else None
 
-                    # Map columns from Social Score Excel to ClinicalEpisode fields
-                    prevision_desc = row.get("Desc. Convenio")
-                    tipo_ingreso_desc = row.get("Vía de Ingreso")
-                    servicio_ingreso_desc = row.get("Servicio")
-
-                    # Normalize values: keep None for NaN/empty strings
-                    def norm_str(v):
-                        if v is None or pd.isna(v):
-                            return None
-                        s = str(v).strip()
-                        return s if s and s.lower() != 'nan' else None
-
-                    prevision_desc = norm_str(prevision_desc)
-                    tipo_ingreso_desc = norm_str(tipo_ingreso_desc)
-                    servicio_ingreso_desc = norm_str(servicio_ingreso_desc)
-
-                    # Update episode fields if episode exists
-                    if episode_identifier and episode_identifier in episode_map:
-                        episode_id = episode_map[episode_identifier]
-
-                        # Load episode and update fields
-                        stmt_ep = select(ClinicalEpisode).where(ClinicalEpisode.id == episode_id)
-                        res_ep = await self.db.execute(stmt_ep)
-                        episode = res_ep.scalar_one_or_none()
-                        if episode:
-                            changed = False
-                            if prevision_desc is not None:
-                                episode.prevision_desc = prevision_desc
-                                changed = True
-                            if tipo_ingreso_desc is not None:
-                                episode.tipo_ingreso_desc = tipo_ingreso_desc
-                                changed = True
-                            if servicio_ingreso_desc is not None:
-                                episode.servicio_ingreso_desc = servicio_ingreso_desc
-                                changed = True
-                            if changed:
-                                await self.db.flush()
-                                episodes_updated += 1
-
-                        # Also create social score record if present
-                        if score_data:
-                            await self._create_social_score(episode_id, score_data)
-                            scores_created += 1
-                    else:
+                    # Scores write history, episode fields and alerts, so only
+                    # exact identifiers count (no folded/numeric-core matches)
+                    episode_id = episode_index.get_exact(episode_identifier) if episode_identifier else None
+                    if not episode_id:
                         logger.warning(f"Episode not found for identifier: {episode_identifier}")
                         if episode_identifier:
                             missing_ids.append(episode_identifier)
+                        continue
+
+                    # Map columns from Social Score Excel to ClinicalEpisode fields,
+                    # keeping only non-empty values
+                    fields = {
+                        name: value
+                        for name, value in (
+                            ("prevision_desc", _clean_text(row.get("Desc. Convenio"))),
+                            ("tipo_ingreso_desc", _clean_text(row.get("Vía de Ingreso"))),
+                            ("servicio_ingreso_desc", _clean_text(row.get("Servicio"))),
+                        )
+                        if value is not None
+                    }
+                    if fields:
+                        episode_fields.setdefault(episode_id, {}).update(fields)
+
+                    if score_data:
+                        parsed_scores.append((episode_id, score_data))
                 except Exception as e:
-                    logger.error(f"Error processing social score row {idx}: {e}")
+                    self._row_error(f"Error processing social score row {idx}: {e}")
                     continue
 
-            await self.db.commit()
+            # Rows without Fecha Asignación are dated at the episode's
+            # admission, a stable value so re-uploads still find them
+            admissions = await self._episode_admissions(
+                {episode_id for episode_id, score_data in parsed_scores if score_data["recorded_at"] is None}
+            )
+            for episode_id, score_data in parsed_scores:
+                if score_data["recorded_at"] is None:
+                    score_data["recorded_at"] = admissions[episode_id]
+                scores_by_key.setdefault(
+                    (episode_id, score_data["recorded_at"]),
+                    {"episode_id": episode_id, **score_data},
+                )
+
+            episodes_updated = await self._bulk_update_social_score_episode_fields(episode_fields)
+            scores_created = await self._bulk_insert_social_scores(list(scores_by_key.values()))
+
+            await self._commit(scores_created)
             logger.info(f"Successfully uploaded {scores_created} social scores. Updated {episodes_updated} episodes with coverage/service fields. Missing episodes: {len(missing_ids)}")
             
             return {
@@ -1658,79 +2103,10 @@ class ExcelUploader:
 
         except Exception as e:
             logger.error(f"Error uploading social scores: {e}")
-            await self.db.rollback()
+            await self._rollback()
             raise
 
-    async def _build_episode_identifier_map(self) -> Dict[str, UUID]:
-        """
-        Build a map of identifiers to episode IDs.
-        
-        This method creates a lookup map using three sources:
-        1. Episode identifiers stored directly on ClinicalEpisode.episode_identifier (new approach)
-        2. Episode identifiers stored in ClinicalEpisodeInformation (legacy)
-        3. Patient medical identifiers (for manually created patients)
-        
-        This allows matching social scores to episodes whether they were imported
-        from Excel or created manually.
-        """
-        episode_map = {}
-        
-        def normalize_identifier(identifier: str) -> str:
-            """Normalize identifier by removing trailing .0 from floats and extra whitespace."""
-            s = str(identifier).strip()
-            if s.endswith('.0'):
-                s = s[:-2]
-            return s
-        
-        # 1. Get episode identifiers directly from ClinicalEpisode model (new approach)
-        stmt = select(ClinicalEpisode).where(ClinicalEpisode.episode_identifier.isnot(None))
-        result = await self.db.execute(stmt)
-        episodes = result.scalars().all()
-        
-        direct_count = 0
-        for episode in episodes:
-            if episode.episode_identifier:
-                identifier = normalize_identifier(episode.episode_identifier)
-                episode_map[identifier] = episode.id
-                direct_count += 1
-                if direct_count <= 5:
-                    logger.debug(f"Direct episode_identifier: '{identifier}' -> {episode.id}")
-        
-        logger.info(f"Found {direct_count} episodes with direct episode_identifier")
-        
-        # 2. Get episode identifiers from ClinicalEpisodeInformation (legacy)
-        stmt = select(ClinicalEpisodeInformation).where(
-            ClinicalEpisodeInformation.title == "Episodio / Estadía"
-        )
-        result = await self.db.execute(stmt)
-        episode_infos = result.scalars().all()
-        
-        for info in episode_infos:
-            if info.value and "episode_identifier" in info.value:
-                identifier = info.value["episode_identifier"]
-                if identifier:
-                    normalized = normalize_identifier(identifier)
-                    if normalized not in episode_map:
-                        episode_map[normalized] = info.episode_id
-        
-        # 3. Also map by patient medical_identifier for manually created patients
-        # Get all episodes with their associated patients
-        stmt = select(ClinicalEpisode, Patient).join(Patient)
-        result = await self.db.execute(stmt)
-        episode_patient_pairs = result.all()
-        
-        for episode, patient in episode_patient_pairs:
-            if patient.medical_identifier:
-                # Only add if not already in the map (episode identifier takes precedence)
-                normalized = normalize_identifier(patient.medical_identifier)
-                if normalized not in episode_map:
-                    episode_map[normalized] = episode.id
-        
-        logger.info(f"Episode map contains {len(episode_map)} entries (from episode_identifier, episode info, and patient medical identifiers)")
-        
-        return episode_map
-
-    def _parse_social_score_row(self, row: pd.Series) -> Optional[Dict[str, Any]]:
+    def _parse_social_score_row(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Parse social score data from Excel row.
         
@@ -1744,7 +2120,7 @@ class ExcelUploader:
         try:
             # Get episode identifier
             episodio_raw = row.get("Episodio / Estadía")
-            if pd.isna(episodio_raw) or str(episodio_raw).strip() == "" or str(episodio_raw).strip().lower() == "nan":
+            if _is_missing(episodio_raw):
                 logger.warning("Skipping row with missing Episodio / Estadía")
                 return None
             
@@ -1818,38 +2194,190 @@ class ExcelUploader:
             logger.error(f"Error parsing social score row: {e}")
             return None
 
-    async def _create_social_score(self, episode_id: UUID, score_data: Dict[str, Any]) -> SocialScoreHistory:
-        """Create a social score history record and generate alert if score is high."""
-        social_score = SocialScoreHistory(
-            episode_id=episode_id,
-            score=score_data.get("score"),
-            no_score_reason=score_data.get("no_score_reason"),
-            recorded_at=score_data.get("recorded_at"),
-            recorded_by=score_data.get("recorded_by"),
-        )
-        self.db.add(social_score)
-        await self.db.flush()
-        logger.info(f"Created social score for episode {episode_id}: score={score_data.get('score')}, reason={score_data.get('no_score_reason')}")
-        
-        # Automatically create alert if score >= 11 (high risk)
-        score = score_data.get("score")
-        if score is not None and score >= ALERT_SCORE_THRESHOLD:
-            alert = Alert(
-                episode_id=episode_id,
-                alert_type=AlertType.SOCIAL_RISK,
-                severity=AlertSeverity.MEDIUM,
-                message=f"Score social alto detectado: {score}",
-                is_active=True,
-                created_by="Sistema (automatico desde score social)"
+    async def _episode_admissions(self, episode_ids: set[UUID]) -> Dict[UUID, datetime]:
+        """
+        Fetch ``admission_at`` for the given episodes, one query per chunk.
+
+        Args:
+            episode_ids: Episodes to look up
+
+        Returns:
+            Admission datetime per episode id
+        """
+        admissions: Dict[UUID, datetime] = {}
+        pending = list(episode_ids)
+        for i in range(0, len(pending), BULK_CHUNK_SIZE):
+            rows = await self.db.execute(
+                select(ClinicalEpisode.id, ClinicalEpisode.admission_at)
+                .where(ClinicalEpisode.id.in_(pending[i:i + BULK_CHUNK_SIZE]))
             )
-            self.db.add(alert)
-            await self.db.flush()
-            logger.info(f"Created automatic social-risk alert for episode {episode_id} with score {score}")
-        
-        return social_score
+            admissions.update(rows.all())
+        return admissions
+
+    async def _bulk_update_social_score_episode_fields(
+        self, fields_by_episode: Dict[UUID, Dict[str, str]]
+    ) -> int:
+        """
+        Write the episode columns of the social score sheet with chunked
+        ``UPDATE clinical_episodes ... FROM (VALUES ...)``.
+
+        Columns missing from an episode's rows keep their stored value.
+
+        Args:
+            fields_by_episode: Non-empty column values per episode id
+
+        Returns:
+            Number of episodes updated
+        """
+        episode_table = ClinicalEpisode.__table__
+        names = SOCIAL_SCORE_EPISODE_COLUMNS
+        rows = [
+            (episode_id, *(fields.get(name) for name in names))
+            for episode_id, fields in fields_by_episode.items()
+        ]
+        for i in range(0, len(rows), BULK_CHUNK_SIZE):
+            incoming = values_clause(
+                column("episode_id", episode_table.c.id.type),
+                *(column(name, episode_table.c[name].type) for name in names),
+                name="incoming",
+            ).data(rows[i:i + BULK_CHUNK_SIZE])
+            await self.db.execute(
+                update(episode_table)
+                .where(episode_table.c.id == incoming.c.episode_id)
+                .values({
+                    name: func.coalesce(incoming.c[name], episode_table.c[name])
+                    for name in names
+                })
+            )
+        return len(rows)
+
+    async def _bulk_insert_social_scores(self, score_rows: list[Dict[str, Any]]) -> int:
+        """
+        Insert social scores with chunked multi-row ``INSERT ... SELECT``.
+
+        Scores whose ``(episode_id, recorded_at)`` is already stored are
+        skipped, so uploading the same sheet again writes nothing. High scores
+        of the inserted rows get a social-risk alert, and the episodes' latest
+        social score pointer is refreshed.
+
+        Args:
+            score_rows: Output of ``_parse_social_score_row`` plus ``episode_id``,
+                with ``recorded_at`` filled in
+
+        Returns:
+            Number of scores inserted
+        """
+        score_table = SocialScoreHistory.__table__
+        names = ("id", "episode_id", "score", "no_score_reason", "recorded_at", "recorded_by")
+
+        inserted = []
+        for i in range(0, len(score_rows), BULK_CHUNK_SIZE):
+            incoming = values_clause(
+                *(column(name, score_table.c[name].type) for name in names),
+                name="incoming",
+            ).data([
+                (uuid4(), *(row[name] for name in names[1:]))
+                for row in score_rows[i:i + BULK_CHUNK_SIZE]
+            ])
+            already_stored = (
+                select(score_table.c.id)
+                .where(
+                    score_table.c.episode_id == incoming.c.episode_id,
+                    score_table.c.recorded_at == incoming.c.recorded_at,
+                )
+                .exists()
+            )
+            # VALUES types an all-NULL column as text; cast back to the table's types
+            rows = select(*(cast(incoming.c[name], score_table.c[name].type) for name in names))
+            stmt = (
+                pg_insert(score_table)
+                .from_select(list(names), rows.where(~already_stored))
+                .returning(score_table.c.episode_id, score_table.c.score)
+            )
+            inserted.extend((await self.db.execute(stmt)).all())
+
+        # Automatically create an alert for every new high score
+        alert_rows = [
+            {
+                "id": uuid4(),
+                "episode_id": episode_id,
+                "alert_type": AlertType.SOCIAL_RISK,
+                "severity": AlertSeverity.MEDIUM,
+                "message": f"Score social alto detectado: {score}",
+                "is_active": True,
+                "created_by": "Sistema (automatico desde score social)",
+            }
+            for episode_id, score in inserted
+            if score is not None and score >= ALERT_SCORE_THRESHOLD
+        ]
+        for i in range(0, len(alert_rows), BULK_CHUNK_SIZE):
+            await self.db.execute(pg_insert(Alert.__table__).values(alert_rows[i:i + BULK_CHUNK_SIZE]))
+
+        episode_ids = list({episode_id for episode_id, _ in inserted})
+        for i in range(0, len(episode_ids), BULK_CHUNK_SIZE):
+            await refresh_latest_social_scores(self.db, episode_ids[i:i + BULK_CHUNK_SIZE])
+
+        logger.info(
+            f"Social score import: {len(inserted)} scores inserted, "
+            f"{len(score_rows) - len(inserted)} already stored, {len(alert_rows)} alerts created"
+        )
+        return len(inserted)
 
     # ==================== GRD DATA UPLOAD ====================
 
+    def _read_grd_records(self, excel_path: str | Path) -> tuple[list[Dict[str, Any]], str, str]:
+        """
+        Parse stage of the GRD import (no database access).
+
+        Returns:
+            Tuple of (records with the episode and GRD code columns, episode column, GRD code column)
+        """
+        # Read the first sheet (usually "resultado prediccion" has only one sheet)
+        with WorkbookLoader(excel_path) as workbook:
+            available_sheets = workbook.sheet_names
+            logger.info(f"Available sheets: {available_sheets}")
+
+            # Use the first sheet
+            sheet_name = available_sheets[0]
+            df = workbook.read_sheet(sheet_name)
+
+        logger.info(f"Found {len(df)} rows in sheet '{sheet_name}'")
+        logger.info(f"Columns: {list(df.columns)}")
+
+        # Normalize column names for flexible matching
+        col_map = {}
+        for col in df.columns:
+            if isinstance(col, str):
+                norm = self._normalize_col_name(col)
+                col_map[norm] = col
+
+        # Find the episode identifier column (should be "Episodio")
+        episode_col = None
+        for candidate in ["episodio", "episodio cmbd", "cmbd", "caso"]:
+            if candidate in col_map:
+                episode_col = col_map[candidate]
+                logger.info(f"Found episode column by match '{candidate}': {episode_col}")
+                break
+
+        if not episode_col:
+            raise ValueError(f"Could not find episode identifier column. Available columns: {list(df.columns)}")
+
+        # Find the IR GRD CODE column
+        grd_code_col = None
+        for candidate in ["ir grd code", "irgrdcode", "grd code", "ir grd", "grdcode", "codigo grd"]:
+            if candidate in col_map:
+                grd_code_col = col_map[candidate]
+                logger.info(f"Found GRD code column by match '{candidate}': {grd_code_col}")
+                break
+
+        if not grd_code_col:
+            raise ValueError(f"Could not find IR GRD CODE column. Available columns: {list(df.columns)}")
+
+        logger.info(f"Using episode column: '{episode_col}'")
+        logger.info(f"Using GRD code column: '{grd_code_col}'")
+
+        return _frame_to_records(df[[episode_col, grd_code_col]]), episode_col, grd_code_col
+
     async def upload_grd_from_excel(self, excel_path: str | Path) -> Dict[str, Any]:
         """
         Upload GRD predictions from "resultado prediccion" Excel file.
@@ -1874,64 +2402,24 @@ class ExcelUploader:
         logger.info(f"Reading GRD prediction data from {excel_path}")
 
         try:
-            # Read the first sheet (usually "resultado prediccion" has only one sheet)
-            xl = pd.ExcelFile(excel_path)
-            available_sheets = xl.sheet_names
-            logger.info(f"Available sheets: {available_sheets}")
+            records, episode_col, grd_code_col = await self._parse("_read_grd_records", excel_path)
 
-            # Use the first sheet
-            sheet_name = available_sheets[0] if available_sheets else 0
-            df = pd.read_excel(excel_path, sheet_name=sheet_name)
-
-            logger.info(f"Found {len(df)} rows in sheet '{sheet_name}'")
-            logger.info(f"Columns: {list(df.columns)}")
-
-            # Normalize column names for flexible matching
-            col_map = {}
-            for col in df.columns:
-                if isinstance(col, str):
-                    norm = self._normalize_col_name(col)
-                    col_map[norm] = col
-
-            # Find the episode identifier column (should be "Episodio")
-            episode_col = None
-            for candidate in ["episodio", "episodio cmbd", "cmbd", "caso"]:
-                if candidate in col_map:
-                    episode_col = col_map[candidate]
-                    logger.info(f"Found episode column by match '{candidate}': {episode_col}")
-                    break
-
-            if not episode_col:
-                raise ValueError(f"Could not find episode identifier column. Available columns: {list(df.columns)}")
-
-            # Find the IR GRD CODE column
-            grd_code_col = None
-            for candidate in ["ir grd code", "irgrdcode", "grd code", "ir grd", "grdcode", "codigo grd"]:
-                if candidate in col_map:
-                    grd_code_col = col_map[candidate]
-                    logger.info(f"Found GRD code column by match '{candidate}': {grd_code_col}")
-                    break
-
-            if not grd_code_col:
-                raise ValueError(f"Could not find IR GRD CODE column. Available columns: {list(df.columns)}")
-
-            logger.info(f"Using episode column: '{episode_col}'")
-            logger.info(f"Using GRD code column: '{grd_code_col}'")
-
-            # Build episode identifier map
-            episode_map = await self._build_episode_identifier_map()
-            logger.info(f"Built episode map with {len(episode_map)} entries")
+            # Episode identifier index, shared with earlier imports of this job
+            episode_index = await self._episode_index()
+            logger.info(f"Built episode index with {len(episode_index)} entries")
             
             # Log sample identifiers from database for debugging
-            sample_db_ids = list(episode_map.keys())[:10]
+            sample_db_ids = episode_index.keys()[:10]
             logger.info(f"Sample identifiers from database: {sample_db_ids}")
 
+            grd_norms = await grd_norm_cache.get_all(self.db)
+
             updated_count = 0
             missing_episode_ids = []
             grd_not_found_ids = []
             sample_file_ids = []
 
-            for idx, row in df.iterrows():
+            for idx, row in self._track(records):
                 try:
                     # Get episode identifier
                     episode_raw = row.get(episode_col)
@@ -1975,50 +2463,35 @@ class ExcelUploader:
 
                     logger.debug(f"Episode {episode_identifier}: Extracted GRD ID '{grd_id}' and name '{grd_name}' from '{grd_code_str}'")
 
-                    # Look up expected days from grd_norms table
-                    from app.models.grd_norm import GrdNorm
-                    stmt = select(GrdNorm).where(GrdNorm.grd_id == grd_id)
-                    result = await self.db.execute(stmt)
-                    grd_norm = result.scalar_one_or_none()
+                    # Look up expected days from the cached grd_norms table
+                    grd_expected_days = grd_norms.get(grd_id)
 
-                    if not grd_norm:
+                    if grd_expected_days is None:
                         logger.warning(f"GRD ID '{grd_id}' not found in grd_norms table for episode {episode_identifier}")
                         grd_not_found_ids.append(grd_id)
                         continue
 
-                    grd_expected_days = grd_norm.expected_days
                     logger.debug(f"Found {grd_expected_days} expected days for GRD '{grd_id}'")
 
-                    # Find and update episode - try exact match first
-                    if episode_identifier in episode_map:
-                        episode_id = episode_map[episode_identifier]
+                    # Find and update episode: exact/normalized keys first, then an
+                    # unambiguous prefix/suffix match for differently formatted ids
+                    episode_id = episode_index.resolve(episode_identifier)
+                    if episode_id:
                         await self._update_episode_grd(episode_id, grd_expected_days, grd_name, grd_id)
                         updated_count += 1
                         logger.debug(f"Updated episode {episode_identifier} with GRD {grd_id} ({grd_expected_days} days) - {grd_name}")
                     else:
-                        # Try to find by searching for partial match or different format
-                        found = False
-                        for db_identifier, ep_id in episode_map.items():
-                            # Try matching just the numeric part
-                            if episode_identifier in db_identifier or db_identifier in episode_identifier:
-                                await self._update_episode_grd(ep_id, grd_expected_days, grd_name, grd_id)
-                                updated_count += 1
-                                logger.debug(f"Updated episode {db_identifier} (matched from {episode_identifier}) with GRD {grd_id} ({grd_expected_days} days) - {grd_name}")
-                                found = True
-                                break
-
-                        if not found:
-                            logger.debug(f"Episode not found for identifier: {episode_identifier}")
-                            missing_episode_ids.append(episode_identifier)
+                        logger.debug(f"Episode not found for identifier: {episode_identifier}")
+                        missing_episode_ids.append(episode_identifier)
 
                 except Exception as e:
-                    logger.error(f"Error processing GRD row {idx}: {e}")
+                    self._row_error(f"Error processing GRD row {idx}: {e}")
                     continue
 
             # Log sample identifiers from file for debugging
             logger.info(f"Sample identifiers from GRD file: {sample_file_ids}")
 
-            await self.db.commit()
+            await self._commit(updated_count)
             logger.info(f"Successfully updated {updated_count} episodes with GRD data")
             logger.info(f"Missing episodes: {len(missing_episode_ids)}, GRDs not found in norms: {len(grd_not_found_ids)}")
 
@@ -2034,7 +2507,7 @@ class ExcelUploader:
 
         except Exception as e:
             logger.error(f"Error uploading GRD data: {e}")
-            await self.db.rollback()
+            await self._rollback()
             raise
 
     def _calculate_days_in_stay(self, admission_at: datetime) -> int:
@@ -2089,175 +2562,153 @@ class ExcelUploader:
 
     # ==================== GRD NORMS DATA UPLOAD ====================
 
-    async def upload_grd_norms_from_excel(self, excel_path: str | Path) -> Dict[str, Any]:
+    def _read_grd_norm_records(self, excel_path: str | Path) -> tuple[list[Dict[str, Any]], str, str]:
         """
-        Upload GRD norms data from "normas_eeuu" Excel file.
-
-        This method:
-        - Reads the Excel file (any sheet with GRD and Est Media columns)
-        - Extracts: GRD (GRD code identifier), Est Media (expected days as float)
-        - Creates or updates GrdNorm records
-
-        Args:
-            excel_path: Path to the Excel file with GRD norms data
+        Parse stage of the GRD norms import (no database access).
 
         Returns:
-            Dictionary with upload statistics:
-            - count: Number of GRD norms created/updated
-            - errors: List of error messages
+            Tuple of (records with the GRD and Est Media columns, GRD column, Est Media column)
         """
-        logger.info(f"Reading GRD norms data from {excel_path}")
+        # Detect file type
+        file_path = Path(excel_path)
+        is_csv = file_path.suffix.lower() == '.csv'
 
-        try:
-            # Detect file type
-            file_path = Path(excel_path)
-            is_csv = file_path.suffix.lower() == '.csv'
+        df = None
+        sheet_name = None
 
-            df = None
-            sheet_name = None
+        # If CSV, detect the delimiter from the header line and parse once
+        if is_csv:
+            logger.info("Detected CSV file, reading with pandas...")
+            try:
+                sep = _detect_csv_delimiter(excel_path)
+                if sep is not None:
+                    logger.info(f"Detected delimiter: '{sep}'")
+                    df = pd.read_csv(excel_path, sep=sep)
+                else:
+                    # Fall back to the Python engine's own sniffing
+                    logger.info("Trying Python engine with auto-detection...")
+                    df = pd.read_csv(excel_path, sep=None, engine='python')
+
+                sheet_name = "CSV file"
+                logger.info(f"Successfully read CSV file")
+                logger.info(f"Found {len(df)} rows")
+                logger.info(f"Columns: {list(df.columns)}")
+            except Exception as e:
+                raise ValueError(f"Could not read CSV file: {e}")
 
-            # If CSV, read directly with automatic delimiter detection
-            if is_csv:
-                logger.info("Detected CSV file, reading with pandas...")
-                try:
-                    # Try to detect delimiter automatically
-                    # First, try common delimiters
-                    df = None
-                    for sep in [',', ';', '\t', '|']:
+        # If Excel, open the workbook once and use the first sheet with data
+        if df is None and not is_csv:
+            try:
+                with WorkbookLoader(excel_path) as workbook:
+                    logger.info(f"Available sheets: {workbook.sheet_names}")
+                    for candidate_sheet in workbook.sheet_names:
                         try:
-                            temp_df = pd.read_csv(excel_path, sep=sep, nrows=5)
-                            # Check if we got multiple columns (successful parse)
-                            if len(temp_df.columns) > 1:
-                                logger.info(f"Detected delimiter: '{sep}'")
-                                df = pd.read_csv(excel_path, sep=sep)
+                            temp_df = workbook.read_sheet(candidate_sheet)
+                            if not temp_df.empty and len(temp_df.columns) > 0:
+                                df = temp_df
+                                sheet_name = candidate_sheet
+                                logger.info(f"Using sheet: {sheet_name}")
                                 break
-                        except:
+                        except Exception as e:
+                            logger.warning(f"Could not read sheet '{candidate_sheet}': {e}")
                             continue
+            except Exception as e:
+                logger.warning(f"Could not open Excel file: {e}")
 
-                    # If still no success, use Python engine with auto-detection
-                    if df is None or len(df.columns) == 1:
-                        logger.info("Trying Python engine with auto-detection...")
-                        df = pd.read_csv(excel_path, sep=None, engine='python')
+        if df is None or df.empty:
+            raise ValueError("Could not read any data from Excel file. The file may be corrupted or empty.")
 
-                    sheet_name = "CSV file"
-                    logger.info(f"Successfully read CSV file")
-                    logger.info(f"Found {len(df)} rows")
-                    logger.info(f"Columns: {list(df.columns)}")
-                except Exception as e:
-                    raise ValueError(f"Could not read CSV file: {e}")
+        logger.info(f"Found {len(df)} rows in sheet '{sheet_name}'")
+        logger.info(f"Columns: {list(df.columns)}")
 
-            # If Excel, try multiple approaches to read
-            if df is None and not is_csv:
-                # Approach 1: Try to read with ExcelFile (gets sheet names)
-                try:
-                    xl = pd.ExcelFile(excel_path)
-                    logger.info(f"Available sheets: {xl.sheet_names}")
+        # Normalize column names for flexible matching
+        col_map = {}
+        for col in df.columns:
+            if isinstance(col, str):
+                norm = self._normalize_col_name(col)
+                col_map[norm] = col
 
-                    if xl.sheet_names:
-                        # Try each sheet
-                        for candidate_sheet in xl.sheet_names:
-                            try:
-                                temp_df = pd.read_excel(excel_path, sheet_name=candidate_sheet)
-                                if not temp_df.empty and len(temp_df.columns) > 0:
-                                    df = temp_df
-                                    sheet_name = candidate_sheet
-                                    logger.info(f"Using sheet: {sheet_name}")
-                                    break
-                            except Exception as e:
-                                logger.warning(f"Could not read sheet '{candidate_sheet}': {e}")
-                                continue
-                except Exception as e:
-                    logger.warning(f"Could not read Excel file with ExcelFile: {e}")
+        # Find the GRD column - must be exact match or start with "grd"
+        grd_col = None
 
-                # Approach 2: If approach 1 failed, try reading without specifying sheet
-                if df is None:
-                    logger.info("Trying to read Excel without specifying sheet name...")
-                    try:
-                        df = pd.read_excel(excel_path, sheet_name=0)  # Read first sheet by index
-                        sheet_name = "First sheet (by index)"
-                        logger.info(f"Successfully read first sheet by index")
-                    except Exception as e:
-                        logger.warning(f"Could not read by index: {e}")
+        # First try: exact match with "grd"
+        if "grd" in col_map:
+            grd_col = col_map["grd"]
+            logger.info(f"Found GRD column by exact match: {grd_col}")
 
-                # Approach 3: Try reading with engine specification
-                if df is None:
-                    logger.info("Trying to read Excel with openpyxl engine explicitly...")
-                    try:
-                        df = pd.read_excel(excel_path, sheet_name=0, engine='openpyxl')
-                        sheet_name = "First sheet (openpyxl)"
-                        logger.info(f"Successfully read with openpyxl engine")
-                    except Exception as e:
-                        logger.warning(f"Could not read with openpyxl: {e}")
-
-            if df is None or df.empty:
-                raise ValueError("Could not read any data from Excel file. The file may be corrupted or empty.")
-
-            logger.info(f"Found {len(df)} rows in sheet '{sheet_name}'")
-            logger.info(f"Columns: {list(df.columns)}")
-
-            # Normalize column names for flexible matching
-            col_map = {}
-            for col in df.columns:
-                if isinstance(col, str):
-                    norm = self._normalize_col_name(col)
-                    col_map[norm] = col
-
-            # Find the GRD column - must be exact match or start with "grd"
-            grd_col = None
-
-            # First try: exact match with "grd"
-            if "grd" in col_map:
-                grd_col = col_map["grd"]
-                logger.info(f"Found GRD column by exact match: {grd_col}")
-
-            # Second try: try other exact candidates
-            if not grd_col:
-                for candidate in ["codigo grd", "codigo", "id grd", "grd code"]:
-                    if candidate in col_map:
-                        grd_col = col_map[candidate]
-                        logger.info(f"Found GRD column by candidate '{candidate}': {grd_col}")
-                        break
+        # Second try: try other exact candidates
+        if not grd_col:
+            for candidate in ["codigo grd", "codigo", "id grd", "grd code"]:
+                if candidate in col_map:
+                    grd_col = col_map[candidate]
+                    logger.info(f"Found GRD column by candidate '{candidate}': {grd_col}")
+                    break
 
-            # Third try: column that starts with "grd" (like "grd " or "grd_")
-            if not grd_col:
-                for norm, orig in col_map.items():
-                    if norm.startswith("grd") and len(norm) <= 4:  # "grd" or "grd " max
-                        grd_col = orig
-                        logger.info(f"Found GRD column by prefix match: {grd_col}")
-                        break
+        # Third try: column that starts with "grd" (like "grd " or "grd_")
+        if not grd_col:
+            for norm, orig in col_map.items():
+                if norm.startswith("grd") and len(norm) <= 4:  # "grd" or "grd " max
+                    grd_col = orig
+                    logger.info(f"Found GRD column by prefix match: {grd_col}")
+                    break
 
-            if not grd_col:
-                raise ValueError(f"Could not find GRD column. Available columns: {list(df.columns)}")
+        if not grd_col:
+            raise ValueError(f"Could not find GRD column. Available columns: {list(df.columns)}")
 
-            logger.info(f"Using GRD column: '{grd_col}'")
+        logger.info(f"Using GRD column: '{grd_col}'")
 
-            # Find the Est Media column
-            est_media_col = None
-            for candidates in [["est media", "estmedia", "estancia media", "media", "dias"]]:
-                for c in candidates:
-                    if c in col_map:
-                        est_media_col = col_map[c]
-                        break
-                if est_media_col:
+        # Find the Est Media column
+        est_media_col = None
+        for candidates in [["est media", "estmedia", "estancia media", "media", "dias"]]:
+            for c in candidates:
+                if c in col_map:
+                    est_media_col = col_map[c]
+                    break
+            if est_media_col:
+                break
+
+        if not est_media_col:
+            # Try to find any column with "est" or "media" in name
+            for norm, orig in col_map.items():
+                if "est" in norm or "media" in norm:
+                    est_media_col = orig
                     break
 
-            if not est_media_col:
-                # Try to find any column with "est" or "media" in name
-                for norm, orig in col_map.items():
-                    if "est" in norm or "media" in norm:
-                        est_media_col = orig
-                        break
+        if not est_media_col:
+            raise ValueError(f"Could not find Est Media column. Available columns: {list(df.columns)}")
 
-            if not est_media_col:
-                raise ValueError(f"Could not find Est Media column. Available columns: {list(df.columns)}")
+        logger.info(f"Using Est Media column: {est_media_col}")
 
-            logger.info(f"Using Est Media column: {est_media_col}")
+        return _frame_to_records(df[[grd_col, est_media_col]]), grd_col, est_media_col
 
-            created_count = 0
-            updated_count = 0
+    async def upload_grd_norms_from_excel(self, excel_path: str | Path) -> Dict[str, Any]:
+        """
+        Upload GRD norms data from "normas_eeuu" Excel file.
+
+        This method:
+        - Reads the Excel file (any sheet with GRD and Est Media columns)
+        - Extracts: GRD (GRD code identifier), Est Media (expected days as float)
+        - Upserts GrdNorm records in bulk (last row wins for repeated GRD codes)
+        - Invalidates the in-memory GRD norm cache
+
+        Args:
+            excel_path: Path to the Excel file with GRD norms data
+
+        Returns:
+            Dictionary with upload statistics:
+            - count: Number of GRD norms created/updated
+            - errors: List of error messages
+        """
+        logger.info(f"Reading GRD norms data from {excel_path}")
+
+        try:
+            records, grd_col, est_media_col = await self._parse("_read_grd_norm_records", excel_path)
+
+            norms: Dict[str, int] = {}
+            row_count = 0
             errors = []
 
-            for idx, row in df.iterrows():
+            for idx, row in self._track(records):
                 try:
                     # Get GRD code
                     grd_raw = row.get(grd_col)
@@ -2292,22 +2743,23 @@ class ExcelUploader:
                         errors.append(error_msg)
                         continue
 
-                    # Create or update GRD norm
-                    was_created = await self._create_or_update_grd_norm(grd_id, expected_days)
-                    if was_created:
-                        created_count += 1
-                    else:
-                        updated_count += 1
-
-                    logger.debug(f"{'Created' if was_created else 'Updated'} GRD norm: {grd_id} -> {expected_days} days")
+                    # Later rows for the same GRD overwrite earlier ones
+                    norms[grd_id] = expected_days
+                    row_count += 1
 
                 except Exception as e:
                     error_msg = f"Error processing row {idx}: {str(e)}"
-                    logger.error(error_msg)
+                    self._row_error(error_msg)
                     errors.append(error_msg)
                     continue
 
-            await self.db.commit()
+            existing_ids = set(await self._fetch_id_map(GrdNorm.grd_id, GrdNorm.id, norms.keys()))
+            created_count = len(norms.keys() - existing_ids)
+            updated_count = row_count - created_count
+            await self._upsert_grd_norms(norms)
+
+            await self._commit(len(norms))
+            grd_norm_cache.invalidate()
             logger.info(f"Successfully processed GRD norms: {created_count} created, {updated_count} updated")
 
             return {
@@ -2319,39 +2771,36 @@ class ExcelUploader:
 
         except Exception as e:
             logger.error(f"Error uploading GRD norms: {e}")
-            await self.db.rollback()
+            await self._rollback()
             raise
 
-    async def _create_or_update_grd_norm(self, grd_id: str, expected_days: int) -> bool:
+    async def _upsert_grd_norms(self, norms: Dict[str, int]) -> None:
         """
-        Create or update a GRD norm record.
+        Insert or update GRD norms with ON CONFLICT (grd_id) DO UPDATE.
 
-        Returns:
-            True if created, False if updated
+        Args:
+            norms: Mapping of GRD code to expected stay days
         """
-        from app.models.grd_norm import GrdNorm
+        table = GrdNorm.__table__
+        rows = [
+            {"id": uuid4(), "grd_id": grd_id, "expected_days": expected_days}
+            for grd_id, expected_days in norms.items()
+        ]
+        for i in range(0, len(rows), BULK_CHUNK_SIZE):
+            stmt = pg_insert(table).values(rows[i:i + BULK_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["grd_id"],
+                set_={"expected_days": stmt.excluded.expected_days, "updated_at": func.now()},
+            )
+            await self.db.execute(stmt)
+        logger.debug(f"Upserted {len(rows)} GRD norms")
 
-        # Check if GRD norm already exists
-        stmt = select(GrdNorm).where(GrdNorm.grd_id == grd_id)
-        result = await self.db.execute(stmt)
-        existing_norm = result.scalar_one_or_none()
 
-        if existing_norm:
-            # Update existing norm
-            existing_norm.expected_days = expected_days
-            await self.db.flush()
-            logger.debug(f"Updated GRD norm: {grd_id} with {expected_days} days")
-            return False
-        else:
-            # Create new norm
-            grd_norm = GrdNorm(
-                grd_id=grd_id,
-                expected_days=expected_days
-            )
-            self.db.add(grd_norm)
-            await self.db.flush()
-            logger.debug(f"Created GRD norm: {grd_id} with {expected_days} days")
-            return True
+def _parse_in_worker(method_name: str, *args: Any) -> tuple[Any, ImportProgress]:
+    """Parse pool entry point: run a ``_read_*`` method on a session-less uploader."""
+    parser = ExcelUploader(None)
+    result = getattr(parser, method_name)(*args)
+    return result, parser.progress
 
 
 # ==================== MAIN UPLOAD FUNCTIONS ====================
@@ -0,0 +1,65 @@
+"""
+Process-level cache of GRD norms (grd_id -> expected stay days).
+
+The ``grd_norms`` table is small and only changes when a norms file is
+uploaded, so it is loaded with one query and kept in memory. Uploads call
+``invalidate()`` after committing; ``max_age`` bounds how long other worker
+processes keep serving a copy they cannot see invalidated.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.grd_norm import GrdNorm
+
+logger = logging.getLogger(__name__)
+
+
+class GrdNormCache:
+    """Lazily loaded ``grd_id -> expected_days`` map."""
+
+    def __init__(self, max_age: float = 300.0):
+        self.max_age = max_age
+        self._norms: Optional[dict[str, int]] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._norms is not None and time.monotonic() - self._loaded_at < self.max_age
+
+    async def get_all(self, session: AsyncSession) -> dict[str, int]:
+        """
+        Return every norm, loading them with one query when needed.
+
+        Args:
+            session: Session used for the load (its transaction sees uncommitted norms)
+
+        Returns:
+            Mapping of GRD code to expected stay days
+        """
+        if self._is_fresh():
+            return self._norms
+        async with self._lock:
+            # Another task may have loaded while we waited for the lock
+            if not self._is_fresh():
+                result = await session.execute(select(GrdNorm.grd_id, GrdNorm.expected_days))
+                self._norms = dict(result.all())
+                self._loaded_at = time.monotonic()
+                logger.info(f"Loaded {len(self._norms)} GRD norms into cache")
+            return self._norms
+
+    async def get(self, session: AsyncSession, grd_id: str) -> Optional[int]:
+        """Expected stay days for one GRD code, or None if it has no norm."""
+        return (await self.get_all(session)).get(grd_id)
+
+    def invalidate(self) -> None:
+        """Drop the cached norms; the next lookup reloads them."""
+        self._norms = None
+
+
+grd_norm_cache = GrdNormCache()
@@ -0,0 +1,206 @@
+"""
+In-memory queue for running Excel imports outside the HTTP request.
+
+Upload endpoints called with ``background=true`` save the file, submit a job
+and return its id right away. A small pool of asyncio worker tasks (started
+from the application lifespan) runs each import with its own database
+session and an ``ImportProgress`` the status endpoint can read while the
+import runs. Jobs live in process memory, so they are only visible from the
+worker process that accepted the upload.
+"""
+
+import asyncio
+import enum
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Optional
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.db import SessionLocal
+from app.import_progress import ImportProgress
+
+if TYPE_CHECKING:
+    from app.excel_uploader import ExcelUploader
+
+logger = logging.getLogger(__name__)
+
+# Runs one import with an uploader bound to the job's session and progress
+ImportRunner = Callable[["ExcelUploader"], Awaitable[dict[str, Any]]]
+
+
+def create_uploader(
+    session: AsyncSession, progress: Optional[ImportProgress] = None
+) -> "ExcelUploader":
+    """
+    Build an ExcelUploader.
+
+    The uploader module (pandas, openpyxl) is imported on the first import
+    instead of at application startup.
+    """
+    from app.excel_uploader import ExcelUploader
+
+    return ExcelUploader(session, progress=progress)
+
+
+class ImportJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class ImportJob:
+    """State of one queued import."""
+
+    kind: str
+    filename: Optional[str] = None
+    id: str = field(default_factory=lambda: uuid4().hex)
+    status: ImportJobStatus = ImportJobStatus.QUEUED
+    progress: ImportProgress = field(default_factory=ImportProgress)
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (ImportJobStatus.SUCCEEDED, ImportJobStatus.FAILED)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "filename": self.filename,
+            "status": self.status.value,
+            "progress": self.progress.to_dict(),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ImportJobQueue:
+    """
+    FIFO of import jobs processed by ``concurrency`` worker tasks.
+
+    Finished jobs are kept for status queries; the oldest are dropped once
+    more than ``max_jobs`` are stored.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        concurrency: int = 1,
+        max_jobs: int = 200,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._workers)
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        if self.running:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"import-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks; queued jobs are abandoned."""
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+
+    def submit(
+        self,
+        kind: str,
+        run: ImportRunner,
+        filename: Optional[str] = None,
+        cleanup_paths: Iterable[str | Path] = (),
+    ) -> ImportJob:
+        """
+        Queue an import.
+
+        Args:
+            kind: Import type shown in the job status (e.g. "gestion-estadia")
+            run: Coroutine function performing the import with the given uploader
+            filename: Original upload filename
+            cleanup_paths: Temporary files deleted once the job finishes
+
+        Returns:
+            The queued ImportJob
+        """
+        # Workers start lazily so jobs also run when the lifespan did not
+        self.start()
+        job = ImportJob(kind=kind, filename=filename)
+        self._jobs[job.id] = job
+        self._prune()
+        self._queue.put_nowait((job, run, list(cleanup_paths)))
+        logger.info(f"Queued {kind} import job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:excess]:
+            del self._jobs[job_id]
+
+    async def _work(self) -> None:
+        while True:
+            job, run, cleanup_paths = await self._queue.get()
+            try:
+                await self._execute(job, run)
+            finally:
+                for path in cleanup_paths:
+                    Path(path).unlink(missing_ok=True)
+                self._queue.task_done()
+
+    async def _execute(self, job: ImportJob, run: ImportRunner) -> None:
+        job.status = ImportJobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        try:
+            async with self.session_factory() as session:
+                job.result = await run(create_uploader(session, progress=job.progress))
+            job.status = ImportJobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = ImportJobStatus.FAILED
+            job.error = "Import cancelled during shutdown"
+            raise
+        except Exception as e:
+            logger.exception(f"Import job {job.id} ({job.kind}) failed")
+            job.status = ImportJobStatus.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+
+import_jobs = ImportJobQueue(concurrency=settings.IMPORT_JOB_CONCURRENCY)
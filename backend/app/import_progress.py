@@ -0,0 +1,46 @@
+"""
+Progress counters shared by the Excel importers and the import job queue.
+
+Kept apart from ``app.excel_uploader`` so the job queue and the status
+endpoint can use them without importing pandas.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+# Row error messages kept per import for progress reporting
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class ImportProgress:
+    """Counters an import updates while it runs (read by the import job endpoints)."""
+
+    rows_total: int = 0
+    rows_parsed: int = 0
+    rows_written: int = 0
+    error_count: int = 0
+    # Only the first MAX_REPORTED_ERRORS messages are kept
+    errors: list[str] = field(default_factory=list)
+
+    def add_error(self, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def merge(self, other: "ImportProgress") -> None:
+        """Add the counters collected by a parse stage running elsewhere."""
+        self.rows_total += other.rows_total
+        self.rows_parsed += other.rows_parsed
+        self.rows_written += other.rows_written
+        self.error_count += other.error_count
+        self.errors.extend(other.errors[:MAX_REPORTED_ERRORS - len(self.errors)])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows_total": self.rows_total,
+            "rows_parsed": self.rows_parsed,
+            "rows_written": self.rows_written,
+            "error_count": self.error_count,
+            "errors": list(self.errors),
+        }
@@ -0,0 +1,61 @@
+"""
+Latest social score pointer on ``ClinicalEpisode``.
+
+Each episode carries the id, value and ``recorded_at`` of its most recent
+``SocialScoreHistory`` record, so the episode list, the episode detail and
+the dashboard read the latest score as plain columns instead of a
+``max(recorded_at)`` subquery over the history.
+
+Every code path that inserts social scores (the Excel import and the seed
+script) calls ``refresh_latest_social_scores`` for the episodes it touched.
+It runs in the caller's transaction and updates any episodes already loaded
+in the session.
+"""
+
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.clinical_episode import ClinicalEpisode
+from app.models.social_score_history import SocialScoreHistory
+
+
+async def refresh_latest_social_scores(
+    session: AsyncSession,
+    episode_ids: Optional[Iterable[UUID]] = None,
+) -> None:
+    """
+    Recompute the pointer from the score history.
+
+    Args:
+        session: Session the scores were added in (flushed or not)
+        episode_ids: Episodes to refresh; all episodes with scores if None
+    """
+    # Rank each episode's scores, newest first
+    ranked = select(
+        SocialScoreHistory.episode_id,
+        SocialScoreHistory.id,
+        SocialScoreHistory.score,
+        SocialScoreHistory.recorded_at,
+        func.row_number().over(
+            partition_by=SocialScoreHistory.episode_id,
+            order_by=(SocialScoreHistory.recorded_at.desc(), SocialScoreHistory.created_at.desc()),
+        ).label("position"),
+    )
+    if episode_ids is not None:
+        ranked = ranked.where(SocialScoreHistory.episode_id.in_(list(episode_ids)))
+    latest = ranked.subquery()
+
+    stmt = (
+        update(ClinicalEpisode)
+        .where(ClinicalEpisode.id == latest.c.episode_id, latest.c.position == 1)
+        .values(
+            latest_social_score_id=latest.c.id,
+            latest_social_score_value=latest.c.score,
+            latest_social_score_recorded_at=latest.c.recorded_at,
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+    await session.execute(stmt)
@@ -11,6 +11,7 @@ from app.routers.workers import router as workers_router
 from app.routers.documents import router as documents_router
 from app.routers.alerts import router as alerts_router
 from app.routers.predictor import router as predictor_router
+from app.routers.health import router as health_router
 
 app = FastAPI(lifespan=lifespan)
 
@@ -65,4 +66,5 @@ app.include_router(workers_router)
 app.include_router(documents_router)
 app.include_router(alerts_router)
 app.include_router(predictor_router)
+app.include_router(health_router)
 
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Boolean, ForeignKey, Enum as SQLEnum, func
+from sqlalchemy import String, DateTime, Boolean, ForeignKey, Enum as SQLEnum, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
@@ -81,3 +81,17 @@ class Alert(Base):
         back_populates="alerts"
     )
 
+
+# GET /alerts: active alerts newest first, optionally of one type
+Index(
+    "ix_alerts_active_created_at",
+    Alert.created_at.desc(),
+    postgresql_where=Alert.is_active,
+)
+Index(
+    "ix_alerts_active_type_created_at",
+    Alert.alert_type, Alert.created_at.desc(),
+    postgresql_where=Alert.is_active,
+)
+# Alerts of one episode, newest first
+Index("ix_alerts_episode_id_created_at", Alert.episode_id, Alert.created_at.desc())
@@ -1,9 +1,10 @@
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Boolean, DateTime, func, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy import Boolean, DateTime, Index, func, String
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from typing import TYPE_CHECKING
 from app.db import Base
+from app.search_keys import fold_search_key
 
 if TYPE_CHECKING:
     from app.models.clinical_episode import ClinicalEpisode
@@ -21,6 +22,12 @@ class Bed(Base):
         String(320),
         nullable=False
     )
+    # Folded room (app.search_keys) matched by the episode search
+    search_room: Mapped[str] = mapped_column(
+        String(320),
+        nullable=False,
+        server_default=""
+    )
     active: Mapped[bool] = mapped_column(
         Boolean,
         nullable=False,
@@ -46,3 +53,16 @@ class Bed(Base):
         "ClinicalEpisode",
         back_populates="bed"
     )
+
+    @validates("room")
+    def _refresh_search_room(self, key: str, value: str) -> str:
+        """Keep search_room in sync with room."""
+        self.search_room = fold_search_key(value)
+        return value
+
+
+# Trigram index (pg_trgm) serving the LIKE '%term%' room search
+Index(
+    "ix_beds_search_room_trgm", Bed.search_room,
+    postgresql_using="gin", postgresql_ops={"search_room": "gin_trgm_ops"},
+)
@@ -1,9 +1,9 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Date, ForeignKey, Enum as SQLEnum, func
+from sqlalchemy import String, DateTime, Date, ForeignKey, Enum as SQLEnum, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from app.db import Base
 
 if TYPE_CHECKING:
@@ -86,6 +86,11 @@ class ClinicalEpisode(Base):
         nullable=True,
         comment="Predicted probability of overstay (0-1)"
     )
+    overstay_features_hash: Mapped[str] = mapped_column(
+        String(32),
+        nullable=True,
+        comment="Fingerprint of the model inputs behind overstay_probability"
+    )
     prevision_desc: Mapped[str] = mapped_column(
         String(500),
         nullable=True,
@@ -101,6 +106,25 @@ class ClinicalEpisode(Base):
         nullable=True,
         comment="Servicio Ingreso (Descripción)"
     )
+    # Most recent social score, kept current by app.latest_social_score
+    latest_social_score_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "social_score_history.id",
+            ondelete="SET NULL",
+            use_alter=True,
+            name="fk_clinical_episodes_latest_social_score_id",
+        ),
+        nullable=True
+    )
+    latest_social_score_value: Mapped[Optional[int]] = mapped_column(
+        nullable=True,
+        comment="Score of the latest social score record"
+    )
+    latest_social_score_recorded_at: Mapped[Optional[DateTime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now()
@@ -138,10 +162,36 @@ class ClinicalEpisode(Base):
     social_score_history: Mapped[list["SocialScoreHistory"]] = relationship(
         "SocialScoreHistory",
         back_populates="clinical_episode",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        foreign_keys="SocialScoreHistory.episode_id"
+    )
+    latest_social_score_record: Mapped[Optional["SocialScoreHistory"]] = relationship(
+        "SocialScoreHistory",
+        foreign_keys=[latest_social_score_id],
+        viewonly=True
     )
     alerts: Mapped[list["Alert"]] = relationship(
         "Alert",
         back_populates="clinical_episode",
         cascade="all, delete-orphan"
     )
+
+
+# Episode list: newest first, with (admission_at, id) as the cursor key
+Index(
+    "ix_clinical_episodes_admission_at_id",
+    ClinicalEpisode.admission_at.desc(), ClinicalEpisode.id.desc(),
+)
+# Episode list sorted by risk (and overstay_probability_min filters)
+Index(
+    "ix_clinical_episodes_overstay_rank",
+    ClinicalEpisode.overstay_probability.desc().nulls_last(),
+    ClinicalEpisode.admission_at.desc(),
+    ClinicalEpisode.id.desc(),
+)
+# Active episodes by recency: scoring worker queue and dashboard
+Index(
+    "ix_clinical_episodes_active_admission_at",
+    ClinicalEpisode.admission_at.desc(),
+    postgresql_where=ClinicalEpisode.status == EpisodeStatus.ACTIVE,
+)
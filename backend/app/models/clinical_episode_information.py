@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Enum as SQLEnum, func
+from sqlalchemy import String, DateTime, ForeignKey, Enum as SQLEnum, Index, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 import enum
@@ -65,3 +65,12 @@ class ClinicalEpisodeInformation(Base):
         "ClinicalEpisode",
         back_populates="information_records"
     )
+
+
+# Legacy records that carry an episode identifier (read by
+# EpisodeIdentifierIndex.load); few rows, so a partial expression index
+Index(
+    "ix_clinical_episode_information_legacy_episode_identifier",
+    ClinicalEpisodeInformation.value["episode_identifier"].astext,
+    postgresql_where=ClinicalEpisodeInformation.value.has_key("episode_identifier"),
+)
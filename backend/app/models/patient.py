@@ -1,9 +1,10 @@
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Date, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy import Index, String, Date, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from typing import TYPE_CHECKING
 from app.db import Base
+from app.search_keys import patient_search_name
 
 if TYPE_CHECKING:
     from app.models.patient_document import PatientDocument
@@ -26,6 +27,8 @@ class Patient(Base):
     )
     first_name: Mapped[str] = mapped_column(String(320))
     last_name: Mapped[str] = mapped_column(String(320))
+    # Folded "first last" (app.search_keys) matched by the episode search
+    search_name: Mapped[str] = mapped_column(String(641), server_default="")
     rut: Mapped[str] = mapped_column(String(320))
     birth_date: Mapped[Date] = mapped_column(Date)
     gender: Mapped[str] = mapped_column(String(320))
@@ -56,3 +59,18 @@ class Patient(Base):
         back_populates="patient",
         cascade="all, delete-orphan"
     )
+
+    @validates("first_name", "last_name")
+    def _refresh_search_name(self, key: str, value: str) -> str:
+        """Keep search_name in sync whenever either name is set."""
+        first_name = value if key == "first_name" else self.first_name
+        last_name = value if key == "last_name" else self.last_name
+        self.search_name = patient_search_name(first_name, last_name)
+        return value
+
+
+# Trigram index (pg_trgm) serving the LIKE '%term%' episode search
+Index(
+    "ix_patients_search_name_trgm", Patient.search_name,
+    postgresql_using="gin", postgresql_ops={"search_name": "gin_trgm_ops"},
+)
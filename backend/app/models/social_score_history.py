@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from typing import TYPE_CHECKING, Optional
@@ -52,6 +52,13 @@ class SocialScoreHistory(Base):
     # Relationship
     clinical_episode: Mapped["ClinicalEpisode"] = relationship(
         "ClinicalEpisode",
-        back_populates="social_score_history"
+        back_populates="social_score_history",
+        foreign_keys=[episode_id]
     )
 
+
+# Latest score per episode (max(recorded_at) / ORDER BY recorded_at DESC LIMIT 1)
+Index(
+    "ix_social_score_history_episode_id_recorded_at",
+    SocialScoreHistory.episode_id, SocialScoreHistory.recorded_at.desc(),
+)
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Date, Integer, ForeignKey, Enum as SQLEnum, func
+from sqlalchemy import String, DateTime, Date, Integer, ForeignKey, Enum as SQLEnum, Index, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 import enum
@@ -94,3 +94,20 @@ class TaskInstance(Base):
         back_populates="assigned_tasks",
         foreign_keys=[assigned_to_id]
     )
+
+
+# Open tasks (PENDING / IN_PROGRESS) in due-date order
+Index(
+    "ix_task_instances_open_due_date",
+    TaskInstance.due_date.asc().nulls_last(),
+    TaskInstance.priority.desc(),
+    TaskInstance.created_at.desc(),
+    postgresql_where=TaskInstance.status.in_([TaskStatus.PENDING, TaskStatus.IN_PROGRESS]),
+)
+# Tasks of one episode in due-date order
+Index(
+    "ix_task_instances_episode_id_due_date",
+    TaskInstance.episode_id,
+    TaskInstance.due_date.asc().nulls_last(),
+    TaskInstance.priority.desc(),
+)
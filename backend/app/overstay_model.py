@@ -0,0 +1,107 @@
+"""
+Process-wide registry for the CatBoost overstay model.
+
+The model is deserialized once (from the application lifespan hook) and shared
+by every request. If the ``.cbm`` file is replaced on disk, the next lookup
+notices the new modification time and reloads it, so a model can be swapped
+without restarting the API.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# backend/catboost_grd.cbm
+MODEL_PATH = Path(__file__).resolve().parents[1] / "catboost_grd.cbm"
+
+
+def load_catboost_model(model_path: Path) -> Any:
+    """Deserialize a CatBoost classifier from disk."""
+    from catboost import CatBoostClassifier
+
+    model = CatBoostClassifier()
+    model.load_model(str(model_path))
+    return model
+
+
+class OverstayModelRegistry:
+    """Keeps a single loaded model in memory and reloads it when the file changes."""
+
+    def __init__(
+        self,
+        model_path: str | Path = MODEL_PATH,
+        loader: Callable[[Path], Any] = load_catboost_model,
+    ):
+        self.model_path = Path(model_path)
+        self._loader = loader
+        self._model: Any = None
+        self._mtime: Optional[float] = None
+        # mtime of a file that failed to load, so we don't retry it on every call
+        self._failed_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self.last_error: Optional[str] = None
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return self.model_path.stat().st_mtime
+        except OSError:
+            return None
+
+    def load(self) -> bool:
+        """
+        Load (or reload) the model if the file changed since the last load.
+
+        Returns:
+            True if a model is available after the call
+        """
+        mtime = self._current_mtime()
+        if mtime is None:
+            self.last_error = f"Model file not found at {self.model_path}"
+            return self._model is not None
+
+        if (self._model is not None and mtime == self._mtime) or mtime == self._failed_mtime:
+            return self._model is not None
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            if (self._model is not None and mtime == self._mtime) or mtime == self._failed_mtime:
+                return self._model is not None
+            try:
+                model = self._loader(self.model_path)
+            except ImportError as e:
+                self.last_error = f"CatBoost not available: {e}"
+                self._failed_mtime = mtime
+                logger.error(self.last_error)
+                return self._model is not None
+            except Exception as e:
+                self.last_error = f"Failed to load model: {e}"
+                self._failed_mtime = mtime
+                logger.error(self.last_error)
+                return self._model is not None
+
+            self._model = model
+            self._mtime = mtime
+            self._failed_mtime = None
+            self.last_error = None
+            logger.info(f"Loaded overstay model from {self.model_path}")
+            return True
+
+    def get(self) -> Any:
+        """Return the current model, reloading it first if the file was modified."""
+        self.load()
+        return self._model
+
+    def status(self) -> dict:
+        """Describe the registry state for diagnostics."""
+        return {
+            "model_path": str(self.model_path),
+            "loaded": self._model is not None,
+            "model_mtime": self._mtime,
+            "last_error": self.last_error,
+        }
+
+
+model_registry = OverstayModelRegistry()
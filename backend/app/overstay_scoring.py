@@ -0,0 +1,339 @@
+"""
+Batched overstay scoring engine.
+
+Turns N ``(ClinicalEpisode, Patient)`` pairs into a single columnar feature
+matrix, runs one ``predict_proba`` call over it and writes every probability
+back with a single executemany ``UPDATE``. Episodes scored at or above
+``OVERSTAY_ALERT_THRESHOLD`` get a predicted-overstay alert (one active per
+episode). Used by the background scoring worker and by
+``POST /predict-overstay``.
+
+Each stored probability carries ``overstay_features_hash``, a fingerprint of
+the inputs it was computed from. Uploads that change GRD or admission
+descriptors make the fingerprint differ, so only those episodes get re-scored.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import String, bindparam, cast, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.alert import Alert, AlertSeverity, AlertType
+from app.models.clinical_episode import ClinicalEpisode
+from app.models.patient import Patient
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Probabilities that raise a predicted-overstay alert, and the HIGH severity cut-off
+OVERSTAY_ALERT_THRESHOLD = 0.5
+OVERSTAY_HIGH_SEVERITY_THRESHOLD = 0.7
+
+# Column order must match the order the model was trained with
+FEATURE_COLUMNS = [
+    "complication",
+    "Prevision (Desc)",
+    "Estancia Norma GRD ",
+    "IR GRD (Código)",
+    "Edad en años",
+    "Tipo Ingreso (Descripción)",
+    "Servicio Ingreso (Descripción)",
+    "CDM_derived",
+    "GRD_num_derived",
+    "sev_digit",
+    "tipo_from_code",
+]
+NUMERIC_COLUMNS = ["Estancia Norma GRD ", "Edad en años"]
+CATEGORICAL_COLUMNS = [c for c in FEATURE_COLUMNS if c not in NUMERIC_COLUMNS]
+
+
+def extract_complication_from_text(text: str) -> int:
+    """Return 1 if the GRD name carries a complication marker (W/CC or W/MCC)."""
+    if text is None:
+        return 0
+    s = str(text).upper()
+    if re.search(r"W\/MCC", s):
+        return 1
+    if re.search(r"W\/CC", s):
+        return 1
+    return 0
+
+
+def parse_grd_code(code):
+    """
+    Recibe código (p. ej. '084212' o 8412), devuelve (cdm, tipo_digit, grd_num, sev_digit)
+    Devuelve None si no puede parsear.
+    """
+    if code is None:
+        return (None, None, None, None)
+    s = str(code).strip()
+    # Mantener solo dígitos
+    s_digits = "".join(ch for ch in s if ch.isdigit())
+    if len(s_digits) < 5:
+        s_digits = s_digits.zfill(6)  # pad left if shorter
+    cdm = s_digits[0:2]
+    tipo_digit = s_digits[2:3]
+    grd_num = s_digits[3:5]
+    sev_digit = s_digits[5:6] if len(s_digits) >= 6 else None
+    return (cdm, tipo_digit, grd_num, sev_digit)
+
+
+def compute_age_years(birth_date: date, ref_dt: datetime) -> Optional[float]:
+    """Age in years (2 decimals) at the reference datetime."""
+    if not birth_date:
+        return None
+    try:
+        delta_days = (ref_dt.date() - birth_date).days
+        return round(delta_days / 365.25, 2)
+    except Exception:
+        return None
+
+
+def parse_type(type_str: str) -> str:
+    """Map the admission type description to the model's two categories."""
+    if type_str == "Urgencias":
+        return "Urgente"
+    else:
+        return "Programado"
+
+
+def features_fingerprint():
+    """
+    SQL expression hashing every column the model features are derived from.
+
+    Must be selected from a query that joins ``ClinicalEpisode`` with ``Patient``.
+    """
+    parts = [
+        ClinicalEpisode.grd_id,
+        ClinicalEpisode.grd_name,
+        cast(ClinicalEpisode.grd_expected_days, String),
+        ClinicalEpisode.prevision_desc,
+        ClinicalEpisode.tipo_ingreso_desc,
+        ClinicalEpisode.servicio_ingreso_desc,
+        cast(ClinicalEpisode.admission_at, String),
+        cast(Patient.birth_date, String),
+    ]
+    return func.md5(func.concat_ws("|", *[func.coalesce(p, "") for p in parts]))
+
+
+def needs_scoring():
+    """SQL condition for episodes with no probability or one computed from outdated inputs."""
+    return or_(
+        ClinicalEpisode.overstay_probability.is_(None),
+        ClinicalEpisode.overstay_features_hash.is_distinct_from(features_fingerprint()),
+    )
+
+
+@dataclass
+class FeatureMatrix:
+    """Feature frame plus the episode ids of its rows (same order)."""
+    frame: "pd.DataFrame"
+    episode_ids: list[UUID]
+    skipped: int = 0
+
+
+@dataclass
+class ScoringResult:
+    """Outcome of scoring a batch of episodes."""
+    probabilities: dict[UUID, float] = field(default_factory=dict)
+    skipped: int = 0
+
+    @property
+    def scored(self) -> int:
+        return len(self.probabilities)
+
+
+def build_feature_matrix(pairs: Iterable[tuple[ClinicalEpisode, Patient]]) -> FeatureMatrix:
+    """
+    Build one columnar feature matrix for all scoreable episodes.
+
+    Episodes missing any required model input (GRD, expected days, age or the
+    prevision/admission type/service descriptors) are skipped and counted.
+    """
+    columns: dict[str, list[Any]] = {c: [] for c in FEATURE_COLUMNS}
+    episode_ids: list[UUID] = []
+    skipped = 0
+
+    for episode, patient in pairs:
+        grd_name = episode.grd_name
+        grd_id = episode.grd_id
+        grd_expected_days = episode.grd_expected_days
+        age_years = compute_age_years(
+            patient.birth_date if patient else None,
+            episode.admission_at or datetime.utcnow(),
+        )
+
+        if grd_expected_days is None or age_years is None or (grd_name is None and grd_id is None):
+            skipped += 1
+            continue
+        if episode.prevision_desc is None or episode.tipo_ingreso_desc is None or episode.servicio_ingreso_desc is None:
+            skipped += 1
+            continue
+
+        (cdm, tipo_digit, grd_num, sev_digit) = parse_grd_code(grd_id)
+
+        columns["complication"].append(str(extract_complication_from_text(grd_name)))
+        columns["Prevision (Desc)"].append(str(episode.prevision_desc))
+        columns["Estancia Norma GRD "].append(int(grd_expected_days))
+        columns["IR GRD (Código)"].append(str(grd_id))
+        columns["Edad en años"].append(float(age_years))
+        columns["Tipo Ingreso (Descripción)"].append(parse_type(episode.tipo_ingreso_desc))
+        columns["Servicio Ingreso (Descripción)"].append(str(episode.servicio_ingreso_desc))
+        columns["CDM_derived"].append(str(cdm))
+        columns["GRD_num_derived"].append(str(grd_num))
+        columns["sev_digit"].append(str(sev_digit))
+        columns["tipo_from_code"].append(str(tipo_digit))
+        episode_ids.append(episode.id)
+
+    # Imported on first use so API workers that never score skip loading pandas
+    import pandas as pd
+
+    frame = pd.DataFrame(columns, columns=FEATURE_COLUMNS)
+    for c in NUMERIC_COLUMNS:
+        frame[c] = pd.to_numeric(frame[c], errors="coerce")
+
+    return FeatureMatrix(frame=frame, episode_ids=episode_ids, skipped=skipped)
+
+
+def predict_probabilities(model: Any, frame: "pd.DataFrame") -> "np.ndarray":
+    """Run a single predict_proba call and return the positive-class probability per row."""
+    import numpy as np
+
+    try:
+        from catboost import Pool
+
+        cat_feature_indices = [frame.columns.get_loc(c) for c in CATEGORICAL_COLUMNS]
+        probs = model.predict_proba(Pool(frame, cat_features=cat_feature_indices))
+    except Exception:
+        # Try direct dataframe if Pool fails
+        probs = model.predict_proba(frame)
+
+    # CatBoost returns [p0, p1]; overstay probability assumed class 1
+    arr = np.asarray(probs, dtype=float)
+    if arr.ndim == 2:
+        return arr[:, 1] if arr.shape[1] >= 2 else arr[:, 0]
+    return arr.reshape(-1)
+
+
+async def write_probabilities(
+    session: AsyncSession,
+    probabilities: dict[UUID, float],
+    fingerprints: Optional[dict[UUID, str]] = None,
+) -> None:
+    """Persist probabilities with one executemany UPDATE (the caller commits)."""
+    if not probabilities:
+        return
+    fingerprints = fingerprints or {}
+    table = ClinicalEpisode.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("episode_id"))
+        .values(
+            overstay_probability=bindparam("probability"),
+            overstay_features_hash=bindparam("features_hash"),
+        )
+    )
+    await session.execute(
+        stmt,
+        [
+            {"episode_id": ep_id, "probability": p, "features_hash": fingerprints.get(ep_id)}
+            for ep_id, p in probabilities.items()
+        ],
+    )
+
+
+async def upsert_overstay_alerts(session: AsyncSession, probabilities: dict[UUID, float]) -> int:
+    """
+    Raise a predicted-overstay alert for every probability at or above the threshold.
+
+    An episode keeps at most one active predicted-overstay alert: when one
+    exists (e.g. the episode is re-scored after its inputs changed) its
+    severity and message are updated instead of adding another.
+
+    Args:
+        session: Database session (not committed here)
+        probabilities: Probability per scored episode id
+
+    Returns:
+        Number of alerts added
+    """
+    high = {ep_id: p for ep_id, p in probabilities.items() if p >= OVERSTAY_ALERT_THRESHOLD}
+    if not high:
+        return 0
+
+    existing = (await session.execute(
+        select(Alert).where(
+            Alert.episode_id.in_(list(high)),
+            Alert.alert_type == AlertType.PREDICTED_OVERSTAY,
+            Alert.is_active.is_(True),
+        )
+    )).scalars().all()
+    active = {alert.episode_id: alert for alert in existing}
+
+    added = 0
+    for ep_id, pval in high.items():
+        severity = AlertSeverity.HIGH if pval >= OVERSTAY_HIGH_SEVERITY_THRESHOLD else AlertSeverity.MEDIUM
+        message = f"Predicción de sobrestadía: {int(pval * 100)}% probabilidad"
+        alert = active.get(ep_id)
+        if alert is not None:
+            alert.severity = severity
+            alert.message = message
+            continue
+        session.add(Alert(
+            episode_id=ep_id,
+            alert_type=AlertType.PREDICTED_OVERSTAY,
+            severity=severity,
+            message=message,
+            is_active=True,
+            created_by="Sistema (modelo predictivo)"
+        ))
+        added += 1
+    return added
+
+
+async def score_episodes(
+    session: AsyncSession,
+    pairs: Sequence[tuple[ClinicalEpisode, Patient]],
+    model: Any,
+    fingerprints: Optional[dict[UUID, str]] = None,
+) -> ScoringResult:
+    """
+    Score a batch of episodes, store their overstay probabilities and add
+    predicted-overstay alerts for the high ones.
+
+    Args:
+        session: Database session (not committed here)
+        pairs: (ClinicalEpisode, Patient) pairs to score
+        model: Loaded CatBoost model (see app.overstay_model)
+        fingerprints: features_fingerprint() per episode id, read together
+            with the pairs so later input changes are still detected
+
+    Returns:
+        ScoringResult with the probability per scored episode id
+    """
+    matrix = build_feature_matrix(pairs)
+    result = ScoringResult(skipped=matrix.skipped)
+    if model is None or not matrix.episode_ids:
+        return result
+
+    try:
+        probs = predict_probabilities(model, matrix.frame)
+    except Exception as e:
+        logger.error(f"Overstay prediction failed for {len(matrix.episode_ids)} episodes: {e}")
+        result.skipped += len(matrix.episode_ids)
+        return result
+
+    result.probabilities = {
+        ep_id: float(p) for ep_id, p in zip(matrix.episode_ids, probs)
+    }
+    await write_probabilities(session, result.probabilities, fingerprints)
+    await upsert_overstay_alerts(session, result.probabilities)
+    return result
@@ -0,0 +1,201 @@
+"""
+Background overstay scoring worker.
+
+Runs as an asyncio task started from the application lifespan. It polls for
+ACTIVE episodes that have every model input but no ``overstay_probability``
+yet, or whose inputs changed since they were scored, and scores them in
+batches with the shared model registry, so request handlers only ever read
+precomputed probabilities. Scoring also raises the predicted-overstay alerts
+(see ``app.overstay_scoring``).
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.dashboard_snapshot import dashboard_snapshot
+from app.db import SessionLocal
+from app.models.clinical_episode import ClinicalEpisode, EpisodeStatus
+from app.models.patient import Patient
+from app.overstay_model import OverstayModelRegistry, model_registry
+from app.overstay_scoring import features_fingerprint, needs_scoring, score_episodes
+
+logger = logging.getLogger(__name__)
+
+
+def pending_scoring_filter():
+    """SQL condition for episodes the worker should (re)score."""
+    return and_(
+        ClinicalEpisode.status == EpisodeStatus.ACTIVE,
+        needs_scoring(),
+        # Only rows the model can actually score, so unscoreable rows never
+        # keep the queue busy
+        ClinicalEpisode.grd_expected_days.is_not(None),
+        or_(ClinicalEpisode.grd_id.is_not(None), ClinicalEpisode.grd_name.is_not(None)),
+        ClinicalEpisode.prevision_desc.is_not(None),
+        ClinicalEpisode.tipo_ingreso_desc.is_not(None),
+        ClinicalEpisode.servicio_ingreso_desc.is_not(None),
+        Patient.birth_date.is_not(None),
+    )
+
+
+class OverstayScoringWorker:
+    """
+    Polls for unscored episodes and scores them in batches.
+
+    The worker sleeps ``interval`` seconds between passes; call ``wake()``
+    after writes that create scoreable episodes to start a pass right away.
+    """
+
+    def __init__(
+        self,
+        registry: OverstayModelRegistry,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        interval: float = 30.0,
+        batch_size: int = 500,
+    ):
+        self.registry = registry
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_duration: Optional[float] = None
+        self.last_run_scored = 0
+        self.last_run_skipped = 0
+        self.last_error: Optional[str] = None
+        self.total_scored = 0
+        self.runs = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the polling loop on the running event loop."""
+        if self.running:
+            return
+        self._wake_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run_forever(), name="overstay-scoring-worker")
+
+    async def stop(self) -> None:
+        """Cancel the polling loop and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self) -> None:
+        """Ask the worker to run a pass now instead of waiting for the interval."""
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("Overstay scoring pass failed")
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+
+    async def run_once(self) -> int:
+        """
+        Score every pending episode, one batch at a time.
+
+        Returns:
+            Number of episodes scored in this pass
+        """
+        model = await asyncio.to_thread(self.registry.get)
+        if model is None:
+            self.last_error = self.registry.last_error or "Model not loaded"
+            return 0
+
+        started = time.perf_counter()
+        scored = 0
+        skipped = 0
+        while True:
+            async with self.session_factory() as session:
+                stmt = (
+                    select(ClinicalEpisode, Patient, features_fingerprint())
+                    .join(Patient, ClinicalEpisode.patient_id == Patient.id)
+                    .where(pending_scoring_filter())
+                    .order_by(ClinicalEpisode.admission_at.desc())
+                    .limit(self.batch_size)
+                    # With several API workers each runs this loop; locked
+                    # rows are being scored by another process
+                    .with_for_update(of=ClinicalEpisode, skip_locked=True)
+                )
+                rows = (await session.execute(stmt)).all()
+                if not rows:
+                    break
+
+                pairs = [(episode, patient) for episode, patient, _ in rows]
+                fingerprints = {episode.id: fp for episode, _, fp in rows}
+                result = await score_episodes(session, pairs, model, fingerprints)
+                await session.commit()
+                dashboard_snapshot.invalidate()
+
+            scored += result.scored
+            skipped += result.skipped
+            # A batch that scored nothing would be fetched again unchanged
+            if result.scored == 0 or len(rows) < self.batch_size:
+                break
+
+        self.runs += 1
+        self.last_run_at = datetime.now(timezone.utc)
+        self.last_run_duration = round(time.perf_counter() - started, 3)
+        self.last_run_scored = scored
+        self.last_run_skipped = skipped
+        self.total_scored += scored
+        self.last_error = None
+        return scored
+
+    async def pending_count(self, session: AsyncSession) -> int:
+        """Number of episodes currently waiting to be scored."""
+        stmt = (
+            select(func.count(ClinicalEpisode.id))
+            .join(Patient, ClinicalEpisode.patient_id == Patient.id)
+            .where(pending_scoring_filter())
+        )
+        return await session.scalar(stmt) or 0
+
+    def status(self) -> dict[str, Any]:
+        """Snapshot of the worker state for the status endpoint."""
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "runs": self.runs,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_run_duration_seconds": self.last_run_duration,
+            "last_run_scored": self.last_run_scored,
+            "last_run_skipped": self.last_run_skipped,
+            "total_scored": self.total_scored,
+            "last_error": self.last_error,
+        }
+
+
+scoring_worker = OverstayScoringWorker(
+    model_registry,
+    interval=settings.OVERSTAY_WORKER_INTERVAL_SECONDS,
+    batch_size=settings.OVERSTAY_WORKER_BATCH_SIZE,
+)
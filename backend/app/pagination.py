@@ -0,0 +1,53 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor carries the sort key of the last row of a page, so the next page is
+fetched with ``WHERE (key) < (cursor key)`` through the index instead of
+skipping ``OFFSET`` rows. It is URL-safe base64 of a small JSON object; the
+``sort`` it was built for is included so a cursor from one ordering is not
+applied to another.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+
+def encode_cursor(sort: str, **keys: Any) -> str:
+    """
+    Build a cursor for the row with the given sort key values.
+
+    Args:
+        sort: Name of the ordering the cursor belongs to
+        **keys: JSON-serializable key values of the last returned row
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"sort": sort, **keys}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Dict[str, Any]:
+    """
+    Read the key values from a cursor built by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor string from a previous page
+        sort: Ordering of the current request
+
+    Returns:
+        The key values
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(payload, dict) or payload.pop("sort", None) != sort:
+        raise ValueError("Cursor does not match the requested sort order")
+    return payload
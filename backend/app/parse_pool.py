@@ -0,0 +1,62 @@
+"""
+Executor for the CPU-bound parse stage of Excel imports.
+
+``pd.read_excel`` and the row parsers would block the event loop (and every
+other request) for the whole parse. ``run_parse`` runs them in a process
+pool of ``IMPORT_PARSE_PROCESSES`` workers, or in a worker thread when that
+setting is 0. Functions and arguments must be picklable in process mode.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[Executor] = None
+
+
+def get_parse_executor() -> Executor:
+    """Return the shared parse executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        if settings.IMPORT_PARSE_PROCESSES > 0:
+            # spawn: forking a process that already runs the event loop and
+            # driver threads is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.IMPORT_PARSE_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excel-parse")
+        logger.info(f"Started Excel parse executor: {type(_executor).__name__}")
+    return _executor
+
+
+async def run_parse(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run ``func(*args)`` on the parse executor and wait for the result.
+
+    A crashed worker process breaks the pool; it is replaced so the next
+    import gets a fresh one, and the error is raised to the caller.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_parse_executor(), func, *args)
+    except BrokenProcessPool:
+        logger.error("Excel parse process pool broke; it will be recreated")
+        shutdown_parse_executor()
+        raise
+
+
+def shutdown_parse_executor() -> None:
+    """Stop the parse executor (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
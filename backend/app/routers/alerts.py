@@ -6,6 +6,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from app.deps import get_session
+from app.dashboard_snapshot import dashboard_snapshot
 from app.models.alert import Alert as AlertModel, AlertType, AlertSeverity
 from app.models.clinical_episode import ClinicalEpisode
 from app.models.patient import Patient
@@ -87,6 +88,7 @@ async def create_episode_alert(
     
     session.add(new_alert)
     await session.commit()
+    dashboard_snapshot.invalidate()
     await session.refresh(new_alert)
     
     return new_alert
@@ -187,6 +189,7 @@ async def resolve_alert(
     # Update is_active to False
     alert.is_active = False
     await session.commit()
+    dashboard_snapshot.invalidate()
     await session.refresh(alert)
     
     return alert
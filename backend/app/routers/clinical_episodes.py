@@ -1,16 +1,16 @@
 from fastapi import APIRouter, HTTPException
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_, update
+from sqlalchemy import select, func, or_, and_, tuple_
 from fastapi import Depends
 from app.deps import get_session
+from app.dashboard_snapshot import dashboard_snapshot
+from app.episode_search import build_search_filter, search_rank
+from app.pagination import decode_cursor, encode_cursor
 from sqlalchemy.orm import selectinload
 from typing import Union
 from uuid import UUID
 from datetime import datetime
-from pathlib import Path
-import pandas as pd
-import numpy as np
 
 from app.models.clinical_episode import ClinicalEpisode as ClinicalEpisodeModel, EpisodeStatus
 from app.models.patient import Patient
@@ -39,226 +39,36 @@ from app.schemas.social_score_history import SocialScoreHistory as SocialScoreHi
 router = APIRouter(prefix="/clinical-episodes", tags=["clinical-episodes"])
 
 
-# Helper functions for prediction (from predictor.py)
-def extract_complication_from_text(text: str) -> str:
-    if text is None:
-        return 0
-    import re
-    s = str(text).upper()
-    if re.search(r"W\/MCC", s):
-        return 1
-    if re.search(r"W\/CC", s):
-        return 1
-    return 0
-
-
-def parse_grd_code(code):
-    """Parse GRD code into components"""
-    if code is None:
-        return (None, None, None, None)
-    s = str(code).strip()
-    s_digits = "".join(ch for ch in s if ch.isdigit())
-    if len(s_digits) < 5:
-        s_digits = s_digits.zfill(6)
-    cdm = s_digits[0:2]
-    tipo_digit = s_digits[2:3]
-    grd_num = s_digits[3:5]
-    sev_digit = s_digits[5:6] if len(s_digits) >= 6 else None
-    return (cdm, tipo_digit, grd_num, sev_digit)
-
-
-def _compute_age_years(birth_date: datetime, ref_dt: datetime) -> float:
-    if not birth_date:
-        return None
-    try:
-        delta_days = (ref_dt.date() - birth_date).days
-        return round(delta_days / 365.25, 2)
-    except Exception:
-        return None
-
-
-def parse_type(type_str: str):
-    if type_str == "Urgencias":
-        return "Urgente"
-    else:
-        return "Programado"
-
-
-async def calculate_probability_for_episode(episode: ClinicalEpisodeModel, patient: Patient, session: AsyncSession) -> float | None:
-    """Calculate overstay probability for a single episode if all required fields are present"""
-    try:
-        from catboost import CatBoostClassifier, Pool
-    except Exception:
-        return None
-    
-    model_path = Path(__file__).resolve().parents[2] / "catboost_grd.cbm"
-    if not model_path.exists():
-        return None
-    
-    try:
-        model = CatBoostClassifier()
-        model.load_model(str(model_path))
-    except Exception:
-        return None
-    
-    # Check required fields
-    grd_name = episode.grd_name
-    grd_id = episode.grd_id
-    grd_expected_days = episode.grd_expected_days
-    age_years = _compute_age_years(patient.birth_date, episode.admission_at or datetime.utcnow())
-    
-    if grd_expected_days is None or age_years is None or (grd_name is None and grd_id is None):
-        return None
-    if episode.prevision_desc is None or episode.tipo_ingreso_desc is None or episode.servicio_ingreso_desc is None:
-        return None
-    
-    (cdm, tipo_digit, grd_num, sev_digit) = parse_grd_code(grd_id)
-    
-    # Prepare data
-    data = {
-        "complication": str(extract_complication_from_text(grd_name)),
-        "Prevision (Desc)": str(episode.prevision_desc),
-        "Estancia Norma GRD ": int(grd_expected_days),
-        "IR GRD (Código)": str(grd_id),
-        "Edad en años": float(age_years),
-        "Tipo Ingreso (Descripción)": parse_type(episode.tipo_ingreso_desc),
-        "Servicio Ingreso (Descripción)": str(episode.servicio_ingreso_desc),
-        'CDM_derived': str(cdm),
-        'GRD_num_derived': str(grd_num),
-        'sev_digit': str(sev_digit),
-        'tipo_from_code': str(tipo_digit),
-    }
-    
-    df = pd.DataFrame([data])
-    
-    # Prepare categorical and numeric columns
-    cat_cols = [
-        "IR GRD",
-        "Prevision (Desc)",
-        "IR GRD (Código)",
-        "Tipo Ingreso (Descripción)",
-        "Servicio Ingreso (Descripción)",
-        "complication",
-        "CDM_derived",
-        "GRD_num_derived",
-        "sev_digit",
-        "tipo_from_code",
-    ]
-    num_cols = [
-        "Estancia Norma GRD ",
-        "Edad en años",
-    ]
-    
-    for c in cat_cols:
-        if c in df.columns:
-            df[c] = df[c].apply(lambda v: "" if v is None else str(v))
-    for c in num_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-    
-    try:
-        cat_feature_indices = [df.columns.get_loc(c) for c in cat_cols if c in df.columns]
-        pool = Pool(df, cat_features=cat_feature_indices)
-        probs = model.predict_proba(pool)
-    except Exception:
-        try:
-            probs = model.predict_proba(df)
-        except Exception:
-            return None
-    
-    # Extract probability
-    try:
-        pr = probs[0]
-        if isinstance(pr, (list, tuple)):
-            p1 = float(pr[1] if len(pr) >= 2 else pr[0])
-        elif isinstance(pr, np.ndarray):
-            if pr.ndim == 0:
-                p1 = float(pr)
-            elif pr.ndim == 1:
-                p1 = float(pr[1] if pr.shape[0] >= 2 else pr[0])
-            else:
-                flat = pr.flatten()
-                p1 = float(flat[1] if flat.size >= 2 else flat[0])
-        else:
-            p1 = float(pr)
-        
-        # Save to database
-        stmt_upd = (
-            update(ClinicalEpisodeModel)
-            .where(ClinicalEpisodeModel.id == episode.id)
-            .values(overstay_probability=p1)
-        )
-        await session.execute(stmt_upd)
-        await session.commit()
-        
-        return p1
-    except Exception:
-        return None
-
-
-def build_search_filter(search: str):
+def _after_cursor(sort: str, keys: dict):
     """
-    Enhanced search handling multi-word names and room numbers.
-    
-    Supports searching by:
-    - Patient first name (partial or full)
-    - Patient last name (partial or full)
-    - Multi-word first names (e.g., "Maria Jose")
-    - Multi-word last names (e.g., "Garcia Lopez")
-    - Room number
-    
-    Examples:
-    - "Maria" → finds first or last name containing "Maria"
-    - "Maria Garcia" → finds patients with both terms in their name
-    - "Garcia Lopez" → finds multi-word last names
-    - "101" → finds room 101
-    - "Maria 101" → finds Maria in room 101 OR anyone named "Maria" or in room "101"
+    Condition selecting the rows that follow a cursor.
+
+    Every sort key is descending, so "after" means smaller. For the risk
+    sort unscored episodes (NULL probability) come last.
     """
-    if not search or not search.strip():
-        return None
-    
-    search = search.strip()
-    search_terms = search.split()
-    
-    # Build the concatenated full name: "FirstName LastName"
-    full_name = func.concat(Patient.first_name, ' ', Patient.last_name)
-    
-    if len(search_terms) == 1:
-        # Single term: match against any field
-        term = search_terms[0]
-        return or_(
-            Patient.first_name.ilike(f"%{term}%"),
-            Patient.last_name.ilike(f"%{term}%"),
-            Bed.room.ilike(f"%{term}%")
-        )
-    else:
-        # Multiple terms: use hybrid approach
-        
-        # Strategy A: Full search string matches concatenated name
-        # Handles: "Maria Garcia Lopez", "Garcia Lopez", etc.
-        full_name_match = full_name.ilike(f"%{search}%")
-        
-        # Strategy B: Each word matches somewhere in first or last name
-        # Handles: "Maria Lopez", "Lopez Maria", etc.
-        word_conditions = []
-        for term in search_terms:
-            word_conditions.append(
-                or_(
-                    Patient.first_name.ilike(f"%{term}%"),
-                    Patient.last_name.ilike(f"%{term}%")
-                )
-            )
-        word_match = and_(*word_conditions)
-        
-        # Strategy C: Entire search matches room number
-        room_match = Bed.room.ilike(f"%{search}%")
-        
-        # Combine all strategies with OR
-        return or_(
-            full_name_match,   # Consecutive words in full name
-            word_match,        # All words match somewhere in name
-            room_match         # Or it's a room number
-        )
+    after_admission = tuple_(ClinicalEpisodeModel.admission_at, ClinicalEpisodeModel.id) < tuple_(
+        datetime.fromisoformat(keys["admission_at"]), UUID(keys["id"])
+    )
+    if sort == "recent":
+        return after_admission
+
+    probability = ClinicalEpisodeModel.overstay_probability
+    cursor_probability = keys["overstay_probability"]
+    if cursor_probability is None:
+        return and_(probability.is_(None), after_admission)
+    return or_(
+        probability < cursor_probability,
+        and_(probability == cursor_probability, after_admission),
+        probability.is_(None),
+    )
+
+
+def _cursor_for(sort: str, episode: ClinicalEpisodeModel) -> str:
+    """Cursor pointing after ``episode`` in the given sort."""
+    keys = {"admission_at": episode.admission_at.isoformat(), "id": str(episode.id)}
+    if sort == "risk":
+        keys["overstay_probability"] = episode.overstay_probability
+    return encode_cursor(sort, **keys)
 
 
 def parse_includes(include: str | None) -> set[str]:
@@ -276,6 +86,8 @@ async def list_clinical_episodes(
     include: str | None = None,
     overstay_probability_min: float | None = None,
     sort_by_overstay_probability: bool = False,
+    cursor: str | None = None,
+    include_total: bool = True,
     session: AsyncSession = Depends(get_session)
 ) -> PaginatedClinicalEpisodes:
     """
@@ -286,6 +98,11 @@ async def list_clinical_episodes(
     - page: Page number (starts at 1)
     - page_size: Number of results per page (default: 50, max: 100)
     - include: Comma-separated list of includes: "patient", "social_score" (e.g., "patient,social_score")
+    - cursor: ``next_cursor`` of the previous page; fetches the following page
+      by keyset instead of OFFSET (``page`` is ignored). Available for the
+      default and the overstay probability orderings, not for search relevance
+    - include_total: Set to false to skip counting the matches (``total`` and
+      ``total_pages`` are then null); useful for infinite scroll
     
     Search examples:
     - "Maria" → finds patients with "Maria" in first or last name
@@ -322,124 +139,73 @@ async def list_clinical_episodes(
     if overstay_probability_min is not None:
         query = query.where(ClinicalEpisodeModel.overstay_probability >= overstay_probability_min)
     
-    # Get total count before adding ORDER BY (ordering doesn't affect count)
-    # Use distinct to avoid duplicate counts from joins
-    count_query = select(func.count(func.distinct(ClinicalEpisodeModel.id)))
-    count_query = count_query.select_from(ClinicalEpisodeModel)
-    count_query = count_query.join(Patient)
-    count_query = count_query.join(Bed, isouter=True)
-    if search:
-        search_filter = build_search_filter(search)
-        if search_filter is not None:
-            count_query = count_query.where(search_filter)
-    
-    # Apply overstay_probability filter to count query if provided
-    if overstay_probability_min is not None:
-        count_query = count_query.where(ClinicalEpisodeModel.overstay_probability >= overstay_probability_min)
-    total = await session.scalar(count_query) or 0
+    # Patient and Bed are many-to-one, so the joins never duplicate episodes
+    # and a plain COUNT over the filtered query is enough
+    total = None
+    if include_total:
+        count_query = query.with_only_columns(func.count(ClinicalEpisodeModel.id)).order_by(None)
+        total = await session.scalar(count_query) or 0
     
-    # If sorting by overstay_probability, calculate missing probabilities first
+    # Probabilities are precomputed by the background scoring worker
+    # (app.overstay_worker); this endpoint only reads them
     if sort_by_overstay_probability:
-        # Get episodes that need probability calculation (without pagination, but limited to reasonable amount)
-        query_for_calc = select(ClinicalEpisodeModel).where(
-            ClinicalEpisodeModel.status == EpisodeStatus.ACTIVE,
-            ClinicalEpisodeModel.overstay_probability.is_(None)
-        )
-        query_for_calc = query_for_calc.join(Patient)
-        query_for_calc = query_for_calc.options(selectinload(ClinicalEpisodeModel.patient))
-        # Limit to first 50 to avoid performance issues
-        query_for_calc = query_for_calc.limit(50)
-        
-        result_for_calc = await session.execute(query_for_calc)
-        episodes_to_calc = result_for_calc.scalars().unique().all()
-        
-        # Calculate probabilities for episodes that don't have it
-        for episode in episodes_to_calc:
-            if episode.patient:
-                await calculate_probability_for_episode(episode, episode.patient, session)
-        
-        # Now apply sorting and pagination to the original query
+        sort = "risk"
         query = query.order_by(
             ClinicalEpisodeModel.overstay_probability.desc().nulls_last(),
-            ClinicalEpisodeModel.admission_at.desc()
+            ClinicalEpisodeModel.admission_at.desc(),
+            ClinicalEpisodeModel.id.desc()
         )
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
-        if include_patient:
-            query = query.options(selectinload(ClinicalEpisodeModel.patient))
-        result = await session.execute(query)
-        episodes = result.scalars().unique().all()
     elif search and search.strip():
-        search_term = search.strip()
-        # Sort by relevance:
-        # 1. Exact first name matches (case-insensitive)
-        # 2. Exact last name matches
-        # 3. Exact room matches
-        # 4. Most recent admissions
+        sort = "relevance"
+        # Sort by relevance (exact matches, then trigram similarity), then
+        # most recent admissions
         query = query.order_by(
-            # Exact first name match gets highest priority
-            (Patient.first_name.ilike(search_term)).desc(),
-            # Exact last name match
-            (Patient.last_name.ilike(search_term)).desc(),
-            # Exact room match
-            (Bed.room.ilike(search_term)).desc(),
-            # Most recent admissions
-            ClinicalEpisodeModel.admission_at.desc()
+            *search_rank(search),
+            ClinicalEpisodeModel.admission_at.desc(),
+            ClinicalEpisodeModel.id.desc()
         )
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
-        # Add selectinload for patient if requested
-        if include_patient:
-            query = query.options(selectinload(ClinicalEpisodeModel.patient))
-        # Execute query
-        result = await session.execute(query)
-        episodes = result.scalars().unique().all()
     else:
         # Default sort when no search: most recent first
-        query = query.order_by(ClinicalEpisodeModel.admission_at.desc())
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
-        # Add selectinload for patient if requested
-        if include_patient:
-            query = query.options(selectinload(ClinicalEpisodeModel.patient))
-        # Execute query
-        result = await session.execute(query)
-        episodes = result.scalars().unique().all()
-    
-    # If social_score is requested, fetch the most recent score for each episode
-    if include_social_score and episodes:
-        episode_ids = [ep.id for ep in episodes]
-        
-        # Subquery to get the most recent score per episode
-        latest_score_subquery = (
-            select(
-                SocialScoreHistory.episode_id,
-                func.max(SocialScoreHistory.recorded_at).label("max_recorded_at")
-            )
-            .where(SocialScoreHistory.episode_id.in_(episode_ids))
-            .group_by(SocialScoreHistory.episode_id)
-            .subquery()
+        sort = "recent"
+        query = query.order_by(
+            ClinicalEpisodeModel.admission_at.desc(),
+            ClinicalEpisodeModel.id.desc()
         )
-        
-        # Get the actual score records
-        scores_query = (
-            select(SocialScoreHistory)
-            .join(
-                latest_score_subquery,
-                and_(
-                    SocialScoreHistory.episode_id == latest_score_subquery.c.episode_id,
-                    SocialScoreHistory.recorded_at == latest_score_subquery.c.max_recorded_at
-                )
+    
+    if cursor:
+        # Keyset pagination: continue after the last row of the previous page
+        if sort == "relevance":
+            raise HTTPException(
+                status_code=400,
+                detail="Cursor pagination is not available for search relevance ordering; "
+                       "use page or sort_by_overstay_probability"
             )
-        )
-        scores_result = await session.execute(scores_query)
-        scores = scores_result.scalars().all()
-        
-        # Create a map of episode_id to latest score
-        score_map = {score.episode_id: score for score in scores}
-        
+        try:
+            query = query.where(_after_cursor(sort, decode_cursor(cursor, sort)))
+        except (ValueError, KeyError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+    else:
+        query = query.offset((page - 1) * page_size)
+    
+    # Fetch one extra row to know whether there is a next page
+    query = query.limit(page_size + 1)
+    if include_patient:
+        query = query.options(selectinload(ClinicalEpisodeModel.patient))
+    if include_social_score:
+        query = query.options(selectinload(ClinicalEpisodeModel.latest_social_score_record))
+    result = await session.execute(query)
+    episodes = result.scalars().unique().all()
+    has_more = len(episodes) > page_size
+    episodes = episodes[:page_size]
+    next_cursor = _cursor_for(sort, episodes[-1]) if has_more and sort != "relevance" else None
+    
+    # Calculate total pages
+    total_pages = None
+    if total is not None:
+        total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    
+    # The latest score is a pointer on the episode, loaded with the page above
+    if include_social_score and episodes:
         # Build response with includes
         response_data = []
         for episode in episodes:
@@ -462,30 +228,26 @@ async def list_clinical_episodes(
                 "created_at": episode.created_at,
                 "updated_at": episode.updated_at,
                 "patient": episode.patient if include_patient else None,
-                "latest_social_score": score_map.get(episode.id)
+                "latest_social_score": episode.latest_social_score_record
             }
             response_data.append(ClinicalEpisodeWithIncludes(**episode_dict))
         
-        # Calculate total pages
-        total_pages = (total + page_size - 1) // page_size if total > 0 else 0
-        
         return PaginatedClinicalEpisodes(
             data=response_data,
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=total_pages
+            total_pages=total_pages,
+            next_cursor=next_cursor
         )
     
-    # Calculate total pages
-    total_pages = (total + page_size - 1) // page_size if total > 0 else 0
-    
     return PaginatedClinicalEpisodes(
         data=episodes,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
@@ -495,7 +257,16 @@ async def get_dashboard_stats(
 ) -> DashboardStatsResponse:
     """
     Get dashboard statistics based on overstay_probability and other metrics.
-    
+
+    Served from a shared snapshot that is recomputed at most once per TTL or
+    after a write invalidates it; ``snapshotAgeSeconds`` tells how old it is.
+    """
+    stats, age = await dashboard_snapshot.get(lambda: _compute_dashboard_stats(session))
+    return stats.model_copy(update={"snapshotAgeSeconds": round(age, 3)})
+
+
+async def _compute_dashboard_stats(session: AsyncSession) -> DashboardStatsResponse:
+    """
     Calculates:
     - Total patients (open cases only)
     - High risk: overstay_probability >= 0.75
@@ -504,111 +275,56 @@ async def get_dashboard_stats(
     - Social risk levels based on latest social scores
     - Average stay days
     - Deviations (cases with stay days > expected days)
+
+    Everything is computed in one aggregate query over the open episodes.
     """
-    from datetime import date
-    from app.models.social_score_history import SocialScoreHistory
-    
-    # Get all open episodes (ACTIVE status)
-    open_episodes_query = select(ClinicalEpisodeModel).where(
-        ClinicalEpisodeModel.status == EpisodeStatus.ACTIVE
+    # Whole days since admission, floored like timedelta.days
+    days_in_stay = func.floor(
+        func.extract("epoch", func.now() - ClinicalEpisodeModel.admission_at) / 86400
     )
-    open_episodes_result = await session.execute(open_episodes_query)
-    open_episodes = open_episodes_result.scalars().all()
-    
-    total_patients = len(open_episodes)
-    
-    # Calculate risk levels based on overstay_probability
-    high_risk = 0
-    medium_risk = 0
-    low_risk = 0
-    
-    for episode in open_episodes:
-        if episode.overstay_probability is not None:
-            if episode.overstay_probability >= 0.75:
-                high_risk += 1
-            elif episode.overstay_probability >= 0.5:
-                medium_risk += 1
-            else:
-                low_risk += 1
-        else:
-            # Episodes without probability are considered low risk
-            low_risk += 1
-    
-    # Calculate average stay days
-    total_days = 0
-    for episode in open_episodes:
-        if episode.admission_at:
-            days_in_stay = (datetime.utcnow() - episode.admission_at).days
-            total_days += days_in_stay
-    average_stay_days = round(total_days / total_patients) if total_patients > 0 else 0
-    
-    # Calculate deviations (cases with stay days > expected days, only for cases with GRD)
-    deviations = 0
-    for episode in open_episodes:
-        if episode.grd_expected_days is not None and episode.admission_at:
-            days_in_stay = (datetime.utcnow() - episode.admission_at).days
-            if days_in_stay > episode.grd_expected_days:
-                deviations += 1
-    
-    # Calculate social risk levels
-    # Get episode IDs
-    episode_ids = [ep.id for ep in open_episodes]
-    
-    if episode_ids:
-        # Get latest social score for each episode
-        latest_score_subquery = (
-            select(
-                SocialScoreHistory.episode_id,
-                func.max(SocialScoreHistory.recorded_at).label("max_recorded_at")
-            )
-            .where(SocialScoreHistory.episode_id.in_(episode_ids))
-            .group_by(SocialScoreHistory.episode_id)
-            .subquery()
+    open_episodes = (
+        select(
+            ClinicalEpisodeModel.overstay_probability.label("probability"),
+            ClinicalEpisodeModel.grd_expected_days.label("expected_days"),
+            days_in_stay.label("days_in_stay"),
+            ClinicalEpisodeModel.latest_social_score_value.label("social_score"),
         )
-        
-        scores_query = (
-            select(SocialScoreHistory)
-            .join(
-                latest_score_subquery,
-                and_(
-                    SocialScoreHistory.episode_id == latest_score_subquery.c.episode_id,
-                    SocialScoreHistory.recorded_at == latest_score_subquery.c.max_recorded_at
-                )
-            )
-        )
-        scores_result = await session.execute(scores_query)
-        scores = scores_result.scalars().all()
-        
-        # Create a map of episode_id to latest score
-        score_map = {score.episode_id: score for score in scores}
-    else:
-        score_map = {}
-    
-    # Calculate social risk levels
-    high_social_risk = 0  # score >= 11
-    medium_social_risk = 0  # score 6-10
-    low_social_risk = 0  # score 0-5
-    
-    for episode in open_episodes:
-        score_record = score_map.get(episode.id)
-        if score_record and score_record.score is not None:
-            if score_record.score >= 11:
-                high_social_risk += 1
-            elif score_record.score >= 6:
-                medium_social_risk += 1
-            elif score_record.score >= 0:
-                low_social_risk += 1
-    
+        .where(ClinicalEpisodeModel.status == EpisodeStatus.ACTIVE)
+        .subquery()
+    )
+    probability = open_episodes.c.probability
+    social_score = open_episodes.c.social_score
+
+    stats_query = select(
+        func.count().label("total_patients"),
+        func.count().filter(probability >= 0.75).label("high_risk"),
+        func.count().filter(and_(probability >= 0.5, probability < 0.75)).label("medium_risk"),
+        # Episodes without probability are considered low risk
+        func.count().filter(or_(probability.is_(None), probability < 0.5)).label("low_risk"),
+        func.count().filter(social_score >= 11).label("high_social_risk"),
+        func.count().filter(and_(social_score >= 6, social_score < 11)).label("medium_social_risk"),
+        func.count().filter(and_(social_score >= 0, social_score < 6)).label("low_social_risk"),
+        func.coalesce(func.sum(open_episodes.c.days_in_stay), 0).label("total_days"),
+        # Deviations: stay days > expected days, only for cases with GRD
+        func.count().filter(
+            open_episodes.c.days_in_stay > open_episodes.c.expected_days
+        ).label("deviations"),
+    )
+    stats = (await session.execute(stats_query)).one()
+
+    total_patients = stats.total_patients
+    average_stay_days = round(int(stats.total_days) / total_patients) if total_patients > 0 else 0
+
     return DashboardStatsResponse(
         totalPatients=total_patients,
-        highRisk=high_risk,
-        mediumRisk=medium_risk,
-        lowRisk=low_risk,
-        highSocialRisk=high_social_risk,
-        mediumSocialRisk=medium_social_risk,
-        lowSocialRisk=low_social_risk,
+        highRisk=stats.high_risk,
+        mediumRisk=stats.medium_risk,
+        lowRisk=stats.low_risk,
+        highSocialRisk=stats.high_social_risk,
+        mediumSocialRisk=stats.medium_social_risk,
+        lowSocialRisk=stats.low_social_risk,
         averageStayDays=average_stay_days,
-        deviations=deviations
+        deviations=stats.deviations
     )
 
 
@@ -637,7 +353,9 @@ async def create_referral(
     )
     
     session.add(episode)
-    await session.flush()
+    # Commit before invalidating, so a recompute always sees the new episode
+    await session.commit()
+    dashboard_snapshot.invalidate()
     await session.refresh(episode, ['patient'])
     
     # TODO: Create alert for management team when alerts are implemented :$
@@ -670,6 +388,7 @@ async def close_episode(
     episode.discharge_at = datetime.utcnow()
     
     await session.commit()
+    dashboard_snapshot.invalidate()
     await session.refresh(episode)
     
     return episode
@@ -700,6 +419,8 @@ async def get_clinical_episode(
     
     if include_patient:
         query = query.options(selectinload(ClinicalEpisodeModel.patient))
+    if include_social_score:
+        query = query.options(selectinload(ClinicalEpisodeModel.latest_social_score_record))
     
     result = await session.execute(query)
     episode = result.scalar_one_or_none()
@@ -707,17 +428,7 @@ async def get_clinical_episode(
     if not episode:
         raise HTTPException(status_code=404, detail="Clinical episode not found")
     
-    # If social_score is requested, fetch the most recent score
     if include_social_score:
-        score_query = (
-            select(SocialScoreHistory)
-            .where(SocialScoreHistory.episode_id == episode_id)
-            .order_by(SocialScoreHistory.recorded_at.desc())
-            .limit(1)
-        )
-        score_result = await session.execute(score_query)
-        latest_score = score_result.scalar_one_or_none()
-        
         # Build response with includes
         episode_dict = {
             "id": episode.id,
@@ -733,7 +444,7 @@ async def get_clinical_episode(
             "created_at": episode.created_at,
             "updated_at": episode.updated_at,
             "patient": episode.patient if include_patient else None,
-            "latest_social_score": latest_score
+            "latest_social_score": episode.latest_social_score_record
         }
         return ClinicalEpisodeWithIncludes(**episode_dict)
     
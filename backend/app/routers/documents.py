@@ -14,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.deps import get_session
+from app.upload_storage import save_upload
 from app.models.patient_document import PatientDocument
 from app.models.patient_document import DocumentType as ModelDocumentType
 from app.schemas.patient_document import PatientDocumentResponse, DocumentType
@@ -118,26 +119,16 @@ async def upload_document(
                 detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             )
     
-    # Read file content
-    content = await file.read()
-    
-    # Validate file size
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB"
-        )
-    
     # Generate unique filename
     file_ext = Path(file.filename or "document").suffix
     unique_filename = f"{uuid.uuid4()}{file_ext}"
     file_path = UPLOAD_DIR / unique_filename
     
+    # Stream to disk, rejecting oversized files without buffering them
+    # (400, as this endpoint has always answered for oversized documents)
+    await save_upload(file, file_path, max_size=MAX_FILE_SIZE, too_large_status=400)
+    
     try:
-        # Save file to disk
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
         # Determine document type
         doc_type = get_document_type_from_extension(file.filename or "")
         
@@ -1,31 +1,101 @@
 """
 Excel upload endpoints for importing bed and patient data.
+
+Every upload endpoint accepts ``background=true`` to queue the import as a
+job instead of running it inside the request; poll ``GET /excel/jobs/{id}``
+for its progress and result.
 """
 
 import tempfile
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, File, Query, UploadFile, HTTPException
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.deps import get_session
-from app.excel_uploader import ExcelUploader
+from app.config import settings
+from app.deps import get_import_jobs, get_scoring_worker, get_session
+from app.import_jobs import ImportJobQueue, ImportRunner, create_uploader
+from app.overstay_worker import OverstayScoringWorker
+from app.upload_storage import save_upload
+
+if TYPE_CHECKING:
+    from app.excel_uploader import ExcelUploader
 
 
 router = APIRouter(prefix="/excel", tags=["excel-upload"])
 
+BACKGROUND_QUERY = Query(
+    False,
+    description="Queue the import and return a job id instead of waiting for it to finish",
+)
+
+
+async def _save_upload(file: UploadFile, suffix: str) -> str:
+    """
+    Stream an uploaded file to a temporary path and return the path.
+
+    ``save_upload`` deletes the temporary file when it rejects the upload.
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_path = tmp_file.name
+    saved = await save_upload(file, tmp_path, max_size=settings.MAX_EXCEL_UPLOAD_SIZE_MB * 1024 * 1024)
+    return str(saved.path)
+
+
+def _queue_import(
+    import_jobs: ImportJobQueue,
+    kind: str,
+    run: ImportRunner,
+    filename: Optional[str],
+    tmp_paths: list[str],
+) -> JSONResponse:
+    """Submit an import job and answer 202 with its id."""
+    job = import_jobs.submit(kind, run, filename=filename, cleanup_paths=tmp_paths)
+    return JSONResponse(status_code=202, content=job.to_dict())
+
+
+@router.get("/jobs/{job_id}")
+async def get_import_job(
+    job_id: str,
+    import_jobs: ImportJobQueue = Depends(get_import_jobs)
+) -> Dict[str, Any]:
+    """
+    Get the status of a background import job.
+
+    Returns:
+        Job status, progress counters (rows_total, rows_parsed, rows_written,
+        error_count, errors) and, once finished, the import result or error
+    """
+    job = import_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_dict()
+
+
+async def _import_beds(uploader: "ExcelUploader", path: str) -> Dict[str, Any]:
+    beds_created = await uploader.upload_beds_from_excel(path)
+    return {
+        "status": "success",
+        "message": f"Successfully uploaded {beds_created} beds",
+        "beds_created": beds_created,
+    }
+
 
 @router.post("/upload-beds")
 async def upload_beds(
     file: UploadFile = File(...),
-    session: AsyncSession = Depends(get_session)
+    background: bool = BACKGROUND_QUERY,
+    session: AsyncSession = Depends(get_session),
+    import_jobs: ImportJobQueue = Depends(get_import_jobs)
 ) -> Dict[str, Any]:
     """
     Upload bed data from "Camas NWP1" Excel file.
-    
+
     Expected file: Excel file with "Camas" sheet containing bed information.
-    
+
     Returns:
         Dictionary with upload statistics (beds_created, status, message)
     """
@@ -35,45 +105,57 @@ async def upload_beds(
             status_code=400,
             detail="Invalid file type. Please upload an Excel file (.xlsx or .xls)"
         )
-    
-    # Save uploaded file temporarily
+
+    tmp_file_path = None
+    queued = False
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
+        # Save uploaded file temporarily
+        tmp_file_path = await _save_upload(file, '.xlsx')
+        run = partial(_import_beds, path=tmp_file_path)
+        if background:
+            response = _queue_import(import_jobs, "beds", run, file.filename, [tmp_file_path])
+            queued = True
+            return response
+
         # Upload beds using the ExcelUploader
-        uploader = ExcelUploader(session)
-        beds_created = await uploader.upload_beds_from_excel(tmp_file_path)
-        
-        return {
-            "status": "success",
-            "message": f"Successfully uploaded {beds_created} beds",
-            "beds_created": beds_created,
-        }
-    
+        return await run(create_uploader(session))
+
+    except HTTPException:
+        raise
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error uploading beds: {str(e)}"
         )
-    
+
     finally:
-        # Clean up temporary file
-        Path(tmp_file_path).unlink(missing_ok=True)
+        # Clean up temporary file (queued jobs clean up after themselves)
+        if tmp_file_path and not queued:
+            Path(tmp_file_path).unlink(missing_ok=True)
+
+
+async def _import_patients(uploader: "ExcelUploader", path: str) -> Dict[str, Any]:
+    patients_processed = await uploader.upload_patients_from_excel(path)
+    return {
+        "status": "success",
+        "message": f"Successfully processed {patients_processed} patient records",
+        "patients_processed": patients_processed,
+    }
 
 
 @router.post("/upload-patients")
 async def upload_patients(
     file: UploadFile = File(...),
-    session: AsyncSession = Depends(get_session)
+    background: bool = BACKGROUND_QUERY,
+    session: AsyncSession = Depends(get_session),
+    import_jobs: ImportJobQueue = Depends(get_import_jobs)
 ) -> Dict[str, Any]:
     """
     Upload patient and clinical episode data from "Score Social" Excel file.
-    
+
     Expected file: Excel file with "Data Casos" sheet containing patient information.
-    
+
     Returns:
         Dictionary with upload statistics (patients_processed, status, message)
     """
@@ -83,40 +165,56 @@ async def upload_patients(
             status_code=400,
             detail="Invalid file type. Please upload an Excel file (.xlsx or .xls)"
         )
-    
-    # Save uploaded file temporarily
+
+    tmp_file_path = None
+    queued = False
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
+        # Save uploaded file temporarily
+        tmp_file_path = await _save_upload(file, '.xlsx')
+        run = partial(_import_patients, path=tmp_file_path)
+        if background:
+            response = _queue_import(import_jobs, "patients", run, file.filename, [tmp_file_path])
+            queued = True
+            return response
+
         # Upload patients using the ExcelUploader
-        uploader = ExcelUploader(session)
-        patients_processed = await uploader.upload_patients_from_excel(tmp_file_path)
-        
-        return {
-            "status": "success",
-            "message": f"Successfully processed {patients_processed} patient records",
-            "patients_processed": patients_processed,
-        }
-    
+        return await run(create_uploader(session))
+
+    except HTTPException:
+        raise
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error uploading patients: {str(e)}"
         )
-    
+
     finally:
-        # Clean up temporary file
-        Path(tmp_file_path).unlink(missing_ok=True)
-        
-       
+        # Clean up temporary file (queued jobs clean up after themselves)
+        if tmp_file_path and not queued:
+            Path(tmp_file_path).unlink(missing_ok=True)
+
+
+async def _import_gestion_estadia(
+    uploader: "ExcelUploader", path: str, scoring_worker: OverstayScoringWorker
+) -> Dict[str, Any]:
+    processed = await uploader.upload_gestion_estadia_from_excel(path)
+    # New or updated episodes may now be scoreable
+    scoring_worker.wake()
+    return {
+        "status": "success",
+        "message": f"Successfully processed {processed} UCCC rows",
+        "processed": processed,
+    }
+
 
 @router.post("/upload-gestion-estadia")
 async def upload_gestion_estadia(
     file: UploadFile = File(...),
-    session: AsyncSession = Depends(get_session)
+    background: bool = BACKGROUND_QUERY,
+    session: AsyncSession = Depends(get_session),
+    scoring_worker: OverstayScoringWorker = Depends(get_scoring_worker),
+    import_jobs: ImportJobQueue = Depends(get_import_jobs)
 ) -> Dict[str, Any]:
     """
     Upload patient and episode data from Gestion Estadía Excel file (UCCC sheet).
@@ -130,20 +228,20 @@ async def upload_gestion_estadia(
             detail="Invalid file type. Please upload an Excel file (.xlsx, .xls, .xlsm)"
         )
 
+    tmp_file_path = None
+    queued = False
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
+        tmp_file_path = await _save_upload(file, '.xlsx')
+        run = partial(_import_gestion_estadia, path=tmp_file_path, scoring_worker=scoring_worker)
+        if background:
+            response = _queue_import(import_jobs, "gestion-estadia", run, file.filename, [tmp_file_path])
+            queued = True
+            return response
 
-        uploader = ExcelUploader(session)
-        processed = await uploader.upload_gestion_estadia_from_excel(tmp_file_path)
+        return await run(create_uploader(session))
 
-        return {
-            "status": "success",
-            "message": f"Successfully processed {processed} UCCC rows",
-            "processed": processed,
-        }
+    except HTTPException:
+        raise
 
     except Exception as e:
         raise HTTPException(
@@ -152,24 +250,43 @@ async def upload_gestion_estadia(
         )
 
     finally:
-        Path(tmp_file_path).unlink(missing_ok=True)
+        if tmp_file_path and not queued:
+            Path(tmp_file_path).unlink(missing_ok=True)
+
+
+async def _import_social_scores(
+    uploader: "ExcelUploader", path: str, scoring_worker: OverstayScoringWorker
+) -> Dict[str, Any]:
+    result = await uploader.upload_social_scores_from_excel(path)
+    # Prevision/admission descriptors may have changed: re-score affected episodes
+    scoring_worker.wake()
+    return {
+        "status": "success",
+        "message": f"Successfully processed {result['count']} social score records",
+        "scores_processed": result['count'],
+        "missing_count": result['missing_count'],
+        "missing_ids": result['missing_ids'],
+    }
 
 
 @router.post("/upload-social-scores")
 async def upload_social_scores(
     file: UploadFile = File(...),
-    session: AsyncSession = Depends(get_session)
+    background: bool = BACKGROUND_QUERY,
+    session: AsyncSession = Depends(get_session),
+    scoring_worker: OverstayScoringWorker = Depends(get_scoring_worker),
+    import_jobs: ImportJobQueue = Depends(get_import_jobs)
 ) -> Dict[str, Any]:
     """
     Upload social score data from "Score Social" Excel file.
-    
+
     Expected file: Excel file with "Data Casos" sheet containing:
     - Episodio / Estadía: Episode identifier to match
     - Puntaje: The social score (can be null)
     - Fecha Asignación: Recorded date (used as recorded_at)
     - Encuestadora: Person who recorded (used as recorded_by)
     - Motivo: Reason if score is null
-    
+
     Returns:
         Dictionary with upload statistics (scores_processed, status, message)
     """
@@ -179,40 +296,69 @@ async def upload_social_scores(
             status_code=400,
             detail="Invalid file type. Please upload an Excel file (.xlsx or .xls)"
         )
-    
-    # Save uploaded file temporarily
+
+    tmp_file_path = None
+    queued = False
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
+        # Save uploaded file temporarily
+        tmp_file_path = await _save_upload(file, '.xlsx')
+        run = partial(_import_social_scores, path=tmp_file_path, scoring_worker=scoring_worker)
+        if background:
+            response = _queue_import(import_jobs, "social-scores", run, file.filename, [tmp_file_path])
+            queued = True
+            return response
+
         # Upload social scores using the ExcelUploader
-        uploader = ExcelUploader(session)
-        result = await uploader.upload_social_scores_from_excel(tmp_file_path)
-        
-        return {
-            "status": "success",
-            "message": f"Successfully processed {result['count']} social score records",
-            "scores_processed": result['count'],
-            "missing_count": result['missing_count'],
-            "missing_ids": result['missing_ids'],
-        }
-    
+        return await run(create_uploader(session))
+
+    except HTTPException:
+        raise
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error uploading social scores: {str(e)}"
         )
-    
+
     finally:
-        # Clean up temporary file
-        Path(tmp_file_path).unlink(missing_ok=True)
+        # Clean up temporary file (queued jobs clean up after themselves)
+        if tmp_file_path and not queued:
+            Path(tmp_file_path).unlink(missing_ok=True)
+
+
+async def _import_grd(
+    uploader: "ExcelUploader", path: str, scoring_worker: OverstayScoringWorker
+) -> Dict[str, Any]:
+    result = await uploader.upload_grd_from_excel(path)
+    # GRD inputs may have changed: re-score affected episodes
+    scoring_worker.wake()
+
+    response = {
+        "status": "success",
+        "message": f"Successfully updated {result['count']} episodes with GRD data",
+        "episodes_updated": result['count'],
+        "missing_count": result['missing_count'],
+        "missing_ids": result['missing_ids'],
+        "grd_not_found_count": result.get('grd_not_found_count', 0),
+        "grd_not_found_ids": result.get('grd_not_found_ids', []),
+    }
+
+    # Add debug info if available
+    if 'sample_db_ids' in result:
+        response['debug_sample_db_ids'] = result['sample_db_ids']
+    if 'sample_file_ids' in result:
+        response['debug_sample_file_ids'] = result['sample_file_ids']
+
+    return response
+
 
 @router.post("/upload-grd")
 async def upload_grd(
     file: UploadFile = File(...),
-    session: AsyncSession = Depends(get_session)
+    background: bool = BACKGROUND_QUERY,
+    session: AsyncSession = Depends(get_session),
+    scoring_worker: OverstayScoringWorker = Depends(get_scoring_worker),
+    import_jobs: ImportJobQueue = Depends(get_import_jobs)
 ) -> Dict[str, Any]:
     """
     Upload GRD predictions from "resultado prediccion" Excel file.
@@ -236,51 +382,55 @@ async def upload_grd(
             status_code=400,
             detail="Invalid file type. Please upload an Excel file (.xlsx, .xls, .xlsm)"
         )
-    
-    # Save uploaded file temporarily
+
+    tmp_file_path = None
+    queued = False
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
+        # Save uploaded file temporarily
+        tmp_file_path = await _save_upload(file, '.xlsx')
+        run = partial(_import_grd, path=tmp_file_path, scoring_worker=scoring_worker)
+        if background:
+            response = _queue_import(import_jobs, "grd", run, file.filename, [tmp_file_path])
+            queued = True
+            return response
+
         # Upload GRD data using the ExcelUploader
-        uploader = ExcelUploader(session)
-        result = await uploader.upload_grd_from_excel(tmp_file_path)
-        
-        response = {
-            "status": "success",
-            "message": f"Successfully updated {result['count']} episodes with GRD data",
-            "episodes_updated": result['count'],
-            "missing_count": result['missing_count'],
-            "missing_ids": result['missing_ids'],
-            "grd_not_found_count": result.get('grd_not_found_count', 0),
-            "grd_not_found_ids": result.get('grd_not_found_ids', []),
-        }
-
-        # Add debug info if available
-        if 'sample_db_ids' in result:
-            response['debug_sample_db_ids'] = result['sample_db_ids']
-        if 'sample_file_ids' in result:
-            response['debug_sample_file_ids'] = result['sample_file_ids']
-
-        return response
-    
+        return await run(create_uploader(session))
+
+    except HTTPException:
+        raise
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error uploading GRD data: {str(e)}"
         )
-    
+
     finally:
-        # Clean up temporary file
-        Path(tmp_file_path).unlink(missing_ok=True)
+        # Clean up temporary file (queued jobs clean up after themselves)
+        if tmp_file_path and not queued:
+            Path(tmp_file_path).unlink(missing_ok=True)
+
+
+async def _import_grd_norms(uploader: "ExcelUploader", path: str) -> Dict[str, Any]:
+    # Works with CSV too
+    result = await uploader.upload_grd_norms_from_excel(path)
+    return {
+        "status": "success",
+        "message": f"Successfully processed {result['count']} GRD norms ({result['created']} created, {result['updated']} updated)",
+        "count": result['count'],
+        "created": result['created'],
+        "updated": result['updated'],
+        "errors": result['errors'],
+    }
 
 
 @router.post("/upload-grd-norms")
 async def upload_grd_norms(
     file: UploadFile = File(...),
-    session: AsyncSession = Depends(get_session)
+    background: bool = BACKGROUND_QUERY,
+    session: AsyncSession = Depends(get_session),
+    import_jobs: ImportJobQueue = Depends(get_import_jobs)
 ) -> Dict[str, Any]:
     """
     Upload GRD norms data from "normas_eeuu" file (Excel or CSV).
@@ -299,27 +449,23 @@ async def upload_grd_norms(
             detail="Invalid file type. Please upload an Excel file (.xlsx, .xls, .xlsm) or CSV file (.csv)"
         )
 
-    # Save uploaded file temporarily
+    tmp_file_path = None
+    queued = False
     try:
         # Determine file extension and use appropriate suffix
         file_ext = '.csv' if file.filename.endswith('.csv') else '.xlsx'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-
-        # Upload GRD norms using the ExcelUploader (works with CSV too)
-        uploader = ExcelUploader(session)
-        result = await uploader.upload_grd_norms_from_excel(tmp_file_path)
-
-        return {
-            "status": "success",
-            "message": f"Successfully processed {result['count']} GRD norms ({result['created']} created, {result['updated']} updated)",
-            "count": result['count'],
-            "created": result['created'],
-            "updated": result['updated'],
-            "errors": result['errors'],
-        }
+        tmp_file_path = await _save_upload(file, file_ext)
+        run = partial(_import_grd_norms, path=tmp_file_path)
+        if background:
+            response = _queue_import(import_jobs, "grd-norms", run, file.filename, [tmp_file_path])
+            queued = True
+            return response
+
+        # Upload GRD norms using the ExcelUploader
+        return await run(create_uploader(session))
+
+    except HTTPException:
+        raise
 
     except Exception as e:
         raise HTTPException(
@@ -328,29 +474,48 @@ async def upload_grd_norms(
         )
 
     finally:
-        # Clean up temporary file
-        Path(tmp_file_path).unlink(missing_ok=True)
+        # Clean up temporary file (queued jobs clean up after themselves)
+        if tmp_file_path and not queued:
+            Path(tmp_file_path).unlink(missing_ok=True)
+
+
+async def _import_all(uploader: "ExcelUploader", beds_path: str, patients_path: str) -> Dict[str, Any]:
+    # Upload beds first
+    beds_created = await uploader.upload_beds_from_excel(beds_path)
+
+    # Then upload patients
+    patients_processed = await uploader.upload_patients_from_excel(patients_path)
+
+    return {
+        "status": "success",
+        "message": "Successfully uploaded all data",
+        "beds_created": beds_created,
+        "patients_processed": patients_processed,
+    }
 
 
 @router.post("/upload-all")
 async def upload_all(
     beds_file: UploadFile = File(..., description="Camas NWP1 Excel file"),
     patients_file: UploadFile = File(..., description="Score Social Excel file"),
-    session: AsyncSession = Depends(get_session)
+    background: bool = BACKGROUND_QUERY,
+    session: AsyncSession = Depends(get_session),
+    import_jobs: ImportJobQueue = Depends(get_import_jobs)
 ) -> Dict[str, Any]:
     """
     Upload both bed and patient data from two Excel files.
-    
+
     Args:
         beds_file: Excel file with "Camas" sheet for bed data
         patients_file: Excel file with "Data Casos" sheet for patient data
-    
+
     Returns:
         Dictionary with complete upload statistics
     """
     beds_tmp_path = None
     patients_tmp_path = None
-    
+    queued = False
+
     try:
         # Validate file types
         if not beds_file.filename.endswith(('.xlsx', '.xls')):
@@ -358,50 +523,41 @@ async def upload_all(
                 status_code=400,
                 detail="Invalid beds file type. Please upload an Excel file (.xlsx or .xls)"
             )
-        
+
         if not patients_file.filename.endswith(('.xlsx', '.xls')):
             raise HTTPException(
                 status_code=400,
                 detail="Invalid patients file type. Please upload an Excel file (.xlsx or .xls)"
             )
-        
-        # Save beds file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await beds_file.read()
-            tmp_file.write(content)
-            beds_tmp_path = tmp_file.name
-        
-        # Save patients file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await patients_file.read()
-            tmp_file.write(content)
-            patients_tmp_path = tmp_file.name
-        
+
+        # Save both files temporarily
+        beds_tmp_path = await _save_upload(beds_file, '.xlsx')
+        patients_tmp_path = await _save_upload(patients_file, '.xlsx')
+
+        run = partial(_import_all, beds_path=beds_tmp_path, patients_path=patients_tmp_path)
+        if background:
+            response = _queue_import(
+                import_jobs, "all", run, patients_file.filename, [beds_tmp_path, patients_tmp_path]
+            )
+            queued = True
+            return response
+
         # Upload data using the ExcelUploader
-        uploader = ExcelUploader(session)
-        
-        # Upload beds first
-        beds_created = await uploader.upload_beds_from_excel(beds_tmp_path)
-        
-        # Then upload patients
-        patients_processed = await uploader.upload_patients_from_excel(patients_tmp_path)
-        
-        return {
-            "status": "success",
-            "message": "Successfully uploaded all data",
-            "beds_created": beds_created,
-            "patients_processed": patients_processed,
-        }
-    
+        return await run(create_uploader(session))
+
+    except HTTPException:
+        raise
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error uploading data: {str(e)}"
         )
-    
+
     finally:
-        # Clean up temporary files
-        if beds_tmp_path:
-            Path(beds_tmp_path).unlink(missing_ok=True)
-        if patients_tmp_path:
-            Path(patients_tmp_path).unlink(missing_ok=True)
+        # Clean up temporary files (queued jobs clean up after themselves)
+        if not queued:
+            if beds_tmp_path:
+                Path(beds_tmp_path).unlink(missing_ok=True)
+            if patients_tmp_path:
+                Path(patients_tmp_path).unlink(missing_ok=True)
@@ -0,0 +1,48 @@
+"""
+Health endpoints for monitoring.
+"""
+
+import time
+from typing import Any, Dict
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.config import settings
+from app.db import MAX_OVERFLOW, engine, pool_status
+
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/db")
+async def get_db_health() -> JSONResponse:
+    """
+    Check database connectivity and report connection pool usage.
+
+    ``checked_out`` close to ``size + max_overflow`` means requests are
+    about to wait for a connection (and time out after ``pool_timeout``).
+
+    Returns:
+        200 with pool stats and the round-trip latency, or 503 when the
+        database cannot be reached
+    """
+    body: Dict[str, Any] = {"status": "ok"}
+    started = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        body["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        status_code = 200
+    except Exception as e:
+        body["status"] = "unavailable"
+        body["error"] = str(e)
+        status_code = 503
+
+    body["pool"] = {
+        **pool_status(),
+        "max_overflow": MAX_OVERFLOW,
+        "timeout_seconds": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+    return JSONResponse(status_code=status_code, content=body)
@@ -3,7 +3,7 @@ from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Depends, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.deps import get_session
@@ -80,11 +80,9 @@ async def get_all_tasks(
         except ValueError:
             pass  # Invalid status, ignore filter
     elif open_only:
+        # Same predicate as the partial index ix_task_instances_open_due_date
         query = query.where(
-            or_(
-                TaskInstanceModel.status == TaskStatus.PENDING,
-                TaskInstanceModel.status == TaskStatus.IN_PROGRESS
-            )
+            TaskInstanceModel.status.in_([TaskStatus.PENDING, TaskStatus.IN_PROGRESS])
         )
     
     # Filter by assigned worker
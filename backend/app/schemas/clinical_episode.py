@@ -118,10 +118,13 @@ class EpisodeHistory(BaseModel):
 class PaginatedClinicalEpisodes(BaseModel):
     """Schema for paginated clinical episodes response"""
     data: list[ClinicalEpisode | ClinicalEpisodeWithPatient | ClinicalEpisodeWithIncludes]
-    total: int
+    # None when the request asked to skip counting (include_total=false)
+    total: Optional[int]
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    # Pass as ``cursor`` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -160,5 +163,6 @@ class DashboardStatsResponse(BaseModel):
     lowSocialRisk: int
     averageStayDays: int
     deviations: int
+    snapshotAgeSeconds: float = 0.0  # age of the cached snapshot these stats come from
     
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
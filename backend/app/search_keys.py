@@ -0,0 +1,33 @@
+"""
+Accent- and case-folded search keys.
+
+Patient names and bed rooms are searched through ``search_name`` /
+``search_room`` columns holding these keys, computed once when the row is
+written, so "Muñoz" and "MUNOZ" both match "munoz" without transforming
+every row at query time. Search strings are folded the same way.
+"""
+
+import re
+import unicodedata
+from typing import Any, Optional
+
+
+def fold_search_key(value: Any) -> str:
+    """
+    Fold text for matching: remove accents and punctuation, collapse
+    whitespace, lower-case. ``None`` folds to "".
+    """
+    if value is None:
+        return ""
+    s = str(value).replace("\xa0", " ")
+    s = unicodedata.normalize("NFKD", s)
+    # remove diacritics
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    # keep alphanumerics and spaces
+    s = re.sub(r"[^0-9A-Za-z\s]", " ", s)
+    return re.sub(r"\s+", " ", s).strip().lower()
+
+
+def patient_search_name(first_name: Optional[str], last_name: Optional[str]) -> str:
+    """Search key for a patient: folded "first last"."""
+    return fold_search_key(f"{first_name or ''} {last_name or ''}")
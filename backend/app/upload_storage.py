@@ -0,0 +1,87 @@
+"""
+Streaming copy of uploaded files to disk.
+
+``await file.read()`` pulls the whole request body into memory, so a handful
+of concurrent large uploads multiplied the process' resident memory.
+``save_upload`` copies the upload in fixed-size chunks instead, hashing it as
+it goes and rejecting it (413 by default) as soon as it grows past the size
+limit, so at most one chunk per upload is held in memory.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+@dataclass
+class SavedUpload:
+    """An upload written to disk."""
+
+    path: Path
+    size: int
+    sha256: str
+
+
+def _too_large(max_size: int, status_code: int) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail=f"File too large. Maximum size is {max_size // (1024 * 1024)}MB",
+    )
+
+
+async def save_upload(
+    file: UploadFile,
+    dest: str | Path,
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    too_large_status: int = 413,
+) -> SavedUpload:
+    """
+    Stream an uploaded file to ``dest``.
+
+    Args:
+        file: The uploaded file
+        dest: Path the content is written to (created or truncated)
+        max_size: Maximum accepted size in bytes
+        chunk_size: Bytes read and written per step
+        too_large_status: Status code of the size error (endpoints that
+            answered 400 before streaming keep doing so)
+
+    Returns:
+        SavedUpload with the path, size and SHA-256 hex digest
+
+    Raises:
+        HTTPException: ``too_large_status`` when the upload is larger than
+            ``max_size``. On any failure ``dest`` is removed, including a
+            placeholder the caller created (e.g. a NamedTemporaryFile)
+    """
+    dest = Path(dest)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        # Reject early when the multipart part already declares its size
+        if file.size is not None and file.size > max_size:
+            raise _too_large(max_size, too_large_status)
+
+        with open(dest, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_size:
+                    raise _too_large(max_size, too_large_status)
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+
+    saved = SavedUpload(path=dest, size=size, sha256=digest.hexdigest())
+    logger.info(f"Saved upload {file.filename!r} ({size} bytes, sha256 {saved.sha256})")
+    return saved
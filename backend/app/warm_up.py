@@ -0,0 +1,40 @@
+"""
+Deferred loading of the heavy dependencies.
+
+pandas, numpy, openpyxl and CatBoost are only needed by the Excel imports and
+overstay scoring, so no module imports them at startup. The lifespan calls
+``warm_up`` in a worker thread instead: by default in the background, so the
+worker accepts requests right away and the first import or scoring request
+usually finds everything already loaded.
+"""
+
+import importlib
+import logging
+import time
+
+from app.overstay_model import OverstayModelRegistry
+
+logger = logging.getLogger(__name__)
+
+# Loaded ahead of first use (app.excel_uploader pulls in pandas and openpyxl)
+WARM_UP_MODULES = ("numpy", "pandas", "openpyxl", "app.excel_uploader", "app.workbook_loader")
+
+
+def warm_up(registry: OverstayModelRegistry) -> float:
+    """
+    Import the heavy modules and load the overstay model.
+
+    Returns:
+        Seconds spent
+    """
+    started = time.perf_counter()
+    for name in WARM_UP_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.warning(f"Warm-up could not import {name}: {e}")
+    # Deserialize the model once so it never happens inside a request
+    registry.load()
+    elapsed = time.perf_counter() - started
+    logger.info(f"Warm-up finished in {elapsed:.2f}s")
+    return elapsed
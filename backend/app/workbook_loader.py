@@ -0,0 +1,133 @@
+"""
+Single-pass workbook loading for the Excel importers.
+
+``pd.read_excel`` re-opens and re-parses the whole file on every call, and
+the importers used to call it twice per sheet (once with ``header=None`` to
+find the header row, once more with it) plus once per extra sheet.
+``WorkbookLoader`` opens the file once with openpyxl in read-only mode,
+streams each sheet's rows, finds the header row while streaming and builds
+the DataFrame with the same parser ``pd.read_excel`` uses, so the resulting
+frames (dtypes included) match what the importers got before.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+
+logger = logging.getLogger(__name__)
+
+
+def _convert_cell(cell) -> Any:
+    """Cell value as ``pd.read_excel`` sees it (blank -> "", errors -> NaN, 2.0 -> 2)."""
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        as_int = int(cell.value)
+        return as_int if as_int == cell.value else float(cell.value)
+    return cell.value
+
+
+def detect_header_row(
+    rows: Sequence[Sequence[Any]], tokens: Sequence[str], min_tokens: int
+) -> Optional[int]:
+    """
+    Index of the first row containing at least ``min_tokens`` of ``tokens``.
+
+    Cells are matched case-insensitively by substring, so "Fecha Inicio:"
+    counts for both "fecha" and "inicio".
+    """
+    for i, row in enumerate(rows):
+        cells = [str(cell).lower() for cell in row if cell is not None and cell == cell]
+        found = {t for t in tokens for cell in cells if t in cell}
+        if len(found) >= min_tokens:
+            return i
+    return None
+
+
+class WorkbookLoader:
+    """
+    Opens an .xlsx/.xlsm workbook once and serves its sheets as DataFrames.
+
+    Use as a context manager (or call ``close()``) to release the file.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._workbook = openpyxl.load_workbook(
+            self.path, read_only=True, data_only=True, keep_links=False
+        )
+
+    def __enter__(self) -> "WorkbookLoader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._workbook.close()
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return list(self._workbook.sheetnames)
+
+    def iter_rows(self, sheet_name: str) -> Iterator[list[Any]]:
+        """Stream converted rows of a sheet, trailing blank cells trimmed."""
+        if sheet_name not in self._workbook.sheetnames:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        sheet = self._workbook[sheet_name]
+        # Read-only sheets may carry stale dimensions; scan the real extent
+        sheet.reset_dimensions()
+        for row in sheet.rows:
+            values = [_convert_cell(cell) for cell in row]
+            while values and values[-1] == "":
+                values.pop()
+            yield values
+
+    def read_sheet(
+        self,
+        sheet_name: Optional[str] = None,
+        header_tokens: Sequence[str] = (),
+        min_tokens: int = 1,
+        max_scan: int = 20,
+    ) -> pd.DataFrame:
+        """
+        Read one sheet in a single pass.
+
+        Args:
+            sheet_name: Sheet to read (default: the first one)
+            header_tokens: Words identifying the header row; without them row 0 is the header
+            min_tokens: How many distinct tokens the header row must contain
+            max_scan: Only the first ``max_scan`` rows are considered for the header
+
+        Returns:
+            DataFrame equivalent to ``pd.read_excel(path, sheet_name, header=<detected row>)``
+        """
+        sheet_name = sheet_name or self.sheet_names[0]
+        data = list(self.iter_rows(sheet_name))
+
+        # Trim trailing blank rows and pad the rest to a common width
+        while data and not data[-1]:
+            data.pop()
+        if not data:
+            return pd.DataFrame()
+        width = max(len(row) for row in data)
+        data = [row + [""] * (width - len(row)) for row in data]
+
+        header = 0
+        if header_tokens:
+            detected = detect_header_row(data[:max_scan], header_tokens, min_tokens)
+            if detected is None:
+                logger.info(f"Could not detect header row in '{sheet_name}'; using row 0")
+            else:
+                logger.info(f"Detected header row at index {detected} in '{sheet_name}'")
+                header = detected
+
+        return TextParser(data, header=header, skip_blank_lines=False).read()
@@ -9,5 +9,6 @@ alembic upgrade head
 # python -m scripts.database_functions seed
 
 echo "Starting FastAPI application..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+# One worker by default; see scripts/serve.py before raising WEB_CONCURRENCY
+exec python -m scripts.serve
 
@@ -0,0 +1,75 @@
+# bench_startup.py
+"""
+Startup-time benchmark for the API.
+
+Measures, in fresh interpreters (nothing cached in sys.modules):
+- import: ``import app.main``
+- ready: import plus the lifespan startup, i.e. until a worker accepts requests
+- warm-up: the deferred loading of pandas/openpyxl and the model
+
+and lists which heavy modules were loaded by the import alone.
+
+Usage:
+    python -m scripts.bench_startup [--runs 5]
+
+Needs DATABASE_URL set (no connection is opened) and is run from backend/.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "catboost", "app.excel_uploader")
+
+# Runs in a child interpreter and prints one JSON line
+_PROBE = r"""
+import asyncio, json, sys, time
+
+t0 = time.perf_counter()
+import app.main
+t_import = time.perf_counter() - t0
+loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+
+from app.config import settings
+settings.OVERSTAY_WORKER_ENABLED = False
+from app.deps import lifespan
+
+async def startup():
+    async with lifespan(app.main.app):
+        t_ready = time.perf_counter() - t0
+        warm_up = await app.main.app.state.warm_up
+    return t_ready, warm_up
+
+t_ready, t_warm_up = asyncio.run(startup())
+print(json.dumps({"import": t_import, "ready": t_ready, "warm_up": t_warm_up, "loaded": loaded}))
+"""
+
+
+def run_probe() -> dict:
+    code = f"HEAVY_MODULES = {HEAVY_MODULES!r}\n{_PROBE}"
+    env = {**os.environ, "OVERSTAY_WORKER_ENABLED": "false"}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    for key in ("import", "ready", "warm_up"):
+        values = [s[key] for s in samples]
+        print(
+            f"{key:>8}: median {statistics.median(values):.3f}s  "
+            f"min {min(values):.3f}s  max {max(values):.3f}s"
+        )
+    print(f"heavy modules loaded by import: {', '.join(samples[0]['loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
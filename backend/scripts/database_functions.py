@@ -43,6 +43,7 @@ from app.models.clinical_episode_information import ClinicalEpisodeInformation,
 from app.models.task_instance import TaskInstance, TaskStatus
 from app.models.task_status_history import TaskStatusHistory
 from app.models.social_score_history import SocialScoreHistory
+from app.latest_social_score import refresh_latest_social_scores
 
 
 # Sample data - Enhanced for comprehensive search testing
@@ -884,6 +885,7 @@ async def seed_social_scores(session: AsyncSession, episodes: List[ClinicalEpiso
                 session.add(third_score)
                 scores.append(third_score)
     
+    await refresh_latest_social_scores(session, [episode.id for episode in episodes])
     await session.commit()
     
     # Count episodes with multiple scores
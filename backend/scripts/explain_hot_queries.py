@@ -0,0 +1,191 @@
+# explain_hot_queries.py
+"""
+EXPLAIN ANALYZE the hot read queries with and without the hot-path indexes.
+
+Everything runs inside one transaction that is rolled back at the end:
+synthetic rows are inserted (optional), the tables are ANALYZEd, and each query
+is explained once with the indexes from migration m0b1c2d3e4f5 dropped (in a
+savepoint) and once with them in place. The output shows the plan shape and
+execution time of both runs, e.g.
+
+    alerts: active, newest first (GET /alerts)
+      without: Limit > Sort > Seq Scan on alerts                              41.2 ms
+      with:    Limit > Index Scan using ix_alerts_active_created_at            0.3 ms
+
+DROP INDEX holds an exclusive lock on the table until the rollback, so run
+this against a development or staging database, not production.
+
+Usage:
+    python -m scripts.explain_hot_queries [--seed 50000]
+"""
+import argparse
+import asyncio
+import json
+from typing import Any
+
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.db import engine
+from app.models.alert import Alert, AlertType
+from app.models.clinical_episode import ClinicalEpisode, EpisodeStatus
+from app.models.social_score_history import SocialScoreHistory
+from app.models.task_instance import TaskInstance, TaskStatus
+
+HOT_PATH_INDEXES = (
+    "ix_clinical_episodes_admission_at_id",
+    "ix_clinical_episodes_overstay_rank",
+    "ix_clinical_episodes_active_admission_at",
+    "ix_alerts_active_created_at",
+    "ix_alerts_active_type_created_at",
+    "ix_alerts_episode_id_created_at",
+    "ix_task_instances_open_due_date",
+    "ix_task_instances_episode_id_due_date",
+    "ix_social_score_history_episode_id_recorded_at",
+)
+
+# One patient per episode; a third of the episodes active, most scored, a few
+# alerts, tasks and social scores per episode
+SEED_SQL = """
+WITH p AS (
+    INSERT INTO patients (id, medical_identifier, first_name, last_name, rut, birth_date, gender, search_name)
+    SELECT gen_random_uuid(), 'bench-' || g, 'Bench', 'Patient ' || g, '1-9', DATE '1960-01-01', 'F', 'bench patient ' || g
+    FROM generate_series(1, :n) g
+    RETURNING id
+), e AS (
+    INSERT INTO clinical_episodes (id, patient_id, status, admission_at, overstay_probability)
+    SELECT gen_random_uuid(), id,
+           CASE WHEN random() < 0.33 THEN 'ACTIVE' ELSE 'DISCHARGED' END::episodestatus,
+           now() - random() * interval '730 days',
+           CASE WHEN random() < 0.9 THEN random() END
+    FROM p
+    RETURNING id
+), a AS (
+    INSERT INTO alerts (id, episode_id, alert_type, severity, message, is_active)
+    SELECT gen_random_uuid(), e.id,
+           (ARRAY['stay-deviation', 'social-risk', 'predicted-overstay'])[1 + (random() * 2)::int]::alerttype,
+           'medium'::alertseverity, 'bench', random() < 0.1
+    FROM e, generate_series(1, 2)
+), t AS (
+    INSERT INTO task_instances (id, episode_id, title, priority, status, due_date)
+    SELECT gen_random_uuid(), e.id, 'bench', (random() * 3)::int,
+           CASE WHEN random() < 0.1 THEN 'PENDING' ELSE 'COMPLETED' END::taskstatus,
+           CURRENT_DATE + (random() * 60)::int
+    FROM e, generate_series(1, 3)
+)
+INSERT INTO social_score_history (id, episode_id, score, recorded_at)
+SELECT gen_random_uuid(), e.id, (random() * 10)::int, now() - random() * interval '365 days'
+FROM e, generate_series(1, 3)
+"""
+
+
+def hot_queries(episode_ids: list) -> dict[str, Any]:
+    """The statements behind the hot endpoints, as the routers build them."""
+    latest = (
+        select(SocialScoreHistory.episode_id, func.max(SocialScoreHistory.recorded_at))
+        .where(SocialScoreHistory.episode_id.in_(episode_ids))
+        .group_by(SocialScoreHistory.episode_id)
+    )
+    return {
+        "episodes: newest first (GET /clinical-episodes/)": select(ClinicalEpisode.id)
+            .order_by(ClinicalEpisode.admission_at.desc(), ClinicalEpisode.id.desc())
+            .limit(50),
+        "episodes: by risk (sort_by_overstay_probability)": select(ClinicalEpisode.id)
+            .order_by(
+                ClinicalEpisode.overstay_probability.desc().nulls_last(),
+                ClinicalEpisode.admission_at.desc(),
+                ClinicalEpisode.id.desc(),
+            )
+            .limit(50),
+        "episodes: active, unscored (scoring worker)": select(ClinicalEpisode.id)
+            .where(and_(
+                ClinicalEpisode.status == EpisodeStatus.ACTIVE,
+                ClinicalEpisode.overstay_probability.is_(None),
+            ))
+            .order_by(ClinicalEpisode.admission_at.desc())
+            .limit(500),
+        "alerts: active, newest first (GET /alerts)": select(Alert.id)
+            .where(Alert.is_active)
+            .order_by(Alert.created_at.desc())
+            .limit(1000),
+        "alerts: active of one type": select(Alert.id)
+            .where(Alert.is_active, Alert.alert_type == AlertType.SOCIAL_RISK)
+            .order_by(Alert.created_at.desc())
+            .limit(1000),
+        "tasks: open, by due date (GET /task-instances)": select(TaskInstance.id)
+            .where(TaskInstance.status.in_([TaskStatus.PENDING, TaskStatus.IN_PROGRESS]))
+            .order_by(
+                TaskInstance.due_date.asc().nulls_last(),
+                TaskInstance.priority.desc(),
+                TaskInstance.created_at.desc(),
+            ),
+        "social scores: latest per listed episode": latest,
+    }
+
+
+def plan_shape(plan: dict) -> str:
+    """Main chain of plan nodes, e.g. 'Limit > Sort > Seq Scan on alerts'."""
+    parts = []
+    node = plan
+    while node:
+        label = node["Node Type"]
+        if "Index Name" in node:
+            label += f" using {node['Index Name']}"
+        elif "Relation Name" in node:
+            label += f" on {node['Relation Name']}"
+        parts.append(label)
+        children = node.get("Plans") or []
+        node = children[0] if children else None
+    return " > ".join(parts)
+
+
+async def explain(conn, statement) -> tuple[str, float]:
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    result = await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"))
+    raw = result.scalar()
+    report = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    return plan_shape(report["Plan"]), report["Execution Time"]
+
+
+async def run(seed: int) -> None:
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            if seed:
+                await conn.execute(text(SEED_SQL), {"n": seed})
+                print(f"Seeded {seed} synthetic episodes (rolled back at the end)")
+            for table in ("clinical_episodes", "alerts", "task_instances", "social_score_history"):
+                await conn.execute(text(f"ANALYZE {table}"))
+
+            episode_ids = (await conn.execute(
+                select(ClinicalEpisode.id).order_by(ClinicalEpisode.admission_at.desc()).limit(50)
+            )).scalars().all()
+
+            for name, statement in hot_queries(list(episode_ids)).items():
+                savepoint = await conn.begin_nested()
+                for index in HOT_PATH_INDEXES:
+                    await conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+                without = await explain(conn, statement)
+                await savepoint.rollback()
+                with_indexes = await explain(conn, statement)
+
+                print(f"\n{name}")
+                print(f"  without: {without[0]:<70} {without[1]:8.1f} ms")
+                print(f"  with:    {with_indexes[0]:<70} {with_indexes[1]:8.1f} ms")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Insert this many synthetic episodes (with alerts, tasks and scores) first",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# serve.py
+"""
+Production launcher for the API (uvicorn).
+
+Runs a single worker process unless WEB_CONCURRENCY asks for more. Several
+workers only suit deployments that do not rely on per-process state:
+
+- Background import jobs (app.import_jobs) live in the memory of the worker
+  that accepted the upload, so a status poll that reaches another worker
+  answers 404.
+- The dashboard snapshot (app.dashboard_snapshot) is invalidated only in the
+  worker that handled the write; the others keep serving stale stats until
+  their snapshot expires.
+
+Keep one worker until that state is shared (e.g. in the database), or route
+clients with sticky sessions.
+
+Each worker is a separate process with its own event loop, DB pool, model
+and background tasks. Workers are started with ``spawn`` by uvicorn, so
+nothing is shared before fork: each worker loads pandas and the CatBoost
+model in its lifespan warm-up (before accepting requests when
+WARM_UP_IN_BACKGROUND=false).
+
+Environment:
+    WEB_CONCURRENCY: worker processes (default: 1, see above)
+    HOST / PORT: bind address (default 0.0.0.0:8000)
+    GRACEFUL_SHUTDOWN_SECONDS: time given to in-flight requests on shutdown
+    DB_CONNECTION_BUDGET: total DB connections, split across the workers
+"""
+import os
+
+
+def main():
+    import uvicorn
+
+    workers = max(1, int(os.environ.get("WEB_CONCURRENCY") or 1))
+    # Workers read it back through Settings to size their DB pool
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "app.main:app",
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8000")),
+        workers=workers,
+        proxy_headers=True,
+        timeout_graceful_shutdown=int(os.environ.get("GRACEFUL_SHUTDOWN_SECONDS", "30")),
+    )
+
+
+if __name__ == "__main__":
+    main()
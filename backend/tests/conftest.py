@@ -5,6 +5,7 @@ import os
 import pytest
 import pytest_asyncio
 from typing import AsyncGenerator
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from httpx import AsyncClient, ASGITransport
 
@@ -31,8 +32,9 @@ async def test_engine():
         poolclass=None  # Disable pooling for tests to avoid connection issues
     )
     
-    # Create all tables
+    # Create all tables (the search indexes need pg_trgm)
     async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
     
     yield engine
@@ -108,6 +108,36 @@ class TestListClinicalEpisodes:
         data = response.json()
         assert data["total"] == 1
     
+    async def test_list_episodes_search_ignores_accents(self, client, test_session):
+        """Test search matches names regardless of accents and case."""
+        patient1 = await create_test_patient(test_session, "MED001", "José", "Muñoz")
+        patient2 = await create_test_patient(test_session, "MED002", "Jane", "Smith")
+        await create_test_clinical_episode(test_session, patient1.id)
+        await create_test_clinical_episode(test_session, patient2.id)
+        await test_session.commit()
+        
+        for search in ("munoz", "JOSE MUÑOZ", "Muñ"):
+            response = await client.get("/clinical-episodes/", params={"search": search})
+            assert response.status_code == 200
+            assert response.json()["total"] == 1
+    
+    async def test_list_episodes_search_ranks_closest_name_first(self, client, test_session):
+        """Test multi-word search ranks by trigram similarity to the full name."""
+        closest = await create_test_patient(test_session, "MED001", "Maria", "Garcia Lopez")
+        partial = await create_test_patient(test_session, "MED002", "Maria Jose", "Lopez Garcia")
+        await create_test_clinical_episode(test_session, partial.id)
+        await create_test_clinical_episode(test_session, closest.id)
+        await test_session.commit()
+        
+        response = await client.get(
+            "/clinical-episodes/", params={"search": "Maria Garcia", "include": "patient"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["data"][0]["patient"]["last_name"] == "Garcia Lopez"
+    
     async def test_list_episodes_with_include_patient(self, client, test_session):
         """Test including patient data in response."""
         patient = await create_test_patient(test_session, "MED001", "John", "Doe")
@@ -140,6 +170,66 @@ class TestListClinicalEpisodes:
         
         assert response.status_code == 400
         assert "Page size must be between 1 and 100" in response.json()["detail"]
+    
+    async def test_list_episodes_with_cursor(self, client, test_session):
+        """Test keyset pagination walks every episode once, newest first."""
+        from datetime import timedelta, timezone
+        patient = await create_test_patient(test_session, "MED001", "John", "Doe")
+        admitted = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        # Two episodes share an admission time to exercise the id tie-breaker
+        offsets = [0, 1, 1, 2, 3]
+        for days in offsets:
+            await create_test_clinical_episode(
+                test_session, patient.id, admission_at=admitted + timedelta(days=days)
+            )
+        await test_session.commit()
+        
+        seen = []
+        params = {"page_size": 2, "include_total": "false"}
+        while True:
+            response = await client.get("/clinical-episodes/", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] is None
+            seen.extend(data["data"])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+        
+        assert len({e["id"] for e in seen}) == 5
+        admissions = [e["admission_at"] for e in seen]
+        assert admissions == sorted(admissions, reverse=True)
+    
+    async def test_list_episodes_with_cursor_by_overstay_probability(self, client, test_session):
+        """Test keyset pagination for the risk sort keeps unscored episodes last."""
+        patient = await create_test_patient(test_session, "MED001", "John", "Doe")
+        for probability in [0.2, None, 0.9, 0.5, None]:
+            episode = await create_test_clinical_episode(test_session, patient.id)
+            episode.overstay_probability = probability
+        await test_session.commit()
+        
+        probabilities = []
+        params = {"page_size": 2, "sort_by_overstay_probability": "true"}
+        while True:
+            data = (await client.get("/clinical-episodes/", params=params)).json()
+            assert data["total"] == 5
+            probabilities.extend(e["overstay_probability"] for e in data["data"])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+        
+        assert probabilities == [0.9, 0.5, 0.2, None, None]
+    
+    async def test_list_episodes_invalid_cursor(self, client):
+        """Test malformed cursors and cursors with search relevance are rejected."""
+        response = await client.get("/clinical-episodes/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+        
+        response = await client.get(
+            "/clinical-episodes/", params={"cursor": "not-a-cursor", "search": "John"}
+        )
+        assert response.status_code == 400
+        assert "relevance" in response.json()["detail"]
 
 
 class TestGetClinicalEpisode:
@@ -175,6 +265,34 @@ class TestGetClinicalEpisode:
         assert "patient" in data
         assert data["patient"]["first_name"] == "John"
     
+    async def test_get_episode_with_include_social_score(self, client, test_session):
+        """Test the latest social score pointer follows the most recent record."""
+        from datetime import timedelta, timezone
+        from app.models.social_score_history import SocialScoreHistory
+        from app.latest_social_score import refresh_latest_social_scores
+        
+        now = datetime.now(timezone.utc)
+        patient = await create_test_patient(test_session, "MED001", "John", "Doe")
+        episode = await create_test_clinical_episode(test_session, patient.id)
+        latest = SocialScoreHistory(episode_id=episode.id, score=12, recorded_at=now)
+        # Recorded later but dated earlier (e.g. a backfilled assessment)
+        older = SocialScoreHistory(episode_id=episode.id, score=3, recorded_at=now - timedelta(days=5))
+        for score in (latest, older):
+            test_session.add(score)
+            await test_session.flush()
+            await refresh_latest_social_scores(test_session, [episode.id])
+        await test_session.commit()
+        
+        response = await client.get(
+            f"/clinical-episodes/{episode.id}",
+            params={"include": "social_score"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["latest_social_score"]["id"] == str(latest.id)
+        assert data["latest_social_score"]["score"] == 12
+    
     async def test_get_episode_not_found(self, client):
         """Test getting a non-existent episode."""
         fake_id = uuid4()
@@ -223,3 +341,79 @@ class TestGetEpisodeHistory:
         
         assert response.status_code == 422
 
+
+
+class TestDashboardStats:
+    """Tests for GET /clinical-episodes/dashboard/stats endpoint."""
+    
+    @pytest.fixture(autouse=True)
+    def fresh_snapshot(self):
+        """Data is written straight to the session, so drop any cached snapshot."""
+        from app.dashboard_snapshot import dashboard_snapshot
+        dashboard_snapshot.invalidate()
+    
+    async def test_dashboard_stats_empty(self, client):
+        """Test stats when there are no open episodes."""
+        response = await client.get("/clinical-episodes/dashboard/stats")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["totalPatients"] == 0
+        assert data["averageStayDays"] == 0
+        assert data["lowRisk"] == 0
+    
+    async def test_dashboard_stats_buckets(self, client, test_session):
+        """Test risk, social risk, stay and deviation buckets."""
+        from datetime import timedelta, timezone
+        from app.models.clinical_episode import EpisodeStatus
+        from app.models.social_score_history import SocialScoreHistory
+        from app.latest_social_score import refresh_latest_social_scores
+        
+        now = datetime.now(timezone.utc)
+        patient = await create_test_patient(test_session, "MED001", "John", "Doe")
+        high = await create_test_clinical_episode(test_session, patient.id, admission_at=now - timedelta(days=10))
+        medium = await create_test_clinical_episode(test_session, patient.id, admission_at=now - timedelta(days=2))
+        await create_test_clinical_episode(test_session, patient.id, admission_at=now)
+        await create_test_clinical_episode(test_session, patient.id, status=EpisodeStatus.DISCHARGED)
+        high.overstay_probability = 0.9
+        high.grd_expected_days = 5
+        medium.overstay_probability = 0.6
+        medium.grd_expected_days = 5
+        # Only the latest score of each episode counts
+        test_session.add_all([
+            SocialScoreHistory(episode_id=high.id, score=12, recorded_at=now - timedelta(days=1)),
+            SocialScoreHistory(episode_id=high.id, score=3, recorded_at=now),
+            SocialScoreHistory(episode_id=medium.id, score=8, recorded_at=now),
+        ])
+        await refresh_latest_social_scores(test_session)
+        await test_session.commit()
+        
+        response = await client.get("/clinical-episodes/dashboard/stats")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data.pop("snapshotAgeSeconds") == 0.0
+        assert data == {
+            "totalPatients": 3,
+            "highRisk": 1,
+            "mediumRisk": 1,
+            "lowRisk": 1,
+            "highSocialRisk": 0,
+            "mediumSocialRisk": 1,
+            "lowSocialRisk": 1,
+            "averageStayDays": 4,
+            "deviations": 1,
+        }
+    
+    async def test_dashboard_stats_served_from_snapshot(self, client, test_session):
+        """Test repeated reads reuse the snapshot until it is invalidated."""
+        from app.dashboard_snapshot import dashboard_snapshot
+        
+        assert (await client.get("/clinical-episodes/dashboard/stats")).json()["totalPatients"] == 0
+        patient = await create_test_patient(test_session, "MED001", "John", "Doe")
+        await create_test_clinical_episode(test_session, patient.id)
+        await test_session.commit()
+        
+        assert (await client.get("/clinical-episodes/dashboard/stats")).json()["totalPatients"] == 0
+        dashboard_snapshot.invalidate()
+        assert (await client.get("/clinical-episodes/dashboard/stats")).json()["totalPatients"] == 1
@@ -0,0 +1,56 @@
+"""
+Tests for the in-process dashboard snapshot cache.
+"""
+import asyncio
+
+from app.dashboard_snapshot import DashboardSnapshot
+
+
+async def test_concurrent_reads_compute_once():
+    snapshot = DashboardSnapshot(ttl=60)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"totalPatients": calls}
+
+    results = await asyncio.gather(*(snapshot.get(compute) for _ in range(20)))
+
+    assert calls == 1
+    assert all(value == {"totalPatients": 1} for value, _ in results)
+    value, age = await snapshot.get(compute)
+    assert calls == 1
+    assert age > 0
+
+
+async def test_invalidate_and_expiry_force_recompute():
+    snapshot = DashboardSnapshot(ttl=60)
+    values = iter(range(10))
+
+    async def compute():
+        return next(values)
+
+    assert (await snapshot.get(compute))[0] == 0
+    assert (await snapshot.get(compute))[0] == 0
+    snapshot.invalidate()
+    assert (await snapshot.get(compute))[0] == 1
+
+    snapshot.ttl = 0
+    assert (await snapshot.get(compute))[0] == 2
+
+
+async def test_refresh_racing_an_invalidation_is_not_kept():
+    snapshot = DashboardSnapshot(ttl=60)
+    values = iter(range(10))
+
+    async def compute():
+        value = next(values)
+        if value == 0:
+            # A write lands while the first refresh is still running
+            snapshot.invalidate()
+        return value
+
+    assert (await snapshot.get(compute))[0] == 0
+    assert (await snapshot.get(compute))[0] == 1
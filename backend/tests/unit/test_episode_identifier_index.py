@@ -0,0 +1,69 @@
+from uuid import uuid4
+
+from app.episode_identifier_index import (
+    MATCH_AFFIX,
+    MATCH_EXACT,
+    MATCH_FOLDED,
+    MATCH_NUMERIC_CORE,
+    EpisodeIdentifierIndex,
+    normalize_identifier,
+    numeric_core,
+)
+
+
+def test_normalize_identifier_and_numeric_core():
+    assert normalize_identifier(" 1001.0 ") == "1001"
+    assert numeric_core("EP-000123") == "123"
+    assert numeric_core("ABC") is None
+
+
+def test_get_matches_exact_normalized_and_numeric_core_keys():
+    first, second = uuid4(), uuid4()
+    index = EpisodeIdentifierIndex()
+    index.add("1001", first)
+    index.add("ep 2002", second)
+    # The first episode registered for an identifier wins
+    index.add("1001", uuid4())
+
+    assert index.get(1001.0) == first
+    assert index.get("EP2002") == second
+    assert index.get("EP-1001") == first
+    assert index.get("9999") is None
+    assert len(index) == 2
+
+
+def test_ambiguous_numeric_core_does_not_resolve():
+    index = EpisodeIdentifierIndex()
+    index.add("A-500", uuid4())
+    index.add("B-500", uuid4())
+
+    assert index.get("500") is None
+
+
+def test_resolve_falls_back_to_unique_prefix_or_suffix_match():
+    target = uuid4()
+    index = EpisodeIdentifierIndex()
+    index.add("20241234567", target)
+    index.add("20249999999", uuid4())
+
+    # Stored identifier ends with the looked-up one
+    assert index.resolve("1234567") == target
+    # Looked-up identifier starts with a stored one
+    assert index.resolve("20241234567-01") == target
+    # Too short or ambiguous fragments never resolve
+    assert index.resolve("567") is None
+    assert index.resolve("2024") is None
+
+
+def test_get_exact_and_match_report_non_exact_matches():
+    episode_id = uuid4()
+    index = EpisodeIdentifierIndex()
+    index.add("EP-000123", episode_id)
+
+    assert index.get_exact(" EP-000123 ") == episode_id
+    assert index.get_exact("123") is None
+    assert index.match("EP-000123") == (episode_id, MATCH_EXACT)
+    assert index.match("ep-000123") == (episode_id, MATCH_FOLDED)
+    assert index.match("123") == (episode_id, MATCH_NUMERIC_CORE)
+    assert index.match("EP-000123-01", fallback=True) == (episode_id, MATCH_AFFIX)
+    assert index.match("EP-000123-01") is None
@@ -0,0 +1,49 @@
+"""
+Tests for the episode search query builder.
+"""
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.episode_search import build_search_filter, search_rank
+from app.models.bed import Bed
+from app.models.clinical_episode import ClinicalEpisode
+from app.models.patient import Patient
+
+
+def _sql(clause) -> str:
+    return str(select(ClinicalEpisode.id).where(clause).compile(dialect=postgresql.dialect()))
+
+
+def test_blank_search_has_no_filter():
+    assert build_search_filter("   ") is None
+    assert build_search_filter("¡!") is None
+
+
+def test_search_filter_uses_per_table_subqueries():
+    clause = build_search_filter("María  Garcia")
+    sql = _sql(clause)
+    params = clause.compile(dialect=postgresql.dialect()).params
+
+    assert "clinical_episodes.patient_id IN (SELECT patients.id" in sql
+    assert "clinical_episodes.bed_id IN (SELECT beds.id" in sql
+    assert "patients.search_name LIKE" in sql
+    # The search string is folded like the stored keys
+    assert sorted(params.values()) == ["%garcia%", "%maria garcia%", "%maria%"]
+
+
+def test_search_rank_orders_by_trigram_similarity():
+    ranking = [str(expr.compile(dialect=postgresql.dialect())) for expr in search_rank("101")]
+
+    assert "word_similarity" in ranking[-1]
+    assert "similarity(beds.search_room" in ranking[-1]
+
+
+def test_models_keep_search_keys_in_sync():
+    patient = Patient(first_name="José Ignacio", last_name="Muñoz")
+    bed = Bed(room="Sala 3-B")
+
+    assert patient.search_name == "jose ignacio munoz"
+    assert bed.search_room == "sala 3 b"
+
+    patient.last_name = "Núñez"
+    assert patient.search_name == "jose ignacio nunez"
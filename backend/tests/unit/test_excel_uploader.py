@@ -9,6 +9,7 @@ from app.excel_uploader import (
     generate_rut,
     get_name,
     ExcelUploader,
+    _frame_to_records,
 )
 from app.excel_uploader import (
     EpisodeInfoType,
@@ -139,3 +140,361 @@ def test_parse_clinical_episode_information_collects_records():
     assert any("Valor Parcial" in t for t in titles)
     assert any("Días de Hospitalización" in t for t in titles)
     assert any("ExtraCol" in t for t in titles)
+
+
+def _uccc_row(episode: str, rut: str, cama: str | None = None, diag: str = "Neumonía") -> pd.Series:
+    return pd.Series({
+        "RUT": rut,
+        "Nombre": "Ana María",
+        "Episodio:": episode,
+        "CAMA": cama,
+        "Fecha de Nacimiento": "02-05-1980",
+        "Sexo": "F",
+        "Fecha Inicio:": "20-09-25",
+        "Texto libre diagnóstico admisión": diag,
+        "Convenio": "ConvenioX",
+    })
+
+
+def test_parse_gestion_row_collects_all_parts():
+    uploader = ExcelUploader(db_session=None)
+    parsed = uploader._parse_gestion_row(_uccc_row("1001", "12.345.678-5", cama="201A"))
+
+    assert parsed["patient"]["medical_identifier"] == "12.345.678-5"
+    assert parsed["episode"]["episode_identifier"] == "1001"
+    assert parsed["episode"]["bed_room"] == "201A"
+    titles = [r["title"] for r in parsed["info_records"]]
+    assert "Diagnóstico de Admisión" in titles
+    assert "Metadatos UCCC" in titles
+
+
+def test_frame_to_records_normalizes_cells_once_per_column():
+    df = pd.DataFrame({
+        "Nombre": ["  Ana\xa0", "", "nan", None],
+        "Puntaje": [3.0, float("nan"), 5, 7],
+        "Fecha Inicio:": ["20-09-25", "20-09-2025", pd.Timestamp("2025-01-02"), "sin fecha"],
+    })
+
+    records = _frame_to_records(df, date_columns={"Fecha Inicio:": (("%d-%m-%y", "%d-%m-%Y"), True)})
+
+    assert [r["Nombre"] for r in records] == ["Ana", None, None, None]
+    assert records[1]["Puntaje"] is None
+    assert records[0]["Fecha Inicio:"] == pd.Timestamp("2025-09-20")
+    assert records[1]["Fecha Inicio:"] == pd.Timestamp("2025-09-20")
+    assert records[2]["Fecha Inicio:"] == pd.Timestamp("2025-01-02")
+    # Unparseable cells are left for the row builders
+    assert records[3]["Fecha Inicio:"] == "sin fecha"
+
+
+def test_parse_gestion_row_same_result_for_series_and_record():
+    uploader = ExcelUploader(db_session=None)
+    row = _uccc_row("1001", "12.345.678-5", cama="201A")
+    record = _frame_to_records(pd.DataFrame([row]), date_columns={
+        "Fecha de Nacimiento": (("%d-%m-%Y", "%d-%m-%y"), True),
+        "Fecha Inicio:": (("%d-%m-%y", "%d-%m-%Y"), True),
+    })[0]
+
+    from_series = uploader._parse_gestion_row(row)
+    from_record = uploader._parse_gestion_row(record)
+
+    assert from_series["patient"] == from_record["patient"]
+    assert from_series["episode"] == from_record["episode"]
+    assert from_series["info_records"] == from_record["info_records"]
+
+
+async def test_gestion_parse_stage_runs_in_parse_pool(tmp_path):
+    path = tmp_path / "gestion.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        # Title row above the header, as in real exports
+        pd.DataFrame([["Gestión Estadía"]]).to_excel(writer, sheet_name="UCCC", index=False, header=False)
+        pd.DataFrame([
+            _uccc_row("1001", "12.345.678-5", cama="201A"),
+            _uccc_row("1002", "9.876.543-3"),
+        ]).to_excel(writer, sheet_name="UCCC", index=False, startrow=1)
+
+    uploader = ExcelUploader(db_session=None)
+    parsed, altas_records = await uploader._parse("_read_gestion_workbook", str(path))
+
+    assert [p["episode"]["episode_identifier"] for p in parsed] == ["1001", "1002"]
+    assert parsed[0]["patient"]["medical_identifier"] == "12.345.678-5"
+    assert parsed[0]["episode"]["bed_room"] == "201A"
+    # Progress counted in the parse process is merged into the caller's
+    assert uploader.progress.rows_total == 2
+    assert uploader.progress.rows_parsed == 2
+    # No ALTAS sheet in this workbook
+    assert altas_records is None
+
+
+def test_gestion_workbook_serves_uccc_and_altas_in_one_pass(tmp_path):
+    path = tmp_path / "gestion.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame([_uccc_row("1001", "12.345.678-5")]).to_excel(writer, sheet_name="UCCC", index=False)
+        pd.DataFrame([["Altas del mes"]]).to_excel(writer, sheet_name="ALTAS", index=False, header=False)
+        pd.DataFrame([{"Episodio": 1001, "Fecha Alta": "25-09-2025", "Hora": "12:30"}]).to_excel(
+            writer, sheet_name="ALTAS", index=False, startrow=2
+        )
+
+    parsed, altas_records = ExcelUploader(db_session=None)._read_gestion_workbook(path)
+
+    assert len(parsed) == 1
+    assert altas_records == [{"Episodio": 1001, "Fe. Alta": datetime(2025, 9, 25), "Hr. Alta": "12:30"}]
+
+
+def test_detect_csv_delimiter(tmp_path):
+    from app.excel_uploader import _detect_csv_delimiter
+
+    semicolon = tmp_path / "a.csv"
+    semicolon.write_text("GRD;Est Media\n184212;6,6\n")
+    single = tmp_path / "b.csv"
+    single.write_text("GRD\n184212\n")
+
+    assert _detect_csv_delimiter(semicolon) == ";"
+    assert _detect_csv_delimiter(single) is None
+
+
+async def test_bulk_import_gestion_rows_upserts_by_identifier(test_session):
+    from sqlalchemy import func, select
+
+    from app.models.bed import Bed
+    from app.models.clinical_episode import ClinicalEpisode
+    from app.models.clinical_episode_information import ClinicalEpisodeInformation
+    from app.models.patient import Patient
+
+    test_session.add(Bed(room="201A", active=True, available=True))
+    await test_session.flush()
+
+    uploader = ExcelUploader(test_session)
+    rows = [
+        uploader._parse_gestion_row(_uccc_row("1001", "12.345.678-5", cama="201A")),
+        uploader._parse_gestion_row(_uccc_row("1002", "12.345.678-5")),
+    ]
+    await uploader._bulk_import_gestion_rows(rows)
+
+    # Re-importing the same episodes updates them instead of duplicating
+    rows = [uploader._parse_gestion_row(_uccc_row("1001", "12.345.678-5", cama="201A", diag="Sepsis"))]
+    await uploader._bulk_import_gestion_rows(rows)
+    await test_session.commit()
+
+    assert await test_session.scalar(select(func.count(Patient.id))) == 1
+    assert await test_session.scalar(select(func.count(ClinicalEpisode.id))) == 2
+    # Bulk inserts fill the folded search key too
+    assert await test_session.scalar(select(Patient.search_name)) == "ana maria"
+
+    episode = await test_session.scalar(
+        select(ClinicalEpisode).where(ClinicalEpisode.episode_identifier == "1001")
+    )
+    assert episode.bed_id is not None
+    diagnoses = (await test_session.execute(
+        select(ClinicalEpisodeInformation.value).where(
+            ClinicalEpisodeInformation.episode_id == episode.id,
+            ClinicalEpisodeInformation.title == "Diagnóstico de Admisión",
+        )
+    )).scalars().all()
+    assert diagnoses == [{"diagnosis": "Sepsis"}]
+
+
+async def test_bulk_import_gestion_rows_keeps_admission_when_date_blank(test_session):
+    from sqlalchemy import select
+
+    from app.models.clinical_episode import ClinicalEpisode
+
+    uploader = ExcelUploader(test_session)
+    await uploader._bulk_import_gestion_rows([
+        uploader._parse_gestion_row(_uccc_row("1001", "12.345.678-5")),
+    ])
+
+    # A blank Fecha Inicio on re-import keeps the stored admission date
+    blank = _uccc_row("1001", "12.345.678-5")
+    blank["Fecha Inicio:"] = None
+    parsed = uploader._parse_gestion_row(blank)
+    assert parsed["episode"]["admission_at"] is None
+    await uploader._bulk_import_gestion_rows([parsed])
+    await test_session.commit()
+
+    admission_at = await test_session.scalar(
+        select(ClinicalEpisode.admission_at).where(ClinicalEpisode.episode_identifier == "1001")
+    )
+    assert (admission_at.year, admission_at.month, admission_at.day) == (2025, 9, 20)
+
+
+async def test_upload_grd_norms_upserts_and_refreshes_cache(test_session, tmp_path):
+    from sqlalchemy import select
+
+    from app.grd_norm_cache import grd_norm_cache
+    from app.models.grd_norm import GrdNorm
+
+    uploader = ExcelUploader(test_session)
+    first = tmp_path / "normas.csv"
+    first.write_text("GRD;Est Media\n184212;6,6\n151011;3\n")
+    result = await uploader.upload_grd_norms_from_excel(first)
+    assert (result["created"], result["updated"]) == (2, 0)
+    assert await grd_norm_cache.get(test_session, "184212") == 7
+
+    # Existing codes are updated in place; repeated codes keep the last value
+    second = tmp_path / "normas2.csv"
+    second.write_text("GRD;Est Media\n184212;9\n184212;10\n199999;4\n")
+    result = await uploader.upload_grd_norms_from_excel(second)
+    assert (result["created"], result["updated"]) == (1, 2)
+
+    norms = dict((await test_session.execute(select(GrdNorm.grd_id, GrdNorm.expected_days))).all())
+    assert norms == {"184212": 10, "151011": 3, "199999": 4}
+    assert await grd_norm_cache.get_all(test_session) == norms
+    grd_norm_cache.invalidate()
+
+
+async def test_upload_social_scores_bulk_and_idempotent(test_session, tmp_path):
+    from sqlalchemy import func, select
+
+    from app.models.alert import Alert
+    from app.models.clinical_episode import ClinicalEpisode
+    from app.models.social_score_history import SocialScoreHistory
+    from tests.test_fixtures import create_test_clinical_episode, create_test_patient
+
+    patient = await create_test_patient(test_session, "MED001", "Ana", "Pérez")
+    episode = await create_test_clinical_episode(test_session, patient.id)
+    episode.episode_identifier = "1001"
+    await test_session.commit()
+
+    path = tmp_path / "score.xlsx"
+    pd.DataFrame([
+        {"Episodio / Estadía": 1001, "Puntaje": 12, "Fecha Asignación": "01-09-2025",
+         "Desc. Convenio": "FONASA", "Vía de Ingreso": None, "Servicio": "UCI"},
+        {"Episodio / Estadía": 1001, "Puntaje": 3, "Fecha Asignación": "05-09-2025",
+         "Desc. Convenio": None, "Vía de Ingreso": "Urgencia", "Servicio": None},
+        # Same episode and date as the first row
+        {"Episodio / Estadía": 1001, "Puntaje": 12, "Fecha Asignación": "01-09-2025",
+         "Desc. Convenio": None, "Vía de Ingreso": None, "Servicio": None},
+        {"Episodio / Estadía": 9999, "Puntaje": 5, "Fecha Asignación": "01-09-2025",
+         "Desc. Convenio": None, "Vía de Ingreso": None, "Servicio": None},
+    ]).to_excel(path, sheet_name="Data Casos", index=False)
+
+    result = await ExcelUploader(test_session).upload_social_scores_from_excel(path)
+    assert (result["count"], result["episodes_updated"], result["missing_ids"]) == (2, 1, ["9999"])
+
+    # Uploading the same sheet again writes no new scores or alerts
+    result = await ExcelUploader(test_session).upload_social_scores_from_excel(path)
+    assert result["count"] == 0
+
+    assert await test_session.scalar(select(func.count(SocialScoreHistory.id))) == 2
+    assert await test_session.scalar(select(func.count(Alert.id))) == 1
+    row = (await test_session.execute(
+        select(
+            ClinicalEpisode.prevision_desc,
+            ClinicalEpisode.tipo_ingreso_desc,
+            ClinicalEpisode.servicio_ingreso_desc,
+            ClinicalEpisode.latest_social_score_value,
+        ).where(ClinicalEpisode.id == episode.id)
+    )).one()
+    assert tuple(row) == ("FONASA", "Urgencia", "UCI", 3)
+
+
+async def test_upload_social_scores_undated_rows_reupload_idempotent(test_session, tmp_path):
+    from sqlalchemy import select
+
+    from app.models.social_score_history import SocialScoreHistory
+    from tests.test_fixtures import create_test_clinical_episode, create_test_patient
+
+    patient = await create_test_patient(test_session, "MED001", "Ana", "Pérez")
+    episode = await create_test_clinical_episode(test_session, patient.id)
+    episode.episode_identifier = "1001"
+    await test_session.commit()
+
+    path = tmp_path / "score.xlsx"
+    pd.DataFrame([
+        {"Episodio / Estadía": 1001, "Puntaje": 7, "Fecha Asignación": None},
+    ]).to_excel(path, sheet_name="Data Casos", index=False)
+
+    result = await ExcelUploader(test_session).upload_social_scores_from_excel(path)
+    assert result["count"] == 1
+    # Undated rows are dated at admission, so a re-upload finds them
+    result = await ExcelUploader(test_session).upload_social_scores_from_excel(path)
+    assert result["count"] == 0
+
+    recorded = (await test_session.execute(select(SocialScoreHistory.recorded_at))).scalars().all()
+    await test_session.refresh(episode)
+    assert recorded == [episode.admission_at]
+
+
+async def test_upload_social_scores_requires_exact_identifier(test_session, tmp_path):
+    from sqlalchemy import func, select
+
+    from app.models.social_score_history import SocialScoreHistory
+    from tests.test_fixtures import create_test_clinical_episode, create_test_patient
+
+    patient = await create_test_patient(test_session, "MED001", "Ana", "Pérez")
+    episode = await create_test_clinical_episode(test_session, patient.id)
+    episode.episode_identifier = "EP-000123"
+    await test_session.commit()
+
+    path = tmp_path / "score.xlsx"
+    pd.DataFrame([
+        # Shares only its numeric core with "EP-000123"
+        {"Episodio / Estadía": 123, "Puntaje": 12, "Fecha Asignación": "01-09-2025",
+         "Desc. Convenio": "FONASA", "Vía de Ingreso": None, "Servicio": None},
+    ]).to_excel(path, sheet_name="Data Casos", index=False)
+
+    result = await ExcelUploader(test_session).upload_social_scores_from_excel(path)
+
+    assert (result["count"], result["episodes_updated"], result["missing_ids"]) == (0, 0, ["123"])
+    assert await test_session.scalar(select(func.count(SocialScoreHistory.id))) == 0
+    await test_session.refresh(episode)
+    assert episode.prevision_desc is None
+
+
+async def test_episode_index_cached_until_episodes_change(monkeypatch):
+    from app.episode_identifier_index import EpisodeIdentifierIndex
+
+    loads = []
+
+    async def fake_load(session, include_patient_identifiers=True):
+        loads.append(include_patient_identifiers)
+        return EpisodeIdentifierIndex()
+
+    monkeypatch.setattr(EpisodeIdentifierIndex, "load", fake_load)
+    uploader = ExcelUploader(db_session=None)
+
+    first = await uploader._episode_index()
+    assert await uploader._episode_index() is first
+    await uploader._episode_index(include_patient_identifiers=False)
+    assert loads == [True, False]
+
+    # Creating episodes drops the cached indexes
+    uploader._invalidate_episode_index()
+    assert await uploader._episode_index() is not first
+    assert loads == [True, False, True]
+
+
+async def test_process_altas_records_bulk_discharge(test_session):
+    from sqlalchemy import select
+
+    from app.models.clinical_episode import ClinicalEpisode
+    from tests.test_fixtures import create_test_clinical_episode, create_test_patient
+
+    patient = await create_test_patient(test_session, "MED001", "Ana", "Pérez")
+    episode = await create_test_clinical_episode(test_session, patient.id)
+    episode.episode_identifier = "1001"
+    other = await create_test_clinical_episode(test_session, patient.id)
+    other.episode_identifier = "EP-000123"
+    await test_session.commit()
+
+    updated = await ExcelUploader(test_session)._process_altas_records([
+        {"Episodio": 1001.0, "Fe. Alta": datetime(2025, 9, 20), "Hr. Alta": "08:00"},
+        # A later row for the same episode wins
+        {"Episodio": 1001, "Fe. Alta": datetime(2025, 9, 25), "Hr. Alta": "12:30"},
+        {"Episodio": 9999, "Fe. Alta": datetime(2025, 9, 25), "Hr. Alta": None},
+        # Only exact identifiers discharge: "123" must not match "EP-000123"
+        {"Episodio": 123, "Fe. Alta": datetime(2025, 9, 25), "Hr. Alta": None},
+    ])
+    await test_session.commit()
+
+    assert updated == 1
+    rows = dict((await test_session.execute(
+        select(ClinicalEpisode.id, ClinicalEpisode.status)
+    )).all())
+    assert rows == {episode.id: EpisodeStatus.DISCHARGED, other.id: EpisodeStatus.ACTIVE}
+    discharged = (await test_session.execute(
+        select(ClinicalEpisode.discharge_at, ClinicalEpisode.expected_discharge)
+        .where(ClinicalEpisode.id == episode.id)
+    )).one()
+    assert (discharged.discharge_at.day, discharged.discharge_at.hour) == (25, 12)
+    assert discharged.expected_discharge == date(2025, 9, 25)
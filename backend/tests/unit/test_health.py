@@ -0,0 +1,37 @@
+"""
+Tests for the health endpoints.
+"""
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import pool_status
+
+
+async def test_pool_status_reports_checked_out_and_idle(test_engine):
+    engine = create_async_engine(test_engine.url, pool_size=2, max_overflow=1)
+    try:
+        async with engine.connect():
+            busy = pool_status(engine.pool)
+        idle = pool_status(engine.pool)
+    finally:
+        await engine.dispose()
+
+    assert busy["size"] == 2
+    assert busy["checked_out"] == 1
+    assert idle["checked_out"] == 0
+    assert idle["idle"] == 1
+
+
+async def test_db_health_reports_pool(client):
+    response = await client.get("/health/db")
+
+    assert response.status_code in (200, 503)
+    assert {"size", "checked_out", "idle", "overflow"} <= response.json()["pool"].keys()
+
+
+def test_pool_limits_split_connection_budget_across_workers():
+    from app.db import pool_limits
+
+    assert pool_limits(5, 10, budget=0, workers=4) == (5, 10)
+    assert pool_limits(5, 10, budget=40, workers=4) == (5, 5)
+    assert pool_limits(5, 10, budget=12, workers=4) == (3, 0)
+    assert pool_limits(5, 10, budget=2, workers=4) == (1, 0)
@@ -0,0 +1,37 @@
+"""
+Tests for the hot-path index declarations on the models.
+
+Compiled against the PostgreSQL dialect, so no database is needed; the DDL
+must match what migration m0b1c2d3e4f5 creates.
+"""
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.db import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+
+def _ddl(table: str, name: str) -> str:
+    index = next(i for i in Base.metadata.tables[table].indexes if i.name == name)
+    return str(CreateIndex(index).compile(dialect=postgresql.dialect())).strip()
+
+
+def test_episode_list_indexes_follow_the_sort_order():
+    assert _ddl("clinical_episodes", "ix_clinical_episodes_admission_at_id") == (
+        "CREATE INDEX ix_clinical_episodes_admission_at_id "
+        "ON clinical_episodes (admission_at DESC, id DESC)"
+    )
+    assert _ddl("clinical_episodes", "ix_clinical_episodes_overstay_rank") == (
+        "CREATE INDEX ix_clinical_episodes_overstay_rank ON clinical_episodes "
+        "(overstay_probability DESC NULLS LAST, admission_at DESC, id DESC)"
+    )
+
+
+def test_partial_indexes_carry_their_predicate():
+    assert _ddl("clinical_episodes", "ix_clinical_episodes_active_admission_at").endswith(
+        "WHERE status = 'ACTIVE'"
+    )
+    assert _ddl("alerts", "ix_alerts_active_created_at").endswith("WHERE is_active")
+    assert _ddl("task_instances", "ix_task_instances_open_due_date").endswith(
+        "WHERE status IN ('PENDING', 'IN_PROGRESS')"
+    )
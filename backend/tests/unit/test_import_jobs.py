@@ -0,0 +1,89 @@
+"""
+Tests for the background Excel import job queue.
+"""
+import asyncio
+
+from app.import_jobs import ImportJobQueue, ImportJobStatus
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+async def _wait_finished(job, timeout: float = 2.0):
+    async def poll():
+        while not job.finished:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+async def test_job_reports_progress_and_result(tmp_path):
+    queue = ImportJobQueue(session_factory=FakeSession)
+    upload = tmp_path / "upload.xlsx"
+    upload.write_bytes(b"data")
+    release = asyncio.Event()
+
+    async def run(uploader):
+        for idx, _ in uploader._track([{"a": 1}, {"a": 2}, {"a": 3}]):
+            if idx == 1:
+                uploader._row_error("Error processing row 1: bad value")
+        await release.wait()
+        uploader.progress.rows_written = 2
+        return {"status": "success", "processed": 2}
+
+    job = queue.submit("gestion-estadia", run, filename="upload.xlsx", cleanup_paths=[upload])
+    await asyncio.sleep(0.05)
+
+    snapshot = queue.get(job.id).to_dict()
+    assert snapshot["status"] == "running"
+    assert snapshot["progress"]["rows_total"] == 3
+    assert snapshot["progress"]["rows_parsed"] == 3
+    assert snapshot["progress"]["error_count"] == 1
+
+    release.set()
+    await _wait_finished(job)
+    await queue.stop()
+
+    assert job.status == ImportJobStatus.SUCCEEDED
+    assert job.result == {"status": "success", "processed": 2}
+    assert job.progress.rows_written == 2
+    assert not upload.exists()
+
+
+async def test_failed_job_keeps_error_and_queue_keeps_working():
+    queue = ImportJobQueue(session_factory=FakeSession)
+
+    async def fail(uploader):
+        raise ValueError("Could not find UCCC sheet")
+
+    async def succeed(uploader):
+        return {"status": "success"}
+
+    failed = queue.submit("gestion-estadia", fail)
+    ok = queue.submit("grd", succeed)
+    await _wait_finished(ok)
+    await queue.stop()
+
+    assert failed.status == ImportJobStatus.FAILED
+    assert failed.error == "Could not find UCCC sheet"
+    assert ok.status == ImportJobStatus.SUCCEEDED
+
+
+async def test_old_finished_jobs_are_pruned():
+    queue = ImportJobQueue(session_factory=FakeSession, max_jobs=2)
+
+    async def succeed(uploader):
+        return {}
+
+    jobs = []
+    for _ in range(3):
+        jobs.append(queue.submit("beds", succeed))
+        await _wait_finished(jobs[-1])
+    await queue.stop()
+
+    assert queue.get(jobs[0].id) is None
+    assert queue.get(jobs[2].id) is jobs[2]
@@ -0,0 +1,61 @@
+import os
+
+from app.overstay_model import OverstayModelRegistry
+
+
+def test_registry_reports_missing_model_file(tmp_path):
+    registry = OverstayModelRegistry(tmp_path / "missing.cbm", loader=lambda path: object())
+
+    assert registry.get() is None
+    assert "Model file not found" in registry.last_error
+
+
+def test_registry_loads_once_and_reloads_on_mtime_change(tmp_path):
+    model_file = tmp_path / "model.cbm"
+    model_file.write_bytes(b"v1")
+    loads = []
+
+    def loader(path):
+        loads.append(path.read_bytes())
+        return {"version": len(loads)}
+
+    registry = OverstayModelRegistry(model_file, loader=loader)
+
+    first = registry.get()
+    assert registry.get() is first
+    assert len(loads) == 1
+
+    # Replace the file with a newer modification time
+    model_file.write_bytes(b"v2")
+    stat = model_file.stat()
+    os.utime(model_file, (stat.st_atime, stat.st_mtime + 10))
+
+    second = registry.get()
+    assert second == {"version": 2}
+    assert loads == [b"v1", b"v2"]
+
+
+def test_registry_keeps_previous_model_when_reload_fails(tmp_path):
+    model_file = tmp_path / "model.cbm"
+    model_file.write_bytes(b"v1")
+    calls = {"n": 0}
+
+    def loader(path):
+        calls["n"] += 1
+        if calls["n"] > 1:
+            raise ValueError("corrupt file")
+        return "model-v1"
+
+    registry = OverstayModelRegistry(model_file, loader=loader)
+    assert registry.get() == "model-v1"
+
+    stat = model_file.stat()
+    os.utime(model_file, (stat.st_atime, stat.st_mtime + 10))
+
+    assert registry.get() == "model-v1"
+    assert "Failed to load model" in registry.last_error
+    assert calls["n"] == 2
+
+    # The broken file is not retried until it changes again
+    registry.get()
+    assert calls["n"] == 2
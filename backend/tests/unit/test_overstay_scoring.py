@@ -0,0 +1,75 @@
+import uuid
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from app.models.clinical_episode import ClinicalEpisode
+from app.models.patient import Patient
+from app.overstay_scoring import (
+    FEATURE_COLUMNS,
+    build_feature_matrix,
+    parse_grd_code,
+    predict_probabilities,
+)
+
+
+def _episode(**overrides) -> ClinicalEpisode:
+    values = dict(
+        id=uuid.uuid4(),
+        admission_at=datetime(2025, 1, 10, tzinfo=timezone.utc),
+        grd_id="084212",
+        grd_name="NEUMONIA W/MCC",
+        grd_expected_days=7,
+        prevision_desc="FONASA",
+        tipo_ingreso_desc="Urgencias",
+        servicio_ingreso_desc="Medicina",
+    )
+    values.update(overrides)
+    return ClinicalEpisode(**values)
+
+
+def _patient() -> Patient:
+    return Patient(birth_date=date(1960, 1, 10))
+
+
+def test_parse_grd_code_splits_components():
+    assert parse_grd_code("084212") == ("08", "4", "21", "2")
+    assert parse_grd_code(None) == (None, None, None, None)
+
+
+def test_build_feature_matrix_is_columnar_and_skips_incomplete_rows():
+    complete = _episode()
+    missing_days = _episode(grd_expected_days=None)
+    missing_service = _episode(servicio_ingreso_desc=None)
+
+    matrix = build_feature_matrix([
+        (complete, _patient()),
+        (missing_days, _patient()),
+        (missing_service, _patient()),
+    ])
+
+    assert list(matrix.frame.columns) == FEATURE_COLUMNS
+    assert len(matrix.frame) == 1
+    assert matrix.episode_ids == [complete.id]
+    assert matrix.skipped == 2
+
+    row = matrix.frame.iloc[0]
+    assert row["complication"] == "1"
+    assert row["Tipo Ingreso (Descripción)"] == "Urgente"
+    assert row["CDM_derived"] == "08"
+    assert row["Edad en años"] == 65.0
+
+
+def test_predict_probabilities_takes_positive_class_in_one_call():
+    calls = []
+
+    class FakeModel:
+        def predict_proba(self, data):
+            calls.append(len(data))
+            return np.array([[0.9, 0.1], [0.2, 0.8]])
+
+    matrix = build_feature_matrix([(_episode(), _patient()), (_episode(), _patient())])
+    probs = predict_probabilities(FakeModel(), matrix.frame)
+
+    assert calls == [2]
+    assert list(probs) == [0.1, 0.8]
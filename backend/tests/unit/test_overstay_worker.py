@@ -0,0 +1,147 @@
+"""
+Tests for the background overstay scoring worker.
+"""
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.alert import Alert, AlertSeverity, AlertType
+from app.models.clinical_episode import ClinicalEpisode
+from app.overstay_model import OverstayModelRegistry
+from app.overstay_worker import OverstayScoringWorker
+from tests.test_fixtures import create_test_patient, create_test_clinical_episode
+
+
+class FakeModel:
+    def __init__(self, probability: float = 0.75):
+        self.probability = probability
+
+    def predict_proba(self, data):
+        return np.array([[1 - self.probability, self.probability]] * len(data))
+
+
+def _make_worker(test_engine, tmp_path, batch_size: int = 500, model=None) -> OverstayScoringWorker:
+    model_file = tmp_path / "model.cbm"
+    model_file.write_bytes(b"model")
+    model = model or FakeModel()
+    registry = OverstayModelRegistry(model_file, loader=lambda path: model)
+    session_factory = async_sessionmaker(test_engine, expire_on_commit=False, class_=AsyncSession)
+    return OverstayScoringWorker(registry, session_factory=session_factory, batch_size=batch_size)
+
+
+async def _create_scoreable_episode(session, patient_id) -> ClinicalEpisode:
+    episode = await create_test_clinical_episode(session, patient_id)
+    episode.grd_id = "084212"
+    episode.grd_name = "NEUMONIA W/MCC"
+    episode.grd_expected_days = 7
+    episode.prevision_desc = "FONASA"
+    episode.tipo_ingreso_desc = "Urgencias"
+    episode.servicio_ingreso_desc = "Medicina"
+    await session.flush()
+    return episode
+
+
+async def test_worker_scores_only_pending_scoreable_episodes(test_engine, test_session, tmp_path):
+    patient = await create_test_patient(test_session, "MED001")
+    scoreable = [await _create_scoreable_episode(test_session, patient.id) for _ in range(3)]
+    missing_features = await create_test_clinical_episode(test_session, patient.id)
+    await test_session.commit()
+
+    worker = _make_worker(test_engine, tmp_path, batch_size=2)
+    async with worker.session_factory() as session:
+        assert await worker.pending_count(session) == 3
+
+    scored = await worker.run_once()
+
+    assert scored == 3
+    assert worker.status()["last_run_scored"] == 3
+    async with worker.session_factory() as session:
+        assert await worker.pending_count(session) == 0
+        rows = dict((await session.execute(
+            select(ClinicalEpisode.id, ClinicalEpisode.overstay_probability)
+        )).all())
+    assert all(rows[e.id] == 0.75 for e in scoreable)
+    assert rows[missing_features.id] is None
+
+
+async def test_worker_creates_predicted_overstay_alerts(test_engine, test_session, tmp_path):
+    patient = await create_test_patient(test_session, "MED001")
+    episode = await _create_scoreable_episode(test_session, patient.id)
+    await test_session.commit()
+
+    worker = _make_worker(test_engine, tmp_path)
+    assert await worker.run_once() == 1
+
+    async with worker.session_factory() as session:
+        alerts = (await session.execute(select(Alert))).scalars().all()
+    assert [(a.episode_id, a.alert_type, a.severity, a.is_active) for a in alerts] == [
+        (episode.id, AlertType.PREDICTED_OVERSTAY, AlertSeverity.HIGH, True)
+    ]
+    assert alerts[0].message == "Predicción de sobrestadía: 75% probabilidad"
+
+
+async def test_rescoring_keeps_one_active_overstay_alert(test_engine, test_session, tmp_path):
+    patient = await create_test_patient(test_session, "MED001")
+    episode = await _create_scoreable_episode(test_session, patient.id)
+    await test_session.commit()
+
+    model = FakeModel()
+    worker = _make_worker(test_engine, tmp_path, model=model)
+    assert await worker.run_once() == 1
+
+    # Changed inputs make the episode pending again; the re-score (now MEDIUM)
+    # updates the existing alert instead of adding a second one
+    model.probability = 0.6
+    async with worker.session_factory() as session:
+        changed = await session.get(ClinicalEpisode, episode.id)
+        changed.grd_expected_days = 12
+        await session.commit()
+    assert await worker.run_once() == 1
+
+    async with worker.session_factory() as session:
+        alerts = (await session.execute(select(Alert))).scalars().all()
+    assert len(alerts) == 1
+    assert (alerts[0].severity, alerts[0].is_active) == (AlertSeverity.MEDIUM, True)
+    assert alerts[0].message == "Predicción de sobrestadía: 60% probabilidad"
+
+
+async def test_worker_does_nothing_without_model(test_engine, test_session, tmp_path):
+    patient = await create_test_patient(test_session, "MED001")
+    await _create_scoreable_episode(test_session, patient.id)
+    await test_session.commit()
+
+    registry = OverstayModelRegistry(tmp_path / "missing.cbm", loader=lambda path: FakeModel())
+    worker = OverstayScoringWorker(
+        registry,
+        session_factory=async_sessionmaker(test_engine, expire_on_commit=False, class_=AsyncSession),
+    )
+
+    assert await worker.run_once() == 0
+    assert "Model file not found" in worker.status()["last_error"]
+
+
+async def test_worker_rescores_only_episodes_whose_inputs_changed(test_engine, test_session, tmp_path):
+    patient = await create_test_patient(test_session, "MED001")
+    changed = await _create_scoreable_episode(test_session, patient.id)
+    unchanged = await _create_scoreable_episode(test_session, patient.id)
+    await test_session.commit()
+
+    worker = _make_worker(test_engine, tmp_path)
+    assert await worker.run_once() == 2
+
+    async with worker.session_factory() as session:
+        episode = await session.get(ClinicalEpisode, changed.id)
+        episode.grd_expected_days = 12
+        await session.commit()
+
+        assert await worker.pending_count(session) == 1
+
+    assert await worker.run_once() == 1
+    async with worker.session_factory() as session:
+        assert await worker.pending_count(session) == 0
+        hashes = dict((await session.execute(
+            select(ClinicalEpisode.id, ClinicalEpisode.overstay_features_hash)
+        )).all())
+    assert hashes[changed.id] is not None
+    assert hashes[unchanged.id] is not None
+    assert hashes[changed.id] != hashes[unchanged.id]
@@ -0,0 +1,28 @@
+"""
+Tests for keyset pagination cursors.
+"""
+import pytest
+
+from app.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("risk", admission_at="2025-01-01T00:00:00+00:00", id="abc", overstay_probability=0.25)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "risk") == {
+        "admission_at": "2025-01-01T00:00:00+00:00",
+        "id": "abc",
+        "overstay_probability": 0.25,
+    }
+
+
+def test_cursor_rejects_other_sort_and_garbage():
+    cursor = encode_cursor("recent", admission_at="2025-01-01T00:00:00+00:00", id="abc")
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "risk")
+    with pytest.raises(ValueError):
+        decode_cursor("%%%", "recent")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("recent")[:-2] + "!!", "recent")
@@ -0,0 +1,16 @@
+"""
+Tests for search key folding.
+"""
+from app.search_keys import fold_search_key, patient_search_name
+
+
+def test_fold_search_key():
+    assert fold_search_key("  Muñoz\xa0PÉREZ ") == "munoz perez"
+    assert fold_search_key("O'Higgins-101") == "o higgins 101"
+    assert fold_search_key(None) == ""
+    assert fold_search_key(101) == "101"
+
+
+def test_patient_search_name_handles_missing_parts():
+    assert patient_search_name("María José", "López") == "maria jose lopez"
+    assert patient_search_name("Ana", None) == "ana"
@@ -0,0 +1,58 @@
+"""
+Tests for streaming uploads to disk.
+"""
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.upload_storage import save_upload
+
+
+async def test_save_upload_streams_in_chunks_and_hashes(tmp_path):
+    content = b"0123456789" * 1000
+    upload = UploadFile(io.BytesIO(content), filename="data.xlsx")
+    dest = tmp_path / "out.xlsx"
+
+    saved = await save_upload(upload, dest, max_size=len(content), chunk_size=999)
+
+    assert dest.read_bytes() == content
+    assert saved.size == len(content)
+    assert saved.sha256 == hashlib.sha256(content).hexdigest()
+
+
+async def test_save_upload_rejects_oversized_file_and_removes_partial(tmp_path):
+    # No declared size: the limit is enforced while streaming
+    upload = UploadFile(io.BytesIO(b"x" * 5000), filename="big.pdf")
+    dest = tmp_path / "big.pdf"
+
+    with pytest.raises(HTTPException) as exc_info:
+        await save_upload(upload, dest, max_size=4096, chunk_size=1024)
+
+    assert exc_info.value.status_code == 413
+    assert not dest.exists()
+
+
+async def test_save_upload_rejects_declared_size_before_reading(tmp_path):
+    body = io.BytesIO(b"x" * 10)
+    upload = UploadFile(body, filename="big.pdf", size=10_000)
+
+    with pytest.raises(HTTPException):
+        await save_upload(upload, tmp_path / "big.pdf", max_size=100)
+
+    assert body.tell() == 0
+    assert not (tmp_path / "big.pdf").exists()
+
+
+async def test_save_upload_removes_caller_created_file_on_early_reject(tmp_path):
+    # Routers reserve a temporary path before streaming into it
+    dest = tmp_path / "reserved.xlsx"
+    dest.touch()
+    upload = UploadFile(io.BytesIO(b"x" * 10), filename="big.xlsx", size=10_000)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await save_upload(upload, dest, max_size=100, too_large_status=400)
+
+    assert exc_info.value.status_code == 400
+    assert not dest.exists()
@@ -0,0 +1,39 @@
+"""
+Tests for deferred loading of the heavy dependencies.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from app.warm_up import WARM_UP_MODULES, warm_up
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def test_importing_the_app_does_not_load_heavy_modules():
+    code = (
+        "import json, sys, app.main; "
+        "print(json.dumps([m for m in ('pandas', 'numpy', 'openpyxl', 'catboost', "
+        "'app.excel_uploader') if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_warm_up_imports_modules_and_loads_model():
+    class FakeRegistry:
+        loaded = False
+
+        def load(self):
+            self.loaded = True
+            return True
+
+    registry = FakeRegistry()
+    warm_up(registry)
+
+    assert registry.loaded
+    assert all(name in sys.modules for name in WARM_UP_MODULES)
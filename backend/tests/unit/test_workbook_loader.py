@@ -0,0 +1,57 @@
+"""
+Tests for the single-pass workbook loader.
+"""
+import openpyxl
+import pandas as pd
+import pytest
+
+from app.workbook_loader import WorkbookLoader, detect_header_row
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    path = tmp_path / "book.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "UCCC"
+    ws.append(["Gestión Estadía - Reporte"])
+    ws.append(["RUT", "Nombre", "Episodio:", None, "Nombre"])
+    ws.append(["12.345.678-5", "Ana", 1001, None, "x"])
+    ws.append([])
+    ws.append(["9.876.543-3", "Luis", 2.0, 3.5, None])
+    other = wb.create_sheet("ALTAS")
+    other.append(["Episodio", "Fe. Alta"])
+    other.append([1001, "25-09-2025"])
+    wb.save(path)
+    return path
+
+
+def test_read_sheet_matches_read_excel_with_detected_header(workbook_path):
+    with WorkbookLoader(workbook_path) as workbook:
+        df = workbook.read_sheet("UCCC", header_tokens=["rut", "nombre", "episodio"], min_tokens=3)
+        altas = workbook.read_sheet("ALTAS")
+
+    pd.testing.assert_frame_equal(df, pd.read_excel(workbook_path, sheet_name="UCCC", header=1))
+    pd.testing.assert_frame_equal(altas, pd.read_excel(workbook_path, sheet_name="ALTAS"))
+
+
+def test_read_sheet_without_detected_header_uses_first_row(workbook_path):
+    with WorkbookLoader(workbook_path) as workbook:
+        assert workbook.sheet_names == ["UCCC", "ALTAS"]
+        df = workbook.read_sheet(header_tokens=["missing"], min_tokens=1)
+
+    assert list(df.columns)[0] == "Gestión Estadía - Reporte"
+
+
+def test_missing_sheet_raises_value_error(workbook_path):
+    with WorkbookLoader(workbook_path) as workbook:
+        with pytest.raises(ValueError, match="ALTA2"):
+            workbook.read_sheet("ALTA2")
+
+
+def test_detect_header_row_needs_min_tokens():
+    rows = [["Reporte", ""], ["Fecha", "Hora"], ["Episodio", "Fe. Alta", "Hr. Alta"]]
+
+    assert detect_header_row(rows, ["episodio", "alta", "hora"], min_tokens=2) == 2
+    assert detect_header_row(rows, ["fecha"], min_tokens=1) == 1
+    assert detect_header_row(rows, ["rut"], min_tokens=1) is None